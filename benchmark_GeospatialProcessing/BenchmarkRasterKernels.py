@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Benchmark raster kernels
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, and rasterio. Does not require arcpy with the numpy backend. Must be run as a script so that worker processes can import it safely. Example: python BenchmarkRasterKernels.py --sizes 1000 10000 --baseline results_previous.json
+# Description: "Benchmark raster kernels" generates synthetic aligned study area rasters at several sizes and records the throughput in cells per second and the peak memory of the sum, minimum, extract, combine, and inverse density-weighted distance kernels on a raster backend.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import argparse
+import os
+from package_GeospatialProcessing.benchmarkKernels import BENCHMARK_KERNELS
+from package_GeospatialProcessing.benchmarkKernels import benchmark_kernels
+
+# Define default folders
+data_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'synthetic_data')
+results_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results.json')
+
+# Run benchmarks
+if __name__ == '__main__':
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Benchmark raster kernels on synthetic rasters.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 30000],
+                        help='raster sizes in rows and columns')
+    parser.add_argument('--kernels', nargs='+', default=BENCHMARK_KERNELS, choices=BENCHMARK_KERNELS,
+                        help='kernels to benchmark')
+    parser.add_argument('--repeats', type=int, default=3, help='runs of each kernel and size')
+    parser.add_argument('--block_size', type=int, default=2048, help='rows and columns processed per block')
+    parser.add_argument('--backend', default='numpy', choices=['numpy', 'arcpy'], help='raster backend')
+    parser.add_argument('--data_folder', default=data_folder, help='folder for synthetic rasters')
+    parser.add_argument('--results', default=results_file, help='JSON file where results are saved')
+    parser.add_argument('--baseline', default=None, help='JSON file of previous results to compare against')
+    arguments = parser.parse_args()
+
+    print(f'Benchmarking {len(arguments.kernels)} kernels at {len(arguments.sizes)} sizes...')
+    print('----------')
+    benchmark_kernels(arguments.data_folder,
+                      arguments.sizes,
+                      kernels=arguments.kernels,
+                      repeats=arguments.repeats,
+                      block_size=arguments.block_size,
+                      backend=arguments.backend,
+                      results_file=arguments.results,
+                      baseline_file=arguments.baseline)
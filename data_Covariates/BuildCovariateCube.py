@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Build covariate cube
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with rasterio.
+# Description: "Build covariate cube" writes all topography, edge distance, vegetation, and hydrography covariates into a single memory-mappable covariate cube so that path points and prediction grids can be sampled without rebuilding a raster stack.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import glob
+import os
+from package_GeospatialProcessing import build_covariate_cube
+from package_GeospatialProcessing.outputCache import cached_geoprocessing
+
+# Set root directory
+drive = 'N:/'
+root_folder = 'ACCS_Work'
+
+# Define data folder
+data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
+
+# Define study area
+study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
+
+# Create a list of all covariate rasters
+covariate_rasters = []
+for covariate_folder in ['topography', 'edge_distance', 'vegetation', 'hydrography']:
+    covariate_rasters += sorted(glob.glob(os.path.join(data_folder, 'Data_Input', covariate_folder, '*.tif')))
+print(f'Number of covariate rasters: {len(covariate_rasters)}')
+
+# Convert raster names to standard covariate names
+standard_names = {'southwestAlaska_ForestEdge': 'forest_edge',
+                  'southwestAlaska_TundraEdge': 'tundra_edge'}
+covariate_names = []
+for raster in covariate_rasters:
+    base_name = os.path.splitext(os.path.split(raster)[1])[0]
+    covariate_names.append(standard_names.get(base_name, base_name))
+
+# Define output cube
+cube_file = os.path.join(data_folder, 'Data_Input/covariate_cube/southwestAlaska_Covariates.npy')
+header_file = os.path.join(data_folder, 'Data_Input/covariate_cube/southwestAlaska_Covariates.json')
+if os.path.exists(os.path.dirname(cube_file)) == 0:
+    os.makedirs(os.path.dirname(cube_file))
+
+# Define input and output arrays
+cube_inputs = [study_area] + covariate_rasters
+cube_outputs = [cube_file, header_file]
+
+# Create key word arguments
+cube_kwargs = {'covariate_names': covariate_names,
+               'chunk_size': 256,
+               'input_array': cube_inputs,
+               'output_array': cube_outputs
+               }
+
+# Build covariate cube if the output does not exist or its inputs have changed
+print('Building covariate cube...')
+cached_geoprocessing(build_covariate_cube, **cube_kwargs)
+print('----------')
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Prepare all covariates
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with rasterio. Must be run as a script so that worker processes can import it safely.
+# Description: "Prepare all covariates" builds the topography, vegetation, and edge covariates on a process pool. Work units start as soon as their dependencies are complete and work units with existing outputs are skipped. Stage timings are logged and summarized against the previous build.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import os
+from package_GeospatialProcessing import calculate_edge_distance
+from package_GeospatialProcessing import combine_raster_classes
+from package_GeospatialProcessing import create_minimum_raster
+from package_GeospatialProcessing import set_block_pipeline
+from package_GeospatialProcessing import set_profile_log
+from package_GeospatialProcessing import sum_rasters
+from package_GeospatialProcessing import summarize_profile_log
+from package_GeospatialProcessing.scheduleWorkUnits import create_work_unit
+from package_GeospatialProcessing.scheduleWorkUnits import run_work_units
+
+# Set root directory
+drive = 'N:/'
+root_folder = 'ACCS_Work'
+
+# Define data folders
+data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
+topography_folder = os.path.join(drive, root_folder, 'Data/topography/Composite_10m_Beringia/integer/gridded_select')
+vegetation_folder = os.path.join(drive, root_folder,
+                                 'Projects/VegetationEcology/AKVEG_QuantitativeMap/Data/Data_Output/rasters_final/round_20210402')
+nlcd_folder = os.path.join(drive, root_folder, 'Data/biota/vegetation/Alaska_NationalLandCoverDatabase')
+covariate_folder = os.path.join(data_folder, 'Data_Input/vegetation')
+
+# Define profile logs for this build and the previous build
+profile_log = os.path.join(data_folder, 'Data_Input/profile_PrepareCovariates.jsonl')
+baseline_log = os.path.join(data_folder, 'Data_Input/profile_PrepareCovariates_previous.jsonl')
+
+# Define study areas
+study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
+elevation_mask = os.path.join(data_folder, 'Data_Input/southwestAlaska_ElevationMask_300.tif')
+
+# Define input rasters
+raster_nlcd = os.path.join(nlcd_folder, 'Alaska_NationalLandCoverDatabase_2016_20200213.img')
+
+# Define major grids
+grids_major = ['C5', 'C6',
+               'D5', 'D6',
+               'E5']
+
+# Define map groups
+map_groups = ['alnus', 'betshr', 'dectre', 'dryas', 'empnig', 'erivag', 'picgla', 'picmar', 'rhoshr', 'salshr', 'sphagn', 'vaculi',
+              'vacvit', 'wetsed']
+
+# Create an empty list to store work units
+work_units = []
+
+# Create work units to merge the topography grids
+for topography in ['Elevation', 'Roughness']:
+    topography_inputs = [study_area] + [os.path.join(topography_folder,
+                                                     'Grid_' + grid,
+                                                     topography + '_Composite_10m_Beringia_AKALB_Grid_' + grid + '.tif')
+                                        for grid in grids_major]
+    topography_outputs = [os.path.join(data_folder, 'Data_Input/topography', topography.lower() + '.tif')]
+    topography_kwargs = {'value_type': '16_BIT_SIGNED',
+                         'no_data': '-32768',
+                         'input_array': topography_inputs,
+                         'output_array': topography_outputs
+                         }
+    work_units.append(create_work_unit(topography.lower(), create_minimum_raster, topography_kwargs))
+
+# Create work units to merge the vegetation grids
+for group in map_groups:
+    vegetation_inputs = [study_area] + [os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_' + grid + '.tif')
+                                        for grid in grids_major]
+    vegetation_outputs = [os.path.join(covariate_folder, group + '.tif')]
+    vegetation_kwargs = {'value_type': '16_BIT_SIGNED',
+                         'no_data': '-32768',
+                         'input_array': vegetation_inputs,
+                         'output_array': vegetation_outputs
+                         }
+    work_units.append(create_work_unit(group, create_minimum_raster, vegetation_kwargs))
+
+# Create work unit to extract barren and the water/ice mask from one read of the NLCD
+barren_kwargs = {'value_type': '16_BIT_SIGNED',
+                 'no_data': '-32768',
+                 'reclass_tables': [{31: 50},
+                                    {value: 1 for value in [21, 22, 23, 24, 31, 41, 42, 43, 51, 52, 71, 72, 74, 81, 82, 90, 95]}],
+                 'input_array': [study_area, raster_nlcd, elevation_mask, study_area],
+                 'output_array': [os.path.join(covariate_folder, 'barren.tif'),
+                                  os.path.join(data_folder, 'Data_Input/waterice_mask.tif')]
+                 }
+work_units.append(create_work_unit('barren', combine_raster_classes, barren_kwargs))
+
+# Create work units to sum tree and tundra cover
+cover_groups = {'TreeCover': ['picgla', 'picmar', 'dectre'],
+                'TundraCover': ['erivag', 'dryas', 'barren']}
+for cover, groups in cover_groups.items():
+    sum_kwargs = {'input_array': [study_area] + [os.path.join(covariate_folder, group + '.tif') for group in groups],
+                  'output_array': [os.path.join(covariate_folder, cover + '.tif')]
+                  }
+    work_units.append(create_work_unit(cover, sum_rasters, sum_kwargs,
+                                       depends_on=groups))
+
+# Create work units to calculate forest and tundra edge distance
+edge_covariates = {'ForestEdge': ('TreeCover', '-999'),
+                   'TundraEdge': ('TundraCover', '-32768')}
+for edge, (cover, no_data) in edge_covariates.items():
+    edge_kwargs = {'minimum_cover': 10,
+                   'incremental': True,
+                   'value_type': '32_BIT_SIGNED',
+                   'no_data': no_data,
+                   'input_array': [study_area, os.path.join(covariate_folder, cover + '.tif')],
+                   'output_array': [os.path.join(data_folder, 'Data_Input/edge_distance', 'southwestAlaska_' + edge + '.tif')]
+                   }
+    work_units.append(create_work_unit(edge, calculate_edge_distance, edge_kwargs,
+                                       depends_on=[cover]))
+
+# Run all work units
+if __name__ == '__main__':
+    print(f'Building {len(work_units)} covariates...')
+    print('----------')
+    # Keep the previous profile log as the baseline for this build
+    if os.path.exists(profile_log):
+        os.replace(profile_log, baseline_log)
+    set_profile_log(profile_log)
+    # Read ahead from the network share while blocks are computed and written, with computation left to the process pool
+    set_block_pipeline(queue_depth=4, read_workers=2, compute_workers=1)
+    run_work_units(work_units)
+    # Summarize stage timings against the previous build
+    if os.path.exists(profile_log):
+        summarize_profile_log(profile_log,
+                              baseline_file=baseline_log if os.path.exists(baseline_log) else None,
+                              output_file=os.path.splitext(profile_log)[0] + '_summary.json')
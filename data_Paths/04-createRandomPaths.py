@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Create random paths
+# Author: Timm Nawrocki, Amanda Droghini
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with pandas, pyarrow, and rasterio.
+# Description: "Create random paths" generates random paths for every moose-year. Each random path starts at a random start point inside the study area and outside of water and ice and has the same number of points as the observed path on which it is based. Step lengths and turning angles are randomly sampled from theoretical distributions, whose parameters were obtained by fitting data from our study population. Steps that leave the study area or enter water and ice are redrawn. Observed and random paths are combined and exported in a columnar format.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import arcpy
+import datetime
+import os
+import pandas as pd
+import time
+from package_Paths import read_habitat_mask
+from package_Paths import read_random_sample
+from package_Paths import simulate_random_paths
+
+# Set root directory
+drive = 'C:/'
+root_folder = 'ACCS_Work/GMU_17_Moose'
+
+# Define data folders
+input_dir = os.path.join(drive, root_folder, 'Data_01_Input')
+pipeline_dir = os.path.join(drive, root_folder, 'Data_02_Pipeline')
+output_dir = os.path.join(drive, root_folder, 'Data_03_Output')
+geodatabase = os.path.join(drive, root_folder, 'GIS/Moose_SouthwestAlaska.gdb')
+
+# Define input data
+calving_csv = os.path.join(output_dir, 'animalData/cleanedGPSCalvingSeason.csv')
+start_points_table = os.path.join(geodatabase, 'randomStartPts')
+distribution_folder = os.path.join(pipeline_dir, '01-generateDistributions')
+study_area = os.path.join(input_dir, 'southwestAlaska_StudyArea.tif')
+waterice_mask = os.path.join(input_dir, 'waterice_mask.tif')
+
+# Define output data
+output_file = os.path.join(pipeline_dir, '04-createRandomPaths/allPaths.parquet')
+
+# Define number of paths per moose-year and random seed
+number_of_paths = 100
+seed = 21
+
+# Load data
+print('Loading observed paths, start points, random distributions, and habitat mask...')
+calving_season = pd.read_csv(calving_csv)
+start_points = pd.DataFrame(arcpy.da.TableToNumPyArray(start_points_table, ['deployment_id', 'POINT_X', 'POINT_Y']))
+bearings = read_random_sample(os.path.join(distribution_folder, 'randomRadians.csv'))
+distances = {0: read_random_sample(os.path.join(distribution_folder, 'randomDistances_calf0.csv')),
+             1: read_random_sample(os.path.join(distribution_folder, 'randomDistances_calf1.csv'))}
+habitat_mask = read_habitat_mask(study_area, [waterice_mask])
+print('----------')
+
+# Summarize the number of points and calf status of every observed path
+path_info = calving_season.groupby('mooseYear_id', sort=False).agg(calfStatus=('calfStatus', 'first'),
+                                                                   length=('RowID', 'size')).reset_index()
+path_info['deployment_id'] = path_info['mooseYear_id'].str.split('_').str[0]
+path_info['number_of_paths'] = number_of_paths
+
+# Generate random paths
+print(f'Generating {number_of_paths} random paths per moose-year...')
+iteration_start = time.time()
+random_paths = simulate_random_paths(start_points, path_info, bearings, distances, seed=seed, habitat_mask=habitat_mask)
+random_paths['response'] = 0
+iteration_elapsed = int(time.time() - iteration_start)
+print(f'Completed {len(random_paths)} points at {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
+print('----------')
+
+# Format observed paths to match random paths
+observed_paths = calving_season[['mooseYear_id', 'RowID', 'Easting', 'Northing', 'calfStatus', 'deployment_id']]
+observed_paths = observed_paths.rename(columns={'RowID': 'pointID', 'Easting': 'x', 'Northing': 'y'})
+observed_paths = observed_paths.assign(response=1, pathID='observed')
+observed_paths['fullPath_id'] = observed_paths['mooseYear_id'] + '-' + observed_paths['pathID']
+observed_paths['fullPoint_id'] = observed_paths['fullPath_id'] + '-' + observed_paths['pointID'].astype(str)
+
+# Combine observed and random paths and export in columnar format
+# Projection is EPSG = 3338, NAD 83 Alaska Albers
+random_paths['pathID'] = random_paths['pathID'].astype(str)
+all_paths = pd.concat([observed_paths, random_paths], ignore_index=True, sort=False)
+all_paths.to_parquet(output_file, index=False)
+print(f'Exported {all_paths["fullPath_id"].nunique()} paths.')
+print('----------')
@@ -3,13 +3,14 @@
 # Convert Paths
 # Author: Timm Nawrocki
 # Last Updated: 2020-03-25
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
-# Description: "Convert Paths" converts a set of xy points stored in a csv table to a feature class stored in a geodatabase.
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with pandas and pyarrow.
+# Description: "Convert Paths" converts a set of xy points stored in a parquet table to a feature class stored in a geodatabase.
 # ---------------------------------------------------------------------------
 
 # Import packages
 import arcpy
 import os
+import pandas as pd
 
 # Set root directory
 drive = 'C:\\'
@@ -22,20 +23,21 @@ arcpy.env.overwriteOutput = True
 geodatabase = os.path.join(drive, root_folder, 'GIS\\Moose_SouthwestAlaska.gdb')
 
 # Define input data
-input_csv = os.path.join(drive, root_folder, 'Data_02_Pipeline\\04-createRandomPaths\\allPaths.csv')
+input_file = os.path.join(drive, root_folder, 'Data_02_Pipeline\\04-createRandomPaths\\allPaths.parquet')
 input_projection = 3338
 x_coords = "x"
 y_coords = "y"
 
 # Define output shapefile
-output_layer = "allPaths_layer"
 output_shapefile = "allPaths_AKALB"
 
 # Define the initial projection
 initial_projection = arcpy.SpatialReference(input_projection)
 
-# Convert csv to shapefile
-arcpy.MakeXYEventLayer_management(input_csv, x_coords, y_coords, output_layer, spatial_reference=initial_projection)
-arcpy.conversion.FeatureClassToFeatureClass(in_features=output_layer, out_path=geodatabase, out_name=output_shapefile)
+# Convert parquet table to shapefile
+path_data = pd.read_parquet(input_file)
+path_array = path_data.to_records(index=False, column_dtypes={column: f'<U{int(path_data[column].str.len().max())}'
+                                                              for column in path_data.select_dtypes('object')})
+arcpy.da.NumPyArrayToFeatureClass(path_array, os.path.join(geodatabase, output_shapefile), (x_coords, y_coords), initial_projection)
 
 print("Complete converting to shapefile.")
\ No newline at end of file
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Extract Covariates to Points
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, pandas, pyarrow, and rasterio.
+# Description: "Extract Covariates to Points" extracts data from the covariate cube to points representing actual and random moose paths directly from the path table.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import datetime
+import os
+import pandas as pd
+import time
+from package_GeospatialProcessing import extract_points_to_covariates
+from package_GeospatialProcessing import open_covariate_cube
+
+# Set root directory
+drive = 'C:/'
+root_folder = 'ACCS_Work/GMU_17_Moose'
+
+# Define data folders
+input_dir = os.path.join(drive, root_folder, 'Data_01_Input')
+pipeline_dir = os.path.join(drive, root_folder, 'Data_02_Pipeline')
+
+# Define input files
+input_file = os.path.join(pipeline_dir, '04-createRandomPaths/allPaths.parquet')
+cube_file = os.path.join(input_dir, 'covariate_cube/southwestAlaska_Covariates.npy')
+
+# Define output csv file
+output_csv = os.path.join(pipeline_dir, '06-extractCovariates/allPoints_extractedCovariates.csv')
+
+# Read path data and covariate cube
+print('Reading path data and covariate cube...')
+iteration_start = time.time()
+path_data = pd.read_parquet(input_file)
+covariate_cube = open_covariate_cube(cube_file)
+print(f'Number of covariates: {len(covariate_cube["header"]["covariates"])}')
+iteration_elapsed = int(time.time() - iteration_start)
+print(f'Completed at {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
+print('----------')
+
+# Extract covariates to all path points
+print(f'Extracting covariates to {len(path_data)} points...')
+iteration_start = time.time()
+covariate_values = extract_points_to_covariates(path_data[['x', 'y']].to_numpy(), covariate_cube)
+for name, values in covariate_values.items():
+    path_data[name] = values.filled(float('nan'))
+iteration_elapsed = int(time.time() - iteration_start)
+print(f'Completed at {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
+print('----------')
+
+# Export data as a csv
+path_data.to_csv(output_csv, header=True, index=False, sep=',', na_rep='NA', encoding='utf-8')
+print('Finished extracting to paths.')
+print('----------')
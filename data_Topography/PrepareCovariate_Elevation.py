@@ -2,15 +2,15 @@
 # ---------------------------------------------------------------------------
 # Prepare elevation covariate
 # Author: Timm Nawrocki
-# Last Updated: 2021-05-25
+# Last Updated: 2026-10-18
 # Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
 # Description: "Prepare elevation covariate" merges and extracts raster tiles into a single raster.
 # ---------------------------------------------------------------------------
 
 # Import packages
 import os
-from package_GeospatialProcessing import arcpy_geoprocessing
 from package_GeospatialProcessing import create_minimum_raster
+from package_GeospatialProcessing.outputCache import cached_geoprocessing
 
 # Set root directory
 drive = 'N:/'
@@ -18,7 +18,6 @@ root_folder = 'ACCS_Work'
 
 # Define data folder
 data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
-work_geodatabase = os.path.join(data_folder, 'Moose_SouthwestAlaska.gdb')
 
 # Define input rasters
 study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
@@ -45,16 +44,13 @@ combine_inputs = [study_area, elevation_C5, elevation_C6, elevation_D5, elevatio
 combine_outputs = [elevation_covariate]
 
 # Create key word arguments
-combine_kwargs = {'cell_size': 10,
-                  'output_projection': 3338,
-                  'value_type': '16_BIT_SIGNED',
+combine_kwargs = {'value_type': '16_BIT_SIGNED',
                   'no_data': '-32768',
-                  'work_geodatabase': work_geodatabase,
                   'input_array': combine_inputs,
                   'output_array': combine_outputs
                   }
 
-# Combine raster tiles
+# Combine raster tiles if the output does not exist or its inputs have changed
 print('Combining raster tiles...')
-arcpy_geoprocessing(create_minimum_raster, **combine_kwargs)
+cached_geoprocessing(create_minimum_raster, **combine_kwargs)
 print('----------')
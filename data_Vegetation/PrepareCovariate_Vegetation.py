@@ -2,16 +2,16 @@
 # ---------------------------------------------------------------------------
 # Prepare vegetation cover covariates
 # Author: Timm Nawrocki
-# Last Updated: 2021-05-26
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
-# Description: "Prepare vegetation cover covariates" extracts foliar cover maps to the study area boundary to ensure matching extents.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with rasterio. Must be run as a script so that worker processes can import it safely.
+# Description: "Prepare vegetation cover covariates" extracts foliar cover maps to the study area boundary to ensure matching extents. Map groups are processed in parallel.
 # ---------------------------------------------------------------------------
 
 # Import packages
-import arcpy
 import os
-from package_GeospatialProcessing import arcpy_geoprocessing
 from package_GeospatialProcessing import create_minimum_raster
+from package_GeospatialProcessing.scheduleWorkUnits import create_work_unit
+from package_GeospatialProcessing.scheduleWorkUnits import run_work_units
 
 # Set root directory
 drive = 'N:/'
@@ -21,7 +21,6 @@ root_folder = 'ACCS_Work'
 data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
 vegetation_folder = os.path.join(drive, root_folder,
                                  'Projects/VegetationEcology/AKVEG_QuantitativeMap/Data/Data_Output/rasters_final/round_20210402')
-work_geodatabase = os.path.join(data_folder, 'Moose_SouthwestAlaska.gdb')
 
 # Define study area
 study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
@@ -35,39 +34,32 @@ grids_major = ['C5', 'C6',
 map_groups = ['alnus', 'betshr', 'dectre', 'dryas', 'empnig', 'erivag', 'picgla', 'picmar', 'rhoshr', 'salshr', 'sphagn', 'vaculi',
               'vacvit', 'wetsed']
 
-# Iterate through all inputs to create all outputs
+# Create a work unit for each map group
+work_units = []
 for group in map_groups:
     # Define input rasters
-    raster_C5 = os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_C5.tif')
-    raster_C6 = os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_C6.tif')
-    raster_D5 = os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_D5.tif')
-    raster_D6 = os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_D6.tif')
-    raster_E5 = os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_E5.tif')
+    group_rasters = [os.path.join(vegetation_folder, group, 'NorthAmericanBeringia_' + group + '_' + grid + '.tif')
+                     for grid in grids_major]
 
     # Define output raster
     raster_output = os.path.join(data_folder, 'Data_Input/vegetation', group + '.tif')
 
-    # If output raster does not already exist, create output raster
-    if arcpy.Exists(raster_output) == 0:
-        # Define input and output arrays
-        combine_inputs = [study_area, raster_C5, raster_C6, raster_D5, raster_D6, raster_E5]
-        combine_outputs = [raster_output]
+    # Define input and output arrays
+    combine_inputs = [study_area] + group_rasters
+    combine_outputs = [raster_output]
 
-        # Create key word arguments
-        combine_kwargs = {'cell_size': 10,
-                          'output_projection': 3338,
-                          'value_type': '16_BIT_SIGNED',
-                          'no_data': '-32768',
-                          'work_geodatabase': work_geodatabase,
-                          'input_array': combine_inputs,
-                          'output_array': combine_outputs
-                          }
+    # Create key word arguments
+    combine_kwargs = {'value_type': '16_BIT_SIGNED',
+                      'no_data': '-32768',
+                      'input_array': combine_inputs,
+                      'output_array': combine_outputs
+                      }
 
-        # Combine raster tiles
-        print(f'Combining raster tiles for {group}...')
-        arcpy_geoprocessing(create_minimum_raster, **combine_kwargs)
-        print('----------')
+    # Append work unit to combine raster tiles
+    work_units.append(create_work_unit(group, create_minimum_raster, combine_kwargs))
 
-    else:
-        print(f'Output raster for {group} already exists.')
-        print('----------')
+# Combine raster tiles for all map groups that do not already exist
+if __name__ == '__main__':
+    print(f'Combining raster tiles for {len(map_groups)} map groups...')
+    print('----------')
+    run_work_units(work_units)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Prepare NLCD covariates
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio, or in an ArcGIS Pro Python 3.6 installation with the arcpy backend.
+# Description: "Prepare NLCD covariates" reads the NLCD 2016 once and writes the barren covariate within the elevation mask and the mask raster that excludes water and snow/ice from the study area.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import os
+from package_GeospatialProcessing import combine_raster_classes
+from package_GeospatialProcessing.outputCache import cached_geoprocessing
+
+# Set root directory
+drive = 'N:/'
+root_folder = 'ACCS_Work'
+
+# Define data folder
+data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
+vegetation_folder = os.path.join(drive, root_folder, 'Data/biota/vegetation')
+
+# Define input rasters
+raster_nlcd = os.path.join(vegetation_folder, 'Alaska_NationalLandCoverDatabase/Alaska_NationalLandCoverDatabase_2016_20200213.img')
+
+# Define study area and elevation mask
+study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
+elevation_mask = os.path.join(data_folder, 'Data_Input/southwestAlaska_ElevationMask_300.tif')
+
+# Define output rasters
+barren_output = os.path.join(data_folder, 'Data_Input/vegetation/barren.tif')
+waterice_output = os.path.join(data_folder, 'Data_Input/waterice_mask.tif')
+
+# Define reclass tables that map NLCD classes to output values
+reclass_barren = {31: 50}
+reclass_waterice = {value: 1 for value in [21, 22, 23, 24, 31, 41, 42, 43, 51, 52, 71, 72, 74, 81, 82, 90, 95]}
+
+# Define input and output arrays
+combine_inputs = [study_area, raster_nlcd, elevation_mask, study_area]
+combine_outputs = [barren_output, waterice_output]
+
+# Create key word arguments
+combine_kwargs = {'value_type': '16_BIT_SIGNED',
+                  'no_data': '-32768',
+                  'reclass_tables': [reclass_barren, reclass_waterice],
+                  'input_array': combine_inputs,
+                  'output_array': combine_outputs
+                  }
+
+# Reclassify raster classes if the outputs do not exist or their inputs have changed
+print('Reclassifying NLCD for barren and water/ice mask...')
+cached_geoprocessing(combine_raster_classes, **combine_kwargs)
+print('----------')
@@ -2,17 +2,35 @@
 # ---------------------------------------------------------------------------
 # Initialization for Geospatial Processing Module
 # Author: Timm Nawrocki
-# Last Updated: 2021-06-21
+# Last Updated: 2026-10-18
 # Usage: Individual functions have varying requirements. All functions that use arcpy must be executed in an ArcGIS Pro Python 3.6 distribution.
 # Description: This initialization file imports modules in the package so that the contents are accessible.
 # ---------------------------------------------------------------------------
 
 # Import functions from modules
 from package_GeospatialProcessing.arcpyGeoprocessing import arcpy_geoprocessing
+from package_GeospatialProcessing.calculateEdgeDistance import calculate_edge_distance
 from package_GeospatialProcessing.inverseDensityWeightedDistance import calculate_idw_distance
 from package_GeospatialProcessing.combineRasterClasses import combine_raster_classes
+from package_GeospatialProcessing.covariateCube import build_covariate_cube
+from package_GeospatialProcessing.covariateCube import extract_cube_values
+from package_GeospatialProcessing.covariateCube import open_covariate_cube
 from package_GeospatialProcessing.createMinimumRaster import create_minimum_raster
 from package_GeospatialProcessing.extractFeaturesToRaster import extract_features_to_raster
+from package_GeospatialProcessing.extractPointsToCovariates import extract_points_to_covariates
 from package_GeospatialProcessing.extractToBoundary import extract_to_boundary
 from package_GeospatialProcessing.projectXYTable import project_xy_table
+from package_GeospatialProcessing.rasterBackend import get_raster_backend
+from package_GeospatialProcessing.rasterBackend import set_raster_backend
+from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+from package_GeospatialProcessing.rasterBlocks import set_block_pipeline
+from package_GeospatialProcessing.rasterExpression import evaluate_expression
+from package_GeospatialProcessing.rasterExpression import open_raster
+from package_GeospatialProcessing.rasterExpression import study_area_mask
+from package_GeospatialProcessing.rasterExpression import where
+from package_GeospatialProcessing.rasterStatistics import read_raster_statistics
+from package_GeospatialProcessing.stageProfiling import profile_stage
+from package_GeospatialProcessing.stageProfiling import profiled
+from package_GeospatialProcessing.stageProfiling import set_profile_log
+from package_GeospatialProcessing.stageProfiling import summarize_profile_log
 from package_GeospatialProcessing.sumRasters import sum_rasters
@@ -2,8 +2,8 @@
 # ---------------------------------------------------------------------------
 # Arcpy Geoprocessing Wrapper
 # Author: Timm Nawrocki
-# Last Updated: 2019-10-29
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation. Datasets are checked with arcpy if it is installed.
 # Description: "Arcpy Geoprocessing Wrapper" is a function that wraps other arcpy functions for standardization, input and output checks, and error reporting.
 # ---------------------------------------------------------------------------
 
@@ -22,18 +22,30 @@ def arcpy_geoprocessing(geoprocessing_function, check_output = True, check_input
     """
 
     # Import packages
-    import arcpy
+    import os
+    try:
+        import arcpy
+    except ImportError:
+        arcpy = None
+
+    # Check datasets with arcpy where it is installed so that geodatabase datasets are found, otherwise check files
+    if arcpy is not None:
+        dataset_exists = lambda dataset: arcpy.Exists(dataset) == True
+        execute_error = arcpy.ExecuteError
+    else:
+        dataset_exists = os.path.exists
+        execute_error = ()
 
     try:
         # If check_output is True, then check if output exists and warn of overwrite if it does
         if check_output == True:
             for output_data in kwargs['output_array']:
-                if arcpy.Exists(output_data) == True:
+                if dataset_exists(output_data) == True:
                     print(f"{output_data} already exists and will be overwritten.")
         # If check_input is True, then check if inputs exist and quit if any do not
         if check_input == True:
             for input_data in kwargs['input_array']:
-                if arcpy.Exists(input_data) != True:
+                if dataset_exists(input_data) != True:
                     print(f'{input_data} does not exist. Check that environment workspace is correct.')
                     quit()
         # Execute geoprocessing function if all input data exists
@@ -45,6 +57,6 @@ def arcpy_geoprocessing(geoprocessing_function, check_output = True, check_input
         except:
             print(out_process)
     # Provide arcpy errors for execution error
-    except arcpy.ExecuteError as err:
+    except execute_error as err:
         print(arcpy.GetMessages())
         quit()
\ No newline at end of file
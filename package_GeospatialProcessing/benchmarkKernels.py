@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Benchmark kernels
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, and rasterio. Does not require arcpy.
+# Description: "Benchmark kernels" is a set of functions that generate synthetic aligned study area rasters and measure the wall time, throughput, and peak memory of the raster kernels of the geospatial processing package so that alternative engines can be compared against a recorded baseline.
+# ---------------------------------------------------------------------------
+
+# Define the kernels that can be benchmarked
+BENCHMARK_KERNELS = ['sum_rasters',
+                     'create_minimum_raster',
+                     'extract_to_boundary',
+                     'combine_raster_classes',
+                     'calculate_idw_distance']
+
+# Define a function to write a synthetic raster block by block
+def write_synthetic_raster(output_raster, size, cell_size, data_type, no_data, block_function, block_size=2048):
+    """
+    Description: writes a square synthetic GeoTIFF in Alaska Albers by filling each block with a block function
+    Inputs: output_raster -- path to the output GeoTIFF
+            size -- the number of rows and columns
+            cell_size -- the cell size in meters
+            data_type -- the numpy data type of the raster
+            no_data -- the raster no data value
+            block_function -- a function that receives a rasterio window and returns an array for the window
+            block_size -- the number of rows and columns written per block
+    Returned Value: Returns the output raster path
+    Preconditions: none
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import iterate_blocks
+    import rasterio
+    from rasterio.transform import from_origin
+
+    # Write the raster in blocks so that large rasters are not held in memory
+    output_profile = {'driver': 'GTiff',
+                      'width': size,
+                      'height': size,
+                      'count': 1,
+                      'dtype': data_type,
+                      'nodata': no_data,
+                      'crs': 'EPSG:3338',
+                      'transform': from_origin(-300000, 1200000, cell_size, cell_size),
+                      'tiled': True,
+                      'blockxsize': 256,
+                      'blockysize': 256,
+                      'compress': 'lzw',
+                      'BIGTIFF': 'IF_SAFER'}
+    with rasterio.open(output_raster, 'w', **output_profile) as output_dataset:
+        for window in iterate_blocks(size, size, block_size):
+            output_dataset.write(block_function(window).astype(data_type), 1, window=window)
+    return output_raster
+
+# Define a function to create synthetic aligned rasters
+def create_synthetic_rasters(output_folder, size, cell_size=10, seed=314, block_size=2048):
+    """
+    Description: creates a synthetic study area, boundary, three foliar cover rasters, and a land cover raster on the same grid
+    Inputs: output_folder -- folder where the rasters are created
+            size -- the number of rows and columns of each raster
+            cell_size -- the cell size in meters (optional, default is 10)
+            seed -- the seed of the random values (optional)
+            block_size -- the number of rows and columns written per block (optional, default is 2048)
+    Returned Value: Returns a dictionary of raster paths; existing rasters are reused
+    Preconditions: none
+    """
+
+    # Import packages
+    import numpy as np
+    import os
+
+    # Define a function to calculate the relative distance of a window from the grid center
+    def ellipse_distance(window):
+        rows, columns = np.ogrid[window.row_off:window.row_off + window.height,
+                                 window.col_off:window.col_off + window.width]
+        center = (size - 1) / 2
+        return ((rows - center) / (0.48 * size)) ** 2 + ((columns - center) / (0.40 * size)) ** 2
+
+    # Define a function to create patchy random values for a window
+    def patch_values(window, raster_seed, values, probabilities=None, patch_size=16):
+        block_seed = [seed, raster_seed, window.row_off, window.col_off]
+        random_state = np.random.RandomState(block_seed)
+        patch_shape = (-(-window.height // patch_size), -(-window.width // patch_size))
+        patches = random_state.choice(values, size=patch_shape, p=probabilities)
+        patches = np.repeat(np.repeat(patches, patch_size, axis=0), patch_size, axis=1)
+        return patches[:window.height, :window.width]
+
+    # Define a function to create a cover window with no data patches outside the inner ellipse
+    def cover_window(window, raster_seed):
+        cover_values = np.r_[np.zeros(30, dtype='int16'), np.arange(1, 101, dtype='int16')]
+        cover_array = patch_values(window, raster_seed, cover_values)
+        cover_array[(ellipse_distance(window) > 1.1) & (patch_values(window, raster_seed + 100, [0, 1]) == 1)] = -32768
+        return cover_array
+
+    # Define the land cover classes of the National Land Cover Database
+    nlcd_classes = [11, 12, 31, 41, 42, 43, 51, 52, 71, 90, 95]
+
+    # Create the rasters that do not already exist
+    os.makedirs(output_folder, exist_ok=True)
+    rasters = {'study_area': os.path.join(output_folder, f'study_area_{size}.tif'),
+               'boundary': os.path.join(output_folder, f'boundary_{size}.tif'),
+               'cover_1': os.path.join(output_folder, f'cover_1_{size}.tif'),
+               'cover_2': os.path.join(output_folder, f'cover_2_{size}.tif'),
+               'cover_3': os.path.join(output_folder, f'cover_3_{size}.tif'),
+               'land_cover': os.path.join(output_folder, f'land_cover_{size}.tif')}
+    block_functions = {'study_area': ('uint8', 255,
+                                      lambda window: np.where(ellipse_distance(window) <= 1, 1, 255)),
+                       'boundary': ('uint8', 255,
+                                    lambda window: np.where(ellipse_distance(window) <= 0.8, 1, 255)),
+                       'cover_1': ('int16', -32768, lambda window: cover_window(window, 1)),
+                       'cover_2': ('int16', -32768, lambda window: cover_window(window, 2)),
+                       'cover_3': ('int16', -32768, lambda window: cover_window(window, 3)),
+                       'land_cover': ('uint8', 0,
+                                      lambda window: patch_values(window, 4, nlcd_classes))}
+    for name, raster in rasters.items():
+        if not os.path.exists(raster):
+            data_type, no_data, block_function = block_functions[name]
+            write_synthetic_raster(raster, size, cell_size, data_type, no_data, block_function, block_size)
+    return rasters
+
+# Define a function to define the inputs of a benchmark kernel
+def get_kernel_arguments(kernel, rasters, output_raster, block_size=2048, backend='numpy'):
+    """
+    Description: defines the geoprocessing function and key word arguments of a benchmark kernel on synthetic rasters
+    Inputs: kernel -- the name of a kernel in BENCHMARK_KERNELS
+            rasters -- a dictionary of synthetic raster paths returned by create_synthetic_rasters
+            output_raster -- path to the output raster of the kernel
+            block_size -- the number of rows and columns processed per block
+            backend -- the name of the raster backend (optional, default is numpy)
+    Returned Value: Returns a tuple of the geoprocessing function and its key word arguments
+    Preconditions: rasters must be created by create_synthetic_rasters
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.combineRasterClasses import combine_raster_classes
+    from package_GeospatialProcessing.createMinimumRaster import create_minimum_raster
+    from package_GeospatialProcessing.extractToBoundary import extract_to_boundary
+    from package_GeospatialProcessing.inverseDensityWeightedDistance import calculate_idw_distance
+    from package_GeospatialProcessing.sumRasters import sum_rasters
+
+    # Define the function and arguments of each kernel
+    cover_rasters = [rasters['cover_1'], rasters['cover_2'], rasters['cover_3']]
+    if kernel == 'sum_rasters':
+        return sum_rasters, {'backend': backend,
+                             'block_size': block_size,
+                             'input_array': [rasters['study_area']] + cover_rasters,
+                             'output_array': [output_raster]}
+    elif kernel == 'create_minimum_raster':
+        return create_minimum_raster, {'backend': backend,
+                                       'value_type': '16_BIT_SIGNED',
+                                       'no_data': '-32768',
+                                       'block_size': block_size,
+                                       'input_array': [rasters['study_area']] + cover_rasters,
+                                       'output_array': [output_raster]}
+    elif kernel == 'extract_to_boundary':
+        return extract_to_boundary, {'backend': backend,
+                                     'no_data_replace': 0,
+                                     'block_size': block_size,
+                                     'input_array': [rasters['cover_1'], rasters['boundary'], rasters['study_area']],
+                                     'output_array': [output_raster]}
+    elif kernel == 'combine_raster_classes':
+        return combine_raster_classes, {'backend': backend,
+                                        'value_type': '16_BIT_SIGNED',
+                                        'no_data': '-32768',
+                                        'statement': 'VALUE = 31',
+                                        'out_value': 50,
+                                        'block_size': block_size,
+                                        'input_array': [rasters['study_area'], rasters['land_cover']],
+                                        'output_array': [output_raster]}
+    elif kernel == 'calculate_idw_distance':
+        return calculate_idw_distance, {'backend': backend,
+                                        'target_value': 50,
+                                        'input_array': [rasters['study_area'], rasters['cover_1']],
+                                        'output_array': [output_raster]}
+    raise ValueError(f'Kernel must be one of {", ".join(BENCHMARK_KERNELS)}.')
+
+# Define a function to time a single run of a benchmark kernel
+def run_kernel(kernel, rasters, output_raster, block_size=2048, backend='numpy'):
+    """
+    Description: runs a benchmark kernel once with its progress messages suppressed and measures wall time and peak memory
+    Inputs: kernel -- the name of a kernel in BENCHMARK_KERNELS
+            rasters -- a dictionary of synthetic raster paths
+            output_raster -- path to the output raster of the kernel
+            block_size -- the number of rows and columns processed per block
+            backend -- the name of the raster backend
+    Returned Value: Returns a dictionary of 'wall_time' and 'cpu_time' in seconds and the 'peak_rss' of the process in bytes
+    Preconditions: must run in a new process so that the peak memory of the process reflects only the kernel
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.stageProfiling import get_resource_usage
+    import contextlib
+    import io
+    import os
+    import time
+
+    # Run the kernel and remove its output
+    geoprocessing_function, kernel_kwargs = get_kernel_arguments(kernel, rasters, output_raster, block_size, backend)
+    start_usage = get_resource_usage()
+    start_clock = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        geoprocessing_function(**kernel_kwargs)
+    wall_time = time.perf_counter() - start_clock
+    end_usage = get_resource_usage()
+    if os.path.exists(output_raster):
+        os.remove(output_raster)
+    return {'wall_time': wall_time,
+            'cpu_time': end_usage['cpu_time'] - start_usage['cpu_time'],
+            'peak_rss': end_usage['peak_rss']}
+
+# Define a function to benchmark raster kernels
+def benchmark_kernels(data_folder, sizes, kernels=None, repeats=3, block_size=2048, backend='numpy', results_file=None,
+                      baseline_file=None):
+    """
+    Description: creates synthetic rasters at each size and measures the throughput and peak memory of each kernel, with each run in a new process
+    Inputs: data_folder -- folder where synthetic rasters and kernel outputs are created
+            sizes -- a list of raster sizes in rows and columns (e.g., [1000, 10000, 30000])
+            kernels -- a list of kernel names (optional, default is all kernels in BENCHMARK_KERNELS)
+            repeats -- the number of runs of each kernel and size (optional, default is 3)
+            block_size -- the number of rows and columns processed per block (optional, default is 2048)
+            backend -- the name of the raster backend (optional, default is numpy)
+            results_file -- path to a JSON file where the results are saved (optional)
+            baseline_file -- path to a JSON file of previous results to compare against (optional)
+    Returned Value: Returns a list of benchmark results with the best wall time, median wall time, cells per second, and peak memory of each kernel and size
+    Preconditions: the folder must have space for six rasters at the largest size
+    """
+
+    # Import packages
+    from concurrent.futures import ProcessPoolExecutor
+    import json
+    import multiprocessing
+    import numpy as np
+    import os
+    import platform
+
+    # Read the baseline results
+    if kernels is None:
+        kernels = BENCHMARK_KERNELS
+    baseline = {}
+    if baseline_file is not None and os.path.exists(baseline_file):
+        with open(baseline_file, 'r') as baseline_reader:
+            baseline = {(result['kernel'], result['size']): result for result in json.load(baseline_reader)['results']}
+
+    # Run each kernel in a new process so that peak memory is measured separately
+    results = []
+    print(f'{"Kernel":<26}{"Size":>8}{"Best (s)":>11}{"Median (s)":>12}{"Mcells/s":>11}{"Peak RSS (MB)":>15}{"Baseline":>10}')
+    for size in sizes:
+        rasters = create_synthetic_rasters(os.path.join(data_folder, f'synthetic_{size}'), size, block_size=block_size)
+        for kernel in kernels:
+            output_raster = os.path.join(data_folder, f'synthetic_{size}', f'output_{kernel}.tif')
+            runs = []
+            for _ in range(repeats):
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    runs.append(executor.submit(run_kernel, kernel, rasters, output_raster, block_size, backend).result())
+            wall_times = [run['wall_time'] for run in runs]
+            peak_values = [run['peak_rss'] for run in runs if run['peak_rss'] is not None]
+            result = {'kernel': kernel,
+                      'size': size,
+                      'cells': size * size,
+                      'repeats': repeats,
+                      'best_time': min(wall_times),
+                      'median_time': float(np.median(wall_times)),
+                      'cpu_time': float(np.median([run['cpu_time'] for run in runs])),
+                      'cells_per_second': size * size / min(wall_times),
+                      'peak_rss': max(peak_values) if peak_values else None}
+            if (kernel, size) in baseline:
+                result['speedup'] = baseline[(kernel, size)]['best_time'] / result['best_time']
+            results.append(result)
+            # Report the result
+            peak_text = f'{result["peak_rss"] / 1048576:.1f}' if result['peak_rss'] is not None else 'n/a'
+            speedup_text = f'x{result["speedup"]:.2f}' if 'speedup' in result else ''
+            print(f'{kernel:<26}{size:>8}{result["best_time"]:>11.2f}{result["median_time"]:>12.2f}'
+                  f'{result["cells_per_second"] / 1e6:>11.1f}{peak_text:>15}{speedup_text:>10}')
+    print('----------')
+
+    # Save the results with a description of the machine
+    if results_file is not None:
+        with open(results_file, 'w') as results_writer:
+            json.dump({'machine': {'platform': platform.platform(),
+                                   'python': platform.python_version(),
+                                   'processors': os.cpu_count()},
+                       'block_size': block_size,
+                       'backend': backend,
+                       'results': results},
+                      results_writer,
+                      indent=2)
+    return results
@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Calculate edge distance
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, and rasterio.
+# Description: "Calculate edge distance" is a function that calculates the minimum inverse density-weighted distance across all foliar cover values of a cover raster on the in-memory study area grid with one exact distance transform per cover value and bounded working memory, or updates a previous output only where the cover has changed. Distances can be saturated at a maximum distance so that tiles are read with a halo, calculated independently on worker processes, and written as they finish.
+# ---------------------------------------------------------------------------
+
+# Define a function to add the weighted distance to the sources of one cover value to a running minimum
+def minimum_weighted_distance(background_array, weight, cell_size, edge_array, feature_array, band_cells=1048576):
+    """
+    Description: calculates the exact euclidean distance to the nearest source cell from a feature transform and lowers a running minimum to the weighted distance, converting the feature transform to distances in bands of rows so that no full grid of double precision distances is allocated
+    Inputs: background_array -- a two-dimensional boolean array that is False at source cells
+            weight -- the factor by which distances are multiplied
+            cell_size -- the cell size of the array in map units
+            edge_array -- a float32 array of the running minimum, which is updated in place
+            feature_array -- an int32 array with shape (2,) + the array shape that receives the feature transform and is reused between calls
+            band_cells -- the approximate number of cells converted to distances at once (optional, default is 1048576)
+    Returned Value: Returns the updated edge array
+    Preconditions: the background array must contain at least one source cell
+    """
+
+    # Import packages
+    import numpy as np
+    from scipy.ndimage import distance_transform_edt
+
+    # Calculate the index of the nearest source cell for every cell
+    distance_transform_edt(background_array, return_distances=False, return_indices=True, indices=feature_array)
+
+    # Convert the indices to weighted distances one band of rows at a time
+    height, width = background_array.shape
+    band_rows = max(1, band_cells // max(width, 1))
+    column_index = np.arange(width, dtype='int32')[np.newaxis, :]
+    for row_start in range(0, height, band_rows):
+        row_end = min(height, row_start + band_rows)
+        row_index = np.arange(row_start, row_end, dtype='int32')[:, np.newaxis]
+        distance_array = (feature_array[0, row_start:row_end] - row_index).astype(np.float64)
+        distance_array *= cell_size
+        np.multiply(distance_array, distance_array, out=distance_array)
+        column_distance = (feature_array[1, row_start:row_end] - column_index).astype(np.float64)
+        column_distance *= cell_size
+        np.multiply(column_distance, column_distance, out=column_distance)
+        distance_array += column_distance
+        del column_distance
+        np.sqrt(distance_array, out=distance_array)
+        distance_array *= weight
+        np.minimum(edge_array[row_start:row_end], distance_array, out=edge_array[row_start:row_end], casting='unsafe')
+    return edge_array
+
+# Define a function to calculate the density-weighted distance for all cover values of an array
+def weighted_edge_distance(cover_array, cell_size, minimum_cover=10, cover_values=None):
+    """
+    Description: calculates the minimum of euclidean distance divided by density across all cover values in an array with one exact distance transform per cover value, reusing the same source and feature transform arrays for every value
+    Inputs: cover_array -- a two-dimensional integer array of foliar cover values
+            cell_size -- the cell size of the array in map units
+            minimum_cover -- the minimum foliar cover value that is treated as a source
+            cover_values -- an optional sequence of cover values known to be present in the array
+    Returned Value: Returns a float32 array of minimum inverse density-weighted distances (infinite where no source exists)
+    Preconditions: requires a cover array where no data cells have been set to a value below the minimum cover
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Determine the cover values that are present in the array
+    if cover_values is None:
+        cover_values = np.flatnonzero(np.bincount(cover_array[cover_array >= minimum_cover].ravel()))
+    cover_values = sorted(int(value) for value in cover_values if value >= minimum_cover)
+
+    # Calculate the running minimum of the weighted distance to each cover value
+    edge_array = np.full(cover_array.shape, np.inf, dtype='float32')
+    background_array = np.empty(cover_array.shape, dtype=bool)
+    feature_array = None
+    for value in cover_values:
+        np.not_equal(cover_array, value, out=background_array)
+        if background_array.all():
+            continue
+        if feature_array is None:
+            feature_array = np.empty((2,) + cover_array.shape, dtype='int32')
+        # Weight the exact euclidean distance to all cells of the target value by inverse density and retain the minimum
+        minimum_weighted_distance(background_array, 100 / value, cell_size, edge_array, feature_array)
+    return edge_array
+
+# Define a function to select the source cells of a cover array
+def select_sources(cover_array, minimum_cover=10, cover_values=None):
+    """
+    Description: sets cover values below the minimum cover or outside the selected cover values to zero so that only source cells retain their values
+    Inputs: cover_array -- a two-dimensional integer array of foliar cover values
+            minimum_cover -- the minimum foliar cover value that is treated as a source
+            cover_values -- an optional sequence of the cover values that are treated as sources
+    Returned Value: Returns an integer array of source cover values where all other cells are zero
+    Preconditions: none
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Retain the selected cover values at or above the minimum cover
+    source_array = np.where(cover_array >= minimum_cover, cover_array, 0)
+    if cover_values is not None:
+        source_array[~np.isin(source_array, list(cover_values))] = 0
+    return source_array
+
+# Define a function to calculate the density-weighted distance of a tile with a halo
+def tile_edge_distance(source_array, window, cell_size, maximum_distance, maximum_value):
+    """
+    Description: calculates the minimum inverse density-weighted distance of a tile from the sources within the tile and a halo that is as wide as the distance at which each cover value reaches the maximum distance, and saturates distances at the maximum distance
+    Inputs: source_array -- a two-dimensional integer array of source cover values returned by select_sources
+            window -- a rasterio window of the tile
+            cell_size -- the cell size of the array in map units
+            maximum_distance -- the weighted distance at which values are saturated
+            maximum_value -- the largest source cover value of the array
+    Returned Value: Returns a float32 array of the distances of the tile
+    Preconditions: none
+    """
+
+    # Import packages
+    import math
+    import numpy as np
+    from scipy.ndimage import distance_transform_edt
+
+    # Determine the cover values present within the widest halo
+    height, width = source_array.shape
+    maximum_halo = math.ceil(maximum_distance * maximum_value / 100 / cell_size)
+    halo_array = source_array[max(0, window.row_off - maximum_halo):window.row_off + window.height + maximum_halo,
+                              max(0, window.col_off - maximum_halo):window.col_off + window.width + maximum_halo]
+    cover_values = np.flatnonzero(np.bincount(halo_array.ravel()))
+    del halo_array
+
+    # Calculate the running minimum of the weighted distance to each cover value within the halo of that value
+    tile_edge = np.full((window.height, window.width), maximum_distance, dtype='float32')
+    for value in cover_values[cover_values > 0]:
+        halo = math.ceil(maximum_distance * value / 100 / cell_size)
+        row_start = max(0, window.row_off - halo)
+        column_start = max(0, window.col_off - halo)
+        source_window = source_array[row_start:min(height, window.row_off + window.height + halo),
+                                     column_start:min(width, window.col_off + window.width + halo)] == value
+        if not source_window.any():
+            continue
+        distance_array = distance_transform_edt(~source_window, sampling=cell_size)
+        distance_array = distance_array[window.row_off - row_start:window.row_off - row_start + window.height,
+                                        window.col_off - column_start:window.col_off - column_start + window.width]
+        distance_array *= 100 / value
+        np.minimum(tile_edge, distance_array, out=tile_edge, casting='unsafe')
+    return tile_edge
+
+# Define a function to calculate the density-weighted distance of a tile from a windowed read of the cover raster
+def read_edge_tile(window, study_area, input_raster, cell_size, maximum_distance, maximum_value, minimum_cover,
+                   cover_values, mask_sources, data_type, no_data, return_sources=False):
+    """
+    Description: reads a tile of the cover raster and the halo that covers the maximum distance, calculates the saturated inverse density-weighted distance of the tile, and converts it to the output data type
+    Inputs: window -- a rasterio window of the tile on the study area grid
+            study_area -- path to the study area raster that defines the grid
+            input_raster -- path to the cover raster
+            cell_size -- the cell size of the grid in map units
+            maximum_distance -- the weighted distance at which values are saturated
+            maximum_value -- the largest source cover value of the cover raster
+            minimum_cover -- the minimum foliar cover value that is treated as a source
+            cover_values -- an optional sequence of the cover values that are treated as sources
+            mask_sources -- if True, cover outside the study area is not treated as a source
+            data_type -- the numpy data type of the output
+            no_data -- the output no data value
+            return_sources -- if True, the source cover values of the tile are also returned (optional, default is False)
+    Returned Value: Returns a tuple of the window, the output tile, and the source tile or None
+    Preconditions: the cover raster must share the grid of the study area raster
+    """
+
+    # Import packages
+    import math
+    import numpy as np
+    import rasterio
+    from rasterio.windows import Window
+
+    # Define the tile window with a halo that is as wide as the distance at which the largest cover value saturates
+    halo = math.ceil(maximum_distance * max(maximum_value, 0) / 100 / cell_size)
+    with rasterio.open(study_area) as study_dataset:
+        height, width = study_dataset.shape
+        row_start = max(0, window.row_off - halo)
+        column_start = max(0, window.col_off - halo)
+        halo_window = Window(column_start,
+                             row_start,
+                             min(width, window.col_off + window.width + halo) - column_start,
+                             min(height, window.row_off + window.height + halo) - row_start)
+        study_bounds = study_dataset.bounds
+        halo_mask = study_dataset.read_masks(1, window=halo_window) > 0
+    # Read the cover of the tile and halo and set no data to zero
+    with rasterio.open(input_raster) as cover_dataset:
+        cover_window = cover_dataset.window(*study_bounds).round_offsets().round_lengths()
+        cover_array = cover_dataset.read(1,
+                                         window=Window(cover_window.col_off + halo_window.col_off,
+                                                       cover_window.row_off + halo_window.row_off,
+                                                       halo_window.width,
+                                                       halo_window.height),
+                                         boundless=True,
+                                         masked=True)
+    cover_array = np.ma.filled(cover_array, 0).astype('int32')
+    if mask_sources:
+        cover_array[~halo_mask] = 0
+    source_array = select_sources(cover_array, minimum_cover, cover_values)
+    del cover_array
+
+    # Calculate the saturated distances of the tile and set cells outside the study area to no data
+    local_window = Window(window.col_off - column_start, window.row_off - row_start, window.width, window.height)
+    tile_rows = slice(local_window.row_off, local_window.row_off + window.height)
+    tile_columns = slice(local_window.col_off, local_window.col_off + window.width)
+    tile_edge = tile_edge_distance(source_array, local_window, cell_size, maximum_distance, maximum_value)
+    output_tile = tile_edge.astype(data_type)
+    output_tile[~halo_mask[tile_rows, tile_columns]] = no_data
+    source_tile = source_array[tile_rows, tile_columns].copy() if return_sources else None
+    return window, output_tile, source_tile
+
+# Define a function to write the density-weighted distance up to a maximum distance tile by tile
+def write_bounded_edge(study_area, input_raster, output_raster, output_profile, cell_size, maximum_distance,
+                       maximum_value, minimum_cover, cover_values, mask_sources, snapshot_parameters=None,
+                       tile_size=2048, workers=1):
+    """
+    Description: calculates the minimum inverse density-weighted distance independently for each tile from windowed reads of the tile and a halo that covers the maximum distance, and writes each tile as soon as it is calculated so that the cover raster is never read into memory as a whole
+    Inputs: study_area -- path to the study area raster that defines the grid
+            input_raster -- path to the cover raster
+            output_raster -- path to the output edge raster
+            output_profile -- the rasterio profile of the output edge raster
+            cell_size -- the cell size of the grid in map units
+            maximum_distance -- the weighted distance at which values are saturated
+            maximum_value -- the largest source cover value of the cover raster
+            minimum_cover -- the minimum foliar cover value that is treated as a source
+            cover_values -- an optional sequence of the cover values that are treated as sources
+            mask_sources -- if True, cover outside the study area is not treated as a source
+            snapshot_parameters -- a dictionary of the calculation parameters, which if given writes a snapshot of the sources next to the output for incremental updates (optional)
+            tile_size -- the number of rows and columns in each tile (optional, default is 2048)
+            workers -- the number of processes that calculate tiles concurrently (optional, default is 1)
+    Returned Value: Returns the number of tiles written
+    Preconditions: the cover raster must share the grid of the study area raster
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import iterate_blocks
+    from package_GeospatialProcessing.rasterBlocks import temporary_output
+    from concurrent.futures import FIRST_COMPLETED
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures import wait
+    import contextlib
+    import functools
+    import json
+    import os
+    import rasterio
+
+    # Define the tile calculation with the arguments shared by all tiles
+    calculate_tile = functools.partial(read_edge_tile,
+                                       study_area=study_area,
+                                       input_raster=input_raster,
+                                       cell_size=cell_size,
+                                       maximum_distance=maximum_distance,
+                                       maximum_value=maximum_value,
+                                       minimum_cover=minimum_cover,
+                                       cover_values=None if cover_values is None else list(cover_values),
+                                       mask_sources=mask_sources,
+                                       data_type=output_profile['dtype'],
+                                       no_data=output_profile['nodata'],
+                                       return_sources=snapshot_parameters is not None)
+    tile_windows = iterate_blocks(output_profile['width'], output_profile['height'], tile_size)
+
+    # Remove a previous snapshot so that an interrupted run never leaves a snapshot that does not match the output
+    snapshot_raster = get_snapshot_path(output_raster)
+    if os.path.exists(snapshot_raster):
+        os.remove(snapshot_raster)
+    # Open the output and the optional snapshot, where the output is replaced before the snapshot
+    tile_count = 0
+    with contextlib.ExitStack() as output_stack:
+        snapshot_dataset = None
+        if snapshot_parameters is not None:
+            snapshot_profile = dict(output_profile, dtype='int32', nodata=None)
+            temporary_snapshot = output_stack.enter_context(temporary_output(snapshot_raster))
+            snapshot_dataset = output_stack.enter_context(rasterio.open(temporary_snapshot, 'w', **snapshot_profile))
+            snapshot_dataset.update_tags(edge_parameters=json.dumps(snapshot_parameters, sort_keys=True))
+        temporary_raster = output_stack.enter_context(temporary_output(output_raster))
+        output_dataset = output_stack.enter_context(rasterio.open(temporary_raster, 'w', **output_profile))
+
+        # Write a completed tile
+        def write_tile(window, output_tile, source_tile):
+            output_dataset.write(output_tile, 1, window=window)
+            if snapshot_dataset is not None:
+                snapshot_dataset.write(source_tile, 1, window=window)
+
+        # Calculate the tiles in this process or on a process pool with a bounded number of tiles in flight
+        if workers <= 1:
+            for window in tile_windows:
+                write_tile(*calculate_tile(window))
+                tile_count += 1
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                running = set()
+                for window in tile_windows:
+                    running.add(executor.submit(calculate_tile, window))
+                    if len(running) >= 2 * workers:
+                        finished, running = wait(running, return_when=FIRST_COMPLETED)
+                        for tile_future in finished:
+                            write_tile(*tile_future.result())
+                            tile_count += 1
+                for tile_future in running:
+                    write_tile(*tile_future.result())
+                    tile_count += 1
+    return tile_count
+
+# Define a function to update the density-weighted distance where sources have changed
+def update_edge_distance(source_array, previous_array, edge_array, study_mask, cell_size, maximum_distance=None):
+    """
+    Description: recalculates the minimum inverse density-weighted distance only for cells that changed sources can affect and patches the previous distances
+    Inputs: source_array -- a two-dimensional integer array of the current source cover values returned by select_sources
+            previous_array -- a two-dimensional integer array of the source cover values from which the previous distances were calculated
+            edge_array -- a float32 array of the previous distances (infinite where no source existed), which is updated in place
+            study_mask -- a boolean array that is True within the study area
+            cell_size -- the cell size of the arrays in map units
+            maximum_distance -- the weighted distance at which values are saturated (optional, default is no maximum)
+    Returned Value: Returns a tuple of the updated edge array and the number of recalculated cells
+    Preconditions: previous distances must have been truncated to integers at most one unit below the exact distances
+    """
+
+    # Import packages
+    import math
+    import numpy as np
+    from scipy.ndimage import distance_transform_edt
+
+    # Find the cells where sources changed
+    dirty_array = source_array != previous_array
+    if not dirty_array.any():
+        return edge_array, 0
+    # Find the cells within the distance-bounded halo of the changed cells, where the distance to a changed cell weighted by the smallest weight of any old or new source is not greater than the previous distance
+    minimum_weight = 100 / max(int(source_array.max()), int(previous_array.max()))
+    dirty_distance = distance_transform_edt(~dirty_array, sampling=cell_size)
+    affected_array = (dirty_distance * minimum_weight <= edge_array.astype('float64') + 1) & study_mask
+    del dirty_array
+    if not affected_array.any():
+        return edge_array, 0
+    affected_rows = np.flatnonzero(affected_array.any(axis=1))
+    affected_columns = np.flatnonzero(affected_array.any(axis=0))
+    padding = math.ceil(dirty_distance[affected_array].max() / cell_size) + 1
+    del dirty_distance
+
+    # Recalculate distances in a window around the affected cells and widen the window until no source outside it can be nearer
+    height, width = source_array.shape
+    while True:
+        row_start = max(0, affected_rows[0] - padding)
+        row_end = min(height, affected_rows[-1] + 1 + padding)
+        column_start = max(0, affected_columns[0] - padding)
+        column_end = min(width, affected_columns[-1] + 1 + padding)
+        window_edge = weighted_edge_distance(source_array[row_start:row_end, column_start:column_end], cell_size, 1)
+        if maximum_distance is not None:
+            np.minimum(window_edge, maximum_distance, out=window_edge)
+        window_affected = affected_array[row_start:row_end, column_start:column_end]
+        # Calculate the weighted distance to the nearest cell outside the window, which is infinite at the grid edges
+        row_index = np.arange(row_start, row_end)[:, np.newaxis]
+        column_index = np.arange(column_start, column_end)[np.newaxis, :]
+        outside_cells = np.minimum(np.minimum(row_index - row_start + 1 if row_start > 0 else np.inf,
+                                              row_end - row_index if row_end < height else np.inf),
+                                   np.minimum(column_index - column_start + 1 if column_start > 0 else np.inf,
+                                              column_end - column_index if column_end < width else np.inf))
+        uncertain_array = window_affected & (window_edge > outside_cells * cell_size * minimum_weight)
+        if not uncertain_array.any():
+            break
+        padding = padding * 2
+    edge_array[row_start:row_end, column_start:column_end][window_affected] = window_edge[window_affected]
+    return edge_array, int(affected_array.sum())
+
+# Define a function to determine the path of the source snapshot of an edge raster
+def get_snapshot_path(output_raster):
+    """
+    Description: determines the path of the raster that stores the sources from which an edge raster was calculated
+    Inputs: output_raster -- path to the edge raster
+    Returned Value: Returns the path of the snapshot raster
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Append a suffix to the output name
+    output_base, output_extension = os.path.splitext(output_raster)
+    return f'{output_base}_sources{output_extension}'
+
+# Define a function to check that an edge raster can be updated from its snapshot
+def check_previous_edge(output_raster, study_shape, parameters):
+    """
+    Description: checks from the dataset headers that a previous edge raster and the snapshot of the sources from which it was calculated exist and were calculated with the same parameters on the same grid
+    Inputs: output_raster -- path to the edge raster
+            study_shape -- the number of rows and columns of the study area grid
+            parameters -- a dictionary of the parameters of the current calculation
+    Returned Value: Returns True if an incremental update is possible
+    Preconditions: none
+    """
+
+    # Import packages
+    import json
+    import os
+    import rasterio
+
+    # Check that both datasets exist
+    snapshot_raster = get_snapshot_path(output_raster)
+    if not (os.path.exists(output_raster) and os.path.exists(snapshot_raster)):
+        return False
+    # Check that the snapshot shares the parameters and grid of the current calculation
+    with rasterio.open(snapshot_raster) as snapshot_dataset, rasterio.open(output_raster) as edge_dataset:
+        return (snapshot_dataset.tags().get('edge_parameters') == json.dumps(parameters, sort_keys=True)
+                and snapshot_dataset.shape == tuple(study_shape)
+                and edge_dataset.shape == tuple(study_shape))
+
+# Define a function to read the previous distances and sources of an edge raster
+def read_previous_edge(output_raster, study_mask, parameters):
+    """
+    Description: reads a previous edge raster and the snapshot of the sources from which it was calculated if both exist and were calculated with the same parameters
+    Inputs: output_raster -- path to the edge raster
+            study_mask -- a boolean array that is True within the study area
+            parameters -- a dictionary of the parameters of the current calculation
+    Returned Value: Returns a tuple of the previous float32 edge array and the previous source array, or None if an incremental update is not possible
+    Preconditions: none
+    """
+
+    # Import packages
+    import numpy as np
+    import rasterio
+
+    # Check that the previous datasets can be updated
+    if not check_previous_edge(output_raster, study_mask.shape, parameters):
+        return None
+    # Read the sources and the previous distances and set no data to infinity
+    with rasterio.open(get_snapshot_path(output_raster)) as snapshot_dataset:
+        previous_array = snapshot_dataset.read(1)
+    with rasterio.open(output_raster) as edge_dataset:
+        edge_array = edge_dataset.read(1, masked=True).astype('float32')
+    edge_array = np.ma.filled(edge_array, np.inf)
+    return edge_array, previous_array
+
+# Define a function to calculate the minimum inverse density-weighted distance raster
+def calculate_edge_distance(**kwargs):
+    """
+    Description: calculates the minimum inverse density-weighted distance across all cover values of an input raster
+    Inputs: 'minimum_cover' -- the minimum foliar cover value for which to calculate distance (e.g., 10)
+            'value_type' -- the output raster value type (e.g., '32_BIT_SIGNED')
+            'no_data' -- the output raster no data value
+            'cover_values' -- a list of the cover values for which to calculate distance (optional, default is all values at or above the minimum cover)
+            'incremental' -- if True, distances are recalculated only where changed sources can affect the previous output and a snapshot of the sources is stored next to the output for the next update (optional, default is False)
+            'mask_sources' -- if True, cover outside the study area is not treated as a source (optional, default is False, which measures distance to all cover in the study area extent)
+            'maximum_distance' -- the weighted distance at which values are saturated, which allows tiles to be calculated independently with a halo (optional, default is no maximum)
+            'block_size' -- the number of rows and columns in each tile that is read with its halo and written when a maximum distance is set (optional, default is 2048)
+            'workers' -- the number of processes that read, calculate, and write tiles concurrently when a maximum distance is set (optional, default is 1)
+            'input_array' -- an array containing the study area raster (must be first) and the input cover raster (must be second)
+            'output_array' -- an array containing the output edge raster
+    Returned Value: Returns a raster dataset on disk containing the minimum inverse density-weighted distance values
+    Preconditions: requires an input foliar cover raster that shares the grid of the study area raster
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_data_type
+    from package_GeospatialProcessing.rasterBlocks import temporary_output
+    from package_GeospatialProcessing.rasterStatistics import read_raster_statistics
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
+    import json
+    import numpy as np
+    import os
+    import rasterio
+
+    # Parse key word argument inputs
+    minimum_cover = kwargs['minimum_cover']
+    value_type = kwargs['value_type']
+    select_values = kwargs.get('cover_values', None)
+    incremental = kwargs.get('incremental', False)
+    mask_sources = kwargs.get('mask_sources', False)
+    maximum_distance = kwargs.get('maximum_distance', None)
+    block_size = kwargs.get('block_size', 2048)
+    workers = kwargs.get('workers', 1)
+    no_data = kwargs['no_data']
+    study_area = kwargs['input_array'][0]
+    input_raster = kwargs['input_array'][1]
+    output_raster = kwargs['output_array'][0]
+
+    # Define output data type and no data value
+    data_type = get_data_type(value_type)
+    no_data = np.dtype(data_type).type(float(no_data))
+
+    # Read the study area grid and define the output profile
+    with rasterio.open(study_area) as study_dataset:
+        output_profile = study_dataset.profile.copy()
+        study_bounds = study_dataset.bounds
+        study_shape = study_dataset.shape
+        cell_size = abs(study_dataset.transform.a)
+    output_profile.update(driver='GTiff',
+                          dtype=data_type,
+                          nodata=no_data.item(),
+                          count=1,
+                          compress='lzw',
+                          tiled=True,
+                          blockxsize=256,
+                          blockysize=256,
+                          BIGTIFF='IF_SAFER')
+    parameters = {'minimum_cover': minimum_cover,
+                  'cover_values': None if select_values is None else sorted(int(value) for value in select_values),
+                  'mask_sources': mask_sources,
+                  'maximum_distance': maximum_distance,
+                  'cell_size': cell_size}
+
+    # Calculate bounded distances tile by tile from windowed reads unless the previous output can be updated
+    if maximum_distance is not None and not (incremental and check_previous_edge(output_raster, study_shape, parameters)):
+        # Start timing function
+        stage = start_stage('calculate_edge_distance.bounded_tiles', output=kwargs['output_array'][0])
+        # Determine the source cover values and the largest source value from the statistics index of the cover raster
+        cover_statistics = read_raster_statistics(input_raster, block_size=block_size)
+        if cover_statistics['histogram'] is not None:
+            cover_values = [value for value in sorted(cover_statistics['histogram']) if value >= minimum_cover]
+            if select_values is not None:
+                cover_values = [value for value in cover_values if value in select_values]
+            maximum_value = max(cover_values, default=0)
+            value_message = f'{len(cover_values)} cover values'
+        else:
+            maximum_value = int(cover_statistics['maximum'] or 0)
+            if select_values is not None:
+                maximum_value = min(maximum_value, max(select_values, default=0))
+            maximum_value = maximum_value if maximum_value >= minimum_cover else 0
+            value_message = f'cover values of at least {minimum_cover}'
+        print(f'\tCalculating inverse density-weighted distance up to {maximum_distance} for {value_message} in tiles of {block_size} cells...')
+        # Read, calculate, and write each tile with a halo that covers the maximum distance
+        tile_count = write_bounded_edge(study_area,
+                                        input_raster,
+                                        output_raster,
+                                        output_profile,
+                                        cell_size,
+                                        maximum_distance,
+                                        maximum_value,
+                                        minimum_cover,
+                                        select_values,
+                                        mask_sources,
+                                        snapshot_parameters=parameters if incremental else None,
+                                        tile_size=block_size,
+                                        workers=workers)
+        # End timing and report success
+        end_stage(stage, f'{tile_count} tiles')
+        out_process = f'Successfully calculated minimum inverse density-weighted distance for {value_message}.'
+        return out_process
+
+    # Start timing function
+    stage = start_stage('calculate_edge_distance.read_cover', output=kwargs['output_array'][0])
+    print(f'\tReading cover raster to study area grid...')
+    # Read the study area mask
+    with rasterio.open(study_area) as study_dataset:
+        study_mask = study_dataset.read_masks(1) > 0
+    # Read the cover raster on the study area grid and set no data to zero
+    with rasterio.open(input_raster) as cover_dataset:
+        cover_window = cover_dataset.window(*study_bounds).round_offsets().round_lengths()
+        cover_array = cover_dataset.read(1,
+                                         window=cover_window,
+                                         out_shape=study_shape,
+                                         boundless=True,
+                                         masked=True)
+    cover_array = np.ma.filled(cover_array, 0).astype('int32')
+    if mask_sources:
+        cover_array[~study_mask] = 0
+    # Determine cover values that are present from the statistics index of the cover raster, otherwise from the study area extent
+    cover_statistics = read_raster_statistics(input_raster, calculate=False)
+    if cover_statistics is not None and cover_statistics['histogram'] is not None:
+        cover_values = sorted(value for value in cover_statistics['histogram'] if value >= minimum_cover)
+    else:
+        cover_counts = np.bincount(cover_array.ravel())
+        cover_values = [value for value in np.flatnonzero(cover_counts) if value >= minimum_cover]
+    if select_values is not None:
+        cover_values = [value for value in cover_values if value in select_values]
+    # Read the previous output and sources if the output is updated incrementally
+    previous_edge = read_previous_edge(output_raster, study_mask, parameters) if incremental else None
+    # End timing and report success
+    end_stage(stage)
+
+    # Start timing function
+    stage = start_stage('calculate_edge_distance.weight_distance', output=kwargs['output_array'][0])
+    if previous_edge is None:
+        print(f'\tCalculating inverse density-weighted distance for {len(cover_values)} cover values...')
+        # Calculate the minimum weighted distance across all present cover values
+        edge_array = weighted_edge_distance(cover_array, cell_size, minimum_cover, cover_values)
+        if maximum_distance is not None:
+            np.minimum(edge_array, maximum_distance, out=edge_array)
+        source_array = select_sources(cover_array, minimum_cover, cover_values) if incremental else None
+        update_message = None
+    else:
+        print(f'\tUpdating inverse density-weighted distance where cover has changed...')
+        # Recalculate the minimum weighted distance only where changed sources can affect it
+        source_array = select_sources(cover_array, minimum_cover, cover_values)
+        edge_array, update_count = update_edge_distance(source_array, previous_edge[1], previous_edge[0], study_mask,
+                                                        cell_size, maximum_distance)
+        update_message = f'{update_count} cells updated'
+        print(f'\tRecalculated {update_count} of {int(study_mask.sum())} cells...')
+        del previous_edge
+    del cover_array
+    # End timing and report success
+    end_stage(stage, update_message)
+
+    # Start timing function
+    stage = start_stage('calculate_edge_distance.write_raster', output=kwargs['output_array'][0])
+    print(f'\tSaving edge raster to disk...')
+    # Truncate distances to the output value type and set cells outside the study area to no data
+    no_data_array = ~study_mask | ~np.isfinite(edge_array)
+    edge_array[no_data_array] = 0
+    output_array = edge_array.astype(data_type)
+    output_array[no_data_array] = no_data
+    # Save the edge raster to disk
+    snapshot_raster = get_snapshot_path(output_raster)
+    if os.path.exists(snapshot_raster):
+        os.remove(snapshot_raster)
+    with temporary_output(output_raster) as temporary_raster:
+        with rasterio.open(temporary_raster, 'w', **output_profile) as output_dataset:
+            output_dataset.write(output_array, 1)
+    # Save the sources after the output so that an interrupted run never leaves a snapshot that does not match the output
+    if incremental:
+        output_profile.update(dtype='int32', nodata=None)
+        with temporary_output(snapshot_raster) as temporary_raster:
+            with rasterio.open(temporary_raster, 'w', **output_profile) as snapshot_dataset:
+                snapshot_dataset.write(source_array, 1)
+                snapshot_dataset.update_tags(edge_parameters=json.dumps(parameters, sort_keys=True))
+    # End timing and report success
+    end_stage(stage)
+    out_process = f'Successfully calculated minimum inverse density-weighted distance for {len(cover_values)} cover values.'
+    return out_process
@@ -2,128 +2,83 @@
 # ---------------------------------------------------------------------------
 # Combine raster classes
 # Author: Timm Nawrocki
-# Last Updated: 2021-06-21
-# Usage: Must be executed in an ArcGIS Pro Python 3.6+ installation.
-# Description: "Combine raster classes" is a function that creates a new raster from a set of existing rasters by selecting only particular classes from each.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio for the numpy backend or in an ArcGIS Pro Python 3.6 installation for the arcpy backend.
+# Description: "Combine raster classes" is a function that creates a new raster from a set of existing rasters by selecting only particular classes from each. Several outputs can be reclassified from one read of the input raster with lookup tables.
 # ---------------------------------------------------------------------------
 
-# Define a function to create a raster from multiple categorical input rasters
+# Define a function to parse the class values from a selection statement
+def parse_class_statement(statement):
+    """
+    Description: parses the selected class values from a select by attribute statement
+    Inputs: statement -- a statement of the form 'VALUE = n' or 'VALUE IN (n, m, ...)'
+    Returned Value: Returns a list of integer class values
+    Preconditions: statement must select on the VALUE field with an equality or IN operator
+    """
+
+    # Import packages
+    import re
+
+    # Match the statement to an equality or IN operator on the VALUE field
+    statement_match = re.match(r'^\s*value\s*(=|in)\s*\(?\s*([-\d\s,]+?)\s*\)?\s*$', statement, re.IGNORECASE)
+    if statement_match is None:
+        raise ValueError(f'Statement "{statement}" must be of the form VALUE = n or VALUE IN (n, m, ...).')
+    return [int(value) for value in statement_match.group(2).split(',')]
+
+# Define a function to create rasters from selected classes of a categorical input raster
 def combine_raster_classes(**kwargs):
     """
-    Description: merges all input rasters in an array and extracts to study area
+    Description: selects classes from an input raster and extracts to study area, optionally writing several reclassified outputs from one read of the input raster
     Inputs: 'value_type' -- the raster value type
             'no_data' -- the raster no data value
-            'statements' -- select by attribute SQL queries to perform for each input raster
-            'out_value' -- output value to assign to combined raster
-            'work_geodatabase' -- path to a file geodatabase that will serve as the workspace
-            'input_array' -- an array containing the study area raster (must be first) and input rasters to combine (order must match the order of statements)
-            'output_array' -- an array containing the output raster
-    Returned Value: Returns a raster dataset on disk containing the combined raster
+            'statement' -- select by attribute statement of the form 'VALUE = n' or 'VALUE IN (n, m, ...)' (not used if reclass_tables is provided)
+            'out_value' -- output value to assign to combined raster (not used if reclass_tables is provided)
+            'reclass_tables' -- a list of dictionaries, one per output raster, that map class values to output values (optional, replaces statement and out_value)
+            'block_size' -- the number of rows and columns processed per block (optional, default is 2048)
+            'backend' -- the name of the raster backend (optional, default is the backend set by set_raster_backend)
+            'input_array' -- an array containing the study area raster (must be first), the input raster (must be second), and optionally one mask raster per output raster that further restricts each output
+            'output_array' -- an array containing the output rasters in the order of the reclass tables
+    Returned Value: Returns raster datasets on disk containing the combined rasters
     Preconditions: requires existing categorical raster datasets
     """
 
     # Import packages
-    import arcpy
-    from arcpy.sa import Con
-    from arcpy.sa import ExtractByAttributes
-    from arcpy.sa import ExtractByMask
-    from arcpy.sa import Raster
-    from arcpy.sa import SetNull
-    import datetime
-    import time
+    from package_GeospatialProcessing.rasterBackend import get_raster_backend
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
 
     # Parse key word argument inputs
     value_type = kwargs['value_type']
     no_data = kwargs['no_data']
-    statement = kwargs['statement']
-    out_value = kwargs['out_value']
-    work_geodatabase = kwargs['work_geodatabase']
+    block_size = kwargs.get('block_size', 2048)
+    backend = get_raster_backend(kwargs.get('backend'))
     study_area = kwargs['input_array'][0]
     input_raster = kwargs['input_array'][1]
-    output_raster = kwargs['output_array'][0]
-
-    # Set overwrite option
-    arcpy.env.overwriteOutput = True
-
-    # Set workspace
-    arcpy.env.workspace = work_geodatabase
+    mask_rasters = kwargs['input_array'][2:] or None
+    output_rasters = kwargs['output_array']
 
-    # Use two thirds of cores on processes that can be split.
-    arcpy.env.parallelProcessingFactor = "66%"
-
-    # Set snap raster, extent, and cell size
-    arcpy.env.snapRaster = study_area
-    arcpy.env.extent = Raster(study_area).extent
-    arcpy.env.cellSize = "MINOF"
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tExtracting input raster by attributes...')
-    # Extract raster by attributes
-    attribute_raster = ExtractByAttributes(Raster(input_raster), statement)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tSetting output and null values...')
-    # Convert raster values to output value
-    reclass_raster = Con(attribute_raster, out_value, 0, 'VALUE > 0')
-    # Set zero values to null
-    null_raster = SetNull(reclass_raster, reclass_raster, 'VALUE = 0')
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tExtracting raster to study area...')
-    # Extract raster to study area
-    extract_raster = ExtractByMask(null_raster, study_area)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    # Parse class values greater than zero from the selection statement if reclass tables are not provided
+    if 'reclass_tables' in kwargs:
+        reclass_tables = kwargs['reclass_tables']
+    else:
+        class_values = parse_class_statement(kwargs['statement'])
+        reclass_tables = [{class_value: kwargs['out_value'] for class_value in class_values if class_value > 0}]
+    if len(reclass_tables) != len(output_rasters) or (mask_rasters and len(mask_rasters) != len(output_rasters)):
+        raise ValueError('Each output raster must have one reclass table and at most one mask raster.')
 
     # Start timing function
-    iteration_start = time.time()
-    print(f'\tSaving extracted raster to disk...')
-    # Save the summed raster to disk
-    arcpy.CopyRaster_management(extract_raster,
-                                output_raster,
-                                '',
-                                '',
-                                no_data,
-                                'NONE',
-                                'NONE',
-                                value_type,
-                                'NONE',
-                                'NONE',
-                                'TIFF',
-                                'NONE',
-                                'CURRENT_SLICE',
-                                'NO_TRANSPOSE')
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    stage = start_stage('combine_raster_classes', output=kwargs['output_array'][0])
+    print(f'\tReclassifying raster into {len(output_rasters)} outputs and extracting to study area...')
+    # Reclassify the input once and save the combined rasters to disk
+    block_count = backend.reclassify_classes(study_area,
+                                             input_raster,
+                                             output_rasters,
+                                             reclass_tables,
+                                             value_type,
+                                             no_data,
+                                             mask_rasters,
+                                             block_size)
+    # End timing and report success
+    end_stage(stage, f'{block_count} blocks')
     out_process = 'Successfully merged raster categories.'
     return out_process
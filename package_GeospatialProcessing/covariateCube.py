@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Covariate cube
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Covariate cube" is a set of functions that write aligned covariate rasters into a single chunked, memory-mappable array with a JSON header and read covariate values for coordinate arrays without decoding the source rasters.
+# ---------------------------------------------------------------------------
+
+# Define a function to define the header path of a covariate cube
+def get_header_path(cube_file):
+    """
+    Description: defines the path of the JSON header stored next to a covariate cube
+    Inputs: cube_file -- path to a covariate cube npy file
+    Returned Value: Returns the header path
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Replace the npy extension with a json extension
+    return os.path.splitext(cube_file)[0] + '.json'
+
+# Define a function to build a covariate cube from covariate rasters
+def build_covariate_cube(**kwargs):
+    """
+    Description: writes aligned covariate rasters into a chunked array of cells where each cell stores all covariates together
+    Inputs: 'covariate_names' -- a list of covariate names in the order of the covariate rasters (optional, default is the raster base names)
+            'chunk_size' -- the number of rows and columns in each chunk (optional, default is 256)
+            'input_array' -- an array containing the study area raster (must be first) and all covariate rasters
+            'output_array' -- an array containing the output cube npy file (must be first) and the output header json file with the same base name (must be second)
+    Returned Value: Returns a covariate cube on disk with one field per covariate
+    Preconditions: covariate rasters must overlap the study area raster and must have a no data value
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import open_aligned
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
+    import json
+    import numpy as np
+    import os
+    import rasterio
+    from rasterio.windows import Window
+
+    # Parse key word argument inputs
+    study_area = kwargs['input_array'][0]
+    covariate_rasters = kwargs['input_array'][1:]
+    covariate_names = kwargs.get('covariate_names',
+                                 [os.path.splitext(os.path.split(raster)[1])[0] for raster in covariate_rasters])
+    chunk_size = kwargs.get('chunk_size', 256)
+    cube_file = kwargs['output_array'][0]
+    header_file = kwargs['output_array'][1]
+    if len(covariate_names) != len(covariate_rasters):
+        raise ValueError('A covariate name must be provided for each covariate raster.')
+    if os.path.normpath(header_file) != os.path.normpath(get_header_path(cube_file)):
+        raise ValueError(f'Header file must be {get_header_path(cube_file)}.')
+
+    # Start timing function
+    stage = start_stage('build_covariate_cube', output=kwargs['output_array'][0])
+    print(f'\tWriting {len(covariate_rasters)} covariates to cube...')
+    with rasterio.open(study_area) as study_dataset:
+        covariate_datasets = [open_aligned(raster, study_dataset) for raster in covariate_rasters]
+        try:
+            # Define the cell data type with one field per covariate
+            cell_type = np.dtype([(name, dataset.dtypes[0])
+                                  for name, dataset in zip(covariate_names, covariate_datasets)])
+            no_data_values = [dataset.nodata for dataset in covariate_datasets]
+            if None in no_data_values:
+                raise ValueError('All covariate rasters must have a no data value.')
+            # Create the chunked cube as a memory-mapped npy file
+            chunk_rows = -(-study_dataset.height // chunk_size)
+            chunk_cols = -(-study_dataset.width // chunk_size)
+            cube_data = np.lib.format.open_memmap(cube_file,
+                                                  mode='w+',
+                                                  dtype=cell_type,
+                                                  shape=(chunk_rows, chunk_cols, chunk_size, chunk_size))
+            # Write each strip of chunks from all covariates
+            padded_width = chunk_cols * chunk_size
+            for chunk_row in range(chunk_rows):
+                row_off = chunk_row * chunk_size
+                strip_height = min(chunk_size, study_dataset.height - row_off)
+                window = Window(0, row_off, study_dataset.width, strip_height)
+                for name, dataset, no_data in zip(covariate_names, covariate_datasets, no_data_values):
+                    strip = np.full((chunk_size, padded_width), no_data, dtype=cell_type[name])
+                    strip[:strip_height, :study_dataset.width] = dataset.read(1, window=window)
+                    cube_data[chunk_row][name] = strip.reshape(chunk_size, chunk_cols, chunk_size).transpose(1, 0, 2)
+            cube_data.flush()
+            del cube_data
+            # Write the header
+            header = {'format': 'covariate_cube',
+                      'version': 1,
+                      'crs': study_dataset.crs.to_wkt(),
+                      'transform': list(study_dataset.transform)[:6],
+                      'width': study_dataset.width,
+                      'height': study_dataset.height,
+                      'chunk_size': chunk_size,
+                      'covariates': [{'name': name,
+                                      'dtype': cell_type[name].str,
+                                      'no_data': no_data,
+                                      'source': raster}
+                                     for name, no_data, raster in zip(covariate_names, no_data_values, covariate_rasters)]}
+            with open(header_file, 'w') as header_writer:
+                json.dump(header, header_writer, indent=2)
+        finally:
+            for dataset in covariate_datasets:
+                source_dataset = getattr(dataset, 'src_dataset', None)
+                dataset.close()
+                if source_dataset is not None:
+                    source_dataset.close()
+    # End timing and report success
+    end_stage(stage, f'{chunk_rows * chunk_cols} chunks')
+    out_process = 'Successfully built covariate cube.'
+    return out_process
+
+# Define a function to open a covariate cube
+def open_covariate_cube(cube_file):
+    """
+    Description: opens a covariate cube as a read-only memory map with its header
+    Inputs: cube_file -- path to a covariate cube npy file
+    Returned Value: Returns a dictionary containing the 'header' and the memory-mapped 'data'
+    Preconditions: the cube must be built by build_covariate_cube
+    """
+
+    # Import packages
+    import json
+    import numpy as np
+
+    # Read the header and memory map the cube
+    with open(get_header_path(cube_file), 'r') as header_reader:
+        header = json.load(header_reader)
+    cube_data = np.load(cube_file, mmap_mode='r')
+    return {'header': header, 'data': cube_data}
+
+# Define a function to read cells from a covariate cube
+def read_cube_cells(covariate_cube, rows, columns):
+    """
+    Description: reads the covariate values of cells identified by row and column indices
+    Inputs: covariate_cube -- a covariate cube opened by open_covariate_cube
+            rows -- an integer array of row indices
+            columns -- an integer array of column indices
+    Returned Value: Returns a structured array with one field per covariate, where cells outside the cube receive the covariate no data values
+    Preconditions: rows and columns must share a shape
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Identify cells inside the cube
+    header = covariate_cube['header']
+    cube_data = covariate_cube['data']
+    chunk_size = header['chunk_size']
+    rows = np.asarray(rows, dtype='int64')
+    columns = np.asarray(columns, dtype='int64')
+    inside = (rows >= 0) & (rows < header['height']) & (columns >= 0) & (columns < header['width'])
+
+    # Fill the output with no data values
+    values = np.empty(rows.shape, dtype=cube_data.dtype)
+    for covariate in header['covariates']:
+        values[covariate['name']] = covariate['no_data']
+
+    # Read cells in storage order so that each chunk is paged in once
+    rows = rows[inside]
+    columns = columns[inside]
+    cell_index = np.ravel_multi_index((rows // chunk_size, columns // chunk_size, rows % chunk_size, columns % chunk_size),
+                                      cube_data.shape)
+    read_order = np.argsort(cell_index, kind='stable')
+    inside_values = np.empty(cell_index.shape, dtype=cube_data.dtype)
+    inside_values[read_order] = cube_data.reshape(-1)[cell_index[read_order]]
+    values[inside] = inside_values
+    return values
+
+# Define a function to read covariate values for coordinates from a covariate cube
+def extract_cube_values(covariate_cube, x_coordinates, y_coordinates):
+    """
+    Description: reads the covariate values of the cells that contain each coordinate
+    Inputs: covariate_cube -- a covariate cube opened by open_covariate_cube
+            x_coordinates -- an array of x coordinates in the cube coordinate system
+            y_coordinates -- an array of y coordinates in the cube coordinate system
+    Returned Value: Returns a structured array with one field per covariate, where coordinates outside the cube receive the covariate no data values
+    Preconditions: coordinates must be in the coordinate system of the cube
+    """
+
+    # Import packages
+    import numpy as np
+    from affine import Affine
+
+    # Convert coordinates to rows and columns
+    inverse_transform = ~Affine(*covariate_cube['header']['transform'])
+    columns, rows = inverse_transform * (np.asarray(x_coordinates, dtype='float64'),
+                                         np.asarray(y_coordinates, dtype='float64'))
+
+    # Read the cells that contain the coordinates
+    return read_cube_cells(covariate_cube, np.floor(rows).astype('int64'), np.floor(columns).astype('int64'))
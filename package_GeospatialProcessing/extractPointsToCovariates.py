@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Extract points to covariates
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Extract points to covariates" is a set of functions that convert point coordinates to cell indices in bulk and gather covariate values from a covariate cube or from covariate rasters using nearest or bilinear sampling.
+# ---------------------------------------------------------------------------
+
+# Define a function to read cells from a raster
+def read_raster_cells(input_raster, rows, columns):
+    """
+    Description: reads the values of cells identified by row and column indices, reading only the internal raster blocks that contain cells
+    Inputs: input_raster -- path to a raster dataset
+            rows -- an integer array of row indices
+            columns -- an integer array of column indices
+    Returned Value: Returns a masked array of cell values where cells outside the raster or equal to the no data value are masked
+    Preconditions: rows and columns must share a shape
+    """
+
+    # Import packages
+    import numpy as np
+    import rasterio
+    from rasterio.windows import Window
+
+    # Open the raster and identify cells inside the raster
+    rows = np.asarray(rows, dtype='int64')
+    columns = np.asarray(columns, dtype='int64')
+    with rasterio.open(input_raster) as raster_dataset:
+        inside = (rows >= 0) & (rows < raster_dataset.height) & (columns >= 0) & (columns < raster_dataset.width)
+        values = np.zeros(rows.shape, dtype=raster_dataset.dtypes[0])
+        valid = np.zeros(rows.shape, dtype=bool)
+
+        # Group cells by the internal block that contains them
+        block_height, block_width = raster_dataset.block_shapes[0]
+        inside_index = np.flatnonzero(inside)
+        block_rows = rows[inside_index] // block_height
+        block_columns = columns[inside_index] // block_width
+        block_keys, block_groups = np.unique(block_rows * (raster_dataset.width // block_width + 1) + block_columns,
+                                             return_inverse=True)
+        block_groups = block_groups.reshape(-1)
+        group_order = np.argsort(block_groups, kind='stable')
+        group_breaks = np.searchsorted(block_groups[group_order], np.arange(len(block_keys) + 1))
+
+        # Read each block once and gather its cells
+        for group in range(len(block_keys)):
+            cell_index = inside_index[group_order[group_breaks[group]:group_breaks[group + 1]]]
+            row_off = int(rows[cell_index[0]] // block_height) * block_height
+            col_off = int(columns[cell_index[0]] // block_width) * block_width
+            window = Window(col_off,
+                            row_off,
+                            min(block_width, raster_dataset.width - col_off),
+                            min(block_height, raster_dataset.height - row_off))
+            block = raster_dataset.read(1, window=window, masked=True)
+            cell_values = block[rows[cell_index] - row_off, columns[cell_index] - col_off]
+            values[cell_index] = np.ma.getdata(cell_values)
+            valid[cell_index] = ~np.ma.getmaskarray(cell_values)
+    return np.ma.masked_array(values, mask=~valid)
+
+# Define a function to extract covariate values to points
+def extract_points_to_covariates(xy, covariates, method='nearest'):
+    """
+    Description: extracts covariate values to point coordinates from a covariate cube or a set of covariate rasters
+    Inputs: xy -- an array of point coordinates with shape (number of points, 2) in the coordinate system of the covariates (EPSG:3338)
+            covariates -- a covariate cube opened by open_covariate_cube or a dictionary of covariate names and raster paths
+            method -- 'nearest' to read the cell that contains each point or 'bilinear' to interpolate from the four nearest cell centers
+    Returned Value: Returns a dictionary of covariate names and float masked arrays where points outside the covariates or on no data are masked
+    Preconditions: with bilinear sampling, a point is masked if any of its four neighboring cells is no data
+    """
+
+    # Import packages
+    import numpy as np
+    import rasterio
+    from affine import Affine
+    from package_GeospatialProcessing.covariateCube import read_cube_cells
+
+    # Define the cell readers and grid transforms for the covariate sources
+    xy = np.asarray(xy, dtype='float64').reshape(-1, 2)
+    if method not in ('nearest', 'bilinear'):
+        raise ValueError(f'Method "{method}" must be "nearest" or "bilinear".')
+    sources = []
+    if isinstance(covariates, dict) and 'header' in covariates and 'data' in covariates:
+        header = covariates['header']
+        no_data_values = {covariate['name']: covariate['no_data'] for covariate in header['covariates']}
+
+        def read_cube(rows, columns):
+            cells = read_cube_cells(covariates, rows, columns)
+            return {name: np.ma.masked_equal(cells[name], no_data) for name, no_data in no_data_values.items()}
+        sources.append((Affine(*header['transform']), read_cube))
+    else:
+        for name, input_raster in covariates.items():
+            with rasterio.open(input_raster) as raster_dataset:
+                transform = raster_dataset.transform
+
+            def read_raster(rows, columns, name=name, input_raster=input_raster):
+                return {name: read_raster_cells(input_raster, rows, columns)}
+            sources.append((transform, read_raster))
+
+    # Extract values from each source
+    values = {}
+    for transform, read_cells in sources:
+        # Convert coordinates to fractional cell positions
+        columns, rows = (~transform) * (xy[:, 0], xy[:, 1])
+        # Read the cell that contains each point
+        if method == 'nearest':
+            cells = read_cells(np.floor(rows).astype('int64'), np.floor(columns).astype('int64'))
+            for name, cell_values in cells.items():
+                values[name] = cell_values.astype('float64')
+        # Interpolate from the four nearest cell centers
+        else:
+            row_position = rows - 0.5
+            column_position = columns - 0.5
+            top = np.floor(row_position).astype('int64')
+            left = np.floor(column_position).astype('int64')
+            row_weight = row_position - top
+            column_weight = column_position - left
+            # Read the four neighbors in one pass per source
+            neighbor_rows = np.concatenate([top, top, top + 1, top + 1])
+            neighbor_columns = np.concatenate([left, left + 1, left, left + 1])
+            weights = np.stack([(1 - row_weight) * (1 - column_weight),
+                                (1 - row_weight) * column_weight,
+                                row_weight * (1 - column_weight),
+                                row_weight * column_weight])
+            cells = read_cells(neighbor_rows, neighbor_columns)
+            for name, cell_values in cells.items():
+                neighbors = cell_values.astype('float64').reshape(4, -1)
+                interpolated = (np.ma.getdata(neighbors) * weights).sum(axis=0)
+                values[name] = np.ma.masked_array(interpolated, mask=np.ma.getmaskarray(neighbors).any(axis=0))
+    return values
@@ -2,8 +2,8 @@
 # ---------------------------------------------------------------------------
 # Calculate inverse density-weighted distance
 # Author: Timm Nawrocki
-# Last Updated: 2020-11-01
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, and rasterio for the numpy backend or in an ArcGIS Pro Python 3.6 installation for the arcpy backend.
 # Description: "Calculate inverse density-weighted distance" is a function that calculates euclidean distance from raster values and divides distance by density (e.g., foliar cover).
 # ---------------------------------------------------------------------------
 
@@ -11,8 +11,10 @@
 def calculate_idw_distance(**kwargs):
     """
     Description: calculates the distance/density of an input raster
-    Inputs: 'work_geodatabase' -- path to a file geodatabase that will serve as the workspace
-            'target_value' -- an integer value of the target foliar cover value
+    Inputs: 'target_value' -- an integer value of the target foliar cover value
+            'backend' -- the name of the raster backend (optional, default is the backend set by set_raster_backend)
+            'maximum_distance' -- the weighted distance at which values are saturated, which reads, calculates, and writes distances tile by tile with a halo (optional, default is no maximum)
+            'incremental' -- if True, distances are calculated in memory with single precision and later runs recalculate only the cells that changed sources can affect (optional, default is False)
             'input_array' -- an array containing the study area raster (must be first) and the input raster (must be second)
             'output_array' -- an array containing the output raster
     Returned Value: Returns a raster dataset on disk containing the IDW Distance values
@@ -20,100 +22,46 @@ def calculate_idw_distance(**kwargs):
     """
 
     # Import packages
-    import arcpy
-    from arcpy.sa import EucDistance
-    from arcpy.sa import Raster
-    from arcpy.sa import SetNull
-    import datetime
-    import time
+    from package_GeospatialProcessing.calculateEdgeDistance import calculate_edge_distance
+    from package_GeospatialProcessing.rasterBackend import get_raster_backend
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
 
     # Parse key word argument inputs
-    work_geodatabase = kwargs['work_geodatabase']
     target_value = kwargs['target_value']
+    incremental = kwargs.get('incremental', False)
+    maximum_distance = kwargs.get('maximum_distance', None)
+    backend = get_raster_backend(kwargs.get('backend'))
     study_area = kwargs['input_array'][0]
     input_raster = kwargs['input_array'][1]
     output_raster = kwargs['output_array'][0]
 
-    # Set overwrite option
-    arcpy.env.overwriteOutput = True
-
-    # Set workspace
-    arcpy.env.workspace = work_geodatabase
-
-    # Use two thirds of cores on processes that can be split.
-    arcpy.env.parallelProcessingFactor = "50%"
-
-    # Set snap raster, extent, and cell size
-    arcpy.env.snapRaster = study_area
-    arcpy.env.extent = Raster(study_area).extent
-    arcpy.env.cellSize = "MINOF"
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tNullifying raster values other than {target_value}...')
-    # Set all values except for the target value to NODATA
-    nulled_raster = SetNull(input_raster, 1, f'VALUE <> {target_value}')
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tCalculating euclidean distance to target value...')
-    # Set all values except for the target value to NODATA
-    distance_raster = EucDistance(nulled_raster)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tWeighting distances by inverse density...')
-    # Set all values except for the target value to NODATA
-    edge_raster = distance_raster / (target_value / 100)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    # Calculate the distances as an edge distance for the target value if an update or a maximum distance is requested
+    if incremental or maximum_distance is not None:
+        calculate_edge_distance(minimum_cover=target_value,
+                                value_type='32_BIT_SIGNED',
+                                no_data='-32768',
+                                cover_values=[target_value],
+                                incremental=incremental,
+                                mask_sources=False,
+                                maximum_distance=maximum_distance,
+                                input_array=kwargs['input_array'],
+                                output_array=kwargs['output_array'])
+        out_process = f'Successfully calculated inverse density-weighted distance where foliar cover = {target_value}%.'
+        return out_process
 
     # Start timing function
-    iteration_start = time.time()
-    print(f'\tSaving edge raster to disk...')
-    # Save the summed raster to disk
-    arcpy.management.CopyRaster(edge_raster,
-                                output_raster,
-                                '',
-                                '',
-                                '-32768',
-                                'NONE',
-                                'NONE',
-                                '32_BIT_SIGNED',
-                                'NONE',
-                                'NONE',
-                                'TIFF',
-                                'NONE',
-                                'CURRENT_SLICE',
-                                'NO_TRANSPOSE')
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    stage = start_stage('calculate_idw_distance', output=kwargs['output_array'][0])
+    print(f'\tCalculating euclidean distance to {target_value} and weighting distances by inverse density...')
+    # Calculate the distance to cells of the target value divided by the density of the target value and save to disk
+    block_count = backend.euclidean_distance(study_area,
+                                             input_raster,
+                                             output_raster,
+                                             '32_BIT_SIGNED',
+                                             '-32768',
+                                             source_values=[target_value],
+                                             scale=100 / target_value)
+    # End timing and report success
+    end_stage(stage, f'{block_count} blocks')
     out_process = f'Successfully calculated inverse density-weighted distance where foliar cover = {target_value}%.'
     return out_process
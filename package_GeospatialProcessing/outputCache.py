@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Output cache
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
+# Description: "Output cache" is a set of functions that key each geoprocessing output on a hash of its input files, key word arguments, and function version. A manifest is stored next to each output so that unchanged steps are skipped and invalidated steps are rerun.
+# ---------------------------------------------------------------------------
+
+# Define the modules that profile, cache, schedule, or benchmark geoprocessing steps without changing their outputs
+UNVERSIONED_MODULES = {'package_GeospatialProcessing.arcpyGeoprocessing',
+                       'package_GeospatialProcessing.benchmarkKernels',
+                       'package_GeospatialProcessing.outputCache',
+                       'package_GeospatialProcessing.scheduleWorkUnits',
+                       'package_GeospatialProcessing.stageProfiling'}
+
+# Define a dictionary that stores the source hash of each module for the life of the process
+SOURCE_HASHES = {}
+
+# Define a function to list the files of a dataset
+def list_dataset_files(input_data):
+    """
+    Description: lists the files that store a dataset, where datasets inside a file geodatabase are stored by the files of the whole geodatabase
+    Inputs: input_data -- path to a file, a directory, or a dataset inside a file geodatabase
+    Returned Value: Returns a tuple of the existing dataset path and a sorted list of its files, or raises FileNotFoundError if the dataset, or the geodatabase of a dataset inside a geodatabase, does not exist
+    Preconditions: lock files are not part of a dataset
+    """
+
+    # Import packages
+    import os
+
+    # Resolve datasets inside a geodatabase to the geodatabase, which is the nearest existing parent with a .gdb extension
+    dataset_path = input_data
+    while not os.path.exists(dataset_path) and '.gdb' in os.path.normpath(dataset_path).lower():
+        dataset_path = os.path.dirname(dataset_path)
+    if not os.path.exists(dataset_path) or (dataset_path != input_data
+                                            and not dataset_path.lower().endswith('.gdb')):
+        raise FileNotFoundError(f'{input_data} does not exist.')
+
+    # List the files of a directory other than lock files, which change whenever the dataset is opened
+    if os.path.isdir(dataset_path):
+        file_list = []
+        for folder, _, files in os.walk(dataset_path):
+            for file in files:
+                if not file.lower().endswith('.lock'):
+                    file_list.append(os.path.join(folder, file))
+        file_list = sorted(file_list)
+    else:
+        file_list = [dataset_path]
+    return dataset_path, file_list
+
+# Define a function to calculate the content hash of a dataset
+def hash_dataset(input_data, block_size=16777216):
+    """
+    Description: calculates a sha256 hash of the contents of a file or of all files in a directory
+    Inputs: input_data -- path to a file, a directory, or a dataset inside a file geodatabase
+            block_size -- the number of bytes read per block
+    Returned Value: Returns a hexadecimal hash string
+    Preconditions: datasets inside a file geodatabase are hashed as the whole geodatabase
+    """
+
+    # Import packages
+    import hashlib
+    import os
+
+    # List the files to hash
+    dataset_path, file_list = list_dataset_files(input_data)
+
+    # Hash the relative name and contents of each file
+    dataset_hash = hashlib.sha256()
+    for file in file_list:
+        dataset_hash.update(os.path.relpath(file, dataset_path).encode('utf-8'))
+        with open(file, 'rb') as file_reader:
+            for block in iter(lambda: file_reader.read(block_size), b''):
+                dataset_hash.update(block)
+    return dataset_hash.hexdigest()
+
+# Define a function to read file statistics used to detect changed files
+def get_file_state(input_data, resolve_dataset=False):
+    """
+    Description: reads the size and modification time of a file, or the total size, latest modification time, and a hash of the size and modification time of every member file of a directory
+    Inputs: input_data -- path to a dataset
+            resolve_dataset -- if True, datasets inside a file geodatabase are resolved to the files of the geodatabase (optional, default is False)
+    Returned Value: Returns a dictionary of size and modification time, or None if the path does not exist
+    Preconditions: none
+    """
+
+    # Import packages
+    import hashlib
+    import os
+
+    # Resolve the files of the dataset
+    if resolve_dataset:
+        try:
+            dataset_path, file_list = list_dataset_files(input_data)
+        except FileNotFoundError:
+            return None
+    elif os.path.exists(input_data):
+        dataset_path, file_list = input_data, [input_data]
+    else:
+        return None
+
+    # Read the file statistics
+    if not os.path.isdir(dataset_path):
+        file_stat = os.stat(dataset_path)
+        return {'size': file_stat.st_size, 'mtime_ns': file_stat.st_mtime_ns}
+    # Summarize the statistics of every member file so that a change to any file is detected without reading it
+    listing_hash = hashlib.sha256()
+    total_size = 0
+    latest_mtime = 0
+    for file in file_list:
+        file_stat = os.stat(file)
+        total_size += file_stat.st_size
+        latest_mtime = max(latest_mtime, file_stat.st_mtime_ns)
+        listing_hash.update(f'{os.path.relpath(file, dataset_path)}|{file_stat.st_size}|{file_stat.st_mtime_ns}\n'.encode('utf-8'))
+    return {'size': total_size, 'mtime_ns': latest_mtime, 'files': listing_hash.hexdigest()}
+
+# Define a function to list the package modules that a module runs
+def list_source_modules(module_name):
+    """
+    Description: lists the source files of a module and of the package modules that it imports directly or through other package modules, including every raster backend module when the raster backend is imported
+    Inputs: module_name -- the name of an imported module
+    Returned Value: Returns a sorted list of tuples of module name and source file path
+    Preconditions: package modules are imported by their full names from packages whose names start with 'package_'
+    """
+
+    # Import packages
+    import ast
+    import importlib.util
+    import os
+    import sys
+
+    # Start from the source file of the module
+    module_file = getattr(sys.modules.get(module_name), '__file__', None)
+    if module_file is None:
+        return []
+    pending_modules = [(module_name, os.path.abspath(module_file))]
+
+    # Follow the package imports of each module other than the modules that do not change outputs
+    source_modules = {}
+    while pending_modules:
+        source_name, source_file = pending_modules.pop()
+        if source_name in source_modules or source_name in UNVERSIONED_MODULES:
+            continue
+        source_modules[source_name] = source_file
+        with open(source_file, 'rb') as source_reader:
+            source_tree = ast.parse(source_reader.read(), filename=source_file)
+        imported_names = []
+        for node in ast.walk(source_tree):
+            if isinstance(node, ast.Import):
+                imported_names.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                imported_names.append(node.module)
+                if '.' not in node.module:
+                    imported_names.extend(f'{node.module}.{alias.name}' for alias in node.names)
+        # Include the backend modules, which the raster backend imports by name
+        if source_name == 'package_GeospatialProcessing.rasterBackend':
+            from package_GeospatialProcessing.rasterBackend import RASTER_BACKENDS
+            imported_names.extend(RASTER_BACKENDS.values())
+        for imported_name in imported_names:
+            if not imported_name.startswith('package_') or '.' not in imported_name:
+                continue
+            try:
+                module_spec = importlib.util.find_spec(imported_name)
+            except (ImportError, ValueError):
+                continue
+            if (module_spec is not None and module_spec.origin is not None and module_spec.origin.endswith('.py')
+                    and os.path.basename(module_spec.origin) != '__init__.py'):
+                pending_modules.append((imported_name, os.path.abspath(module_spec.origin)))
+    return sorted(source_modules.items())
+
+# Define a function to calculate the source hash of a module
+def hash_source(module_name):
+    """
+    Description: calculates a hash of the source code of a module and of the package modules that it runs
+    Inputs: module_name -- the name of an imported module
+    Returned Value: Returns a hexadecimal hash string
+    Preconditions: none
+    """
+
+    # Import packages
+    import hashlib
+
+    # Reuse the hash of a module that was already hashed
+    if module_name in SOURCE_HASHES:
+        return SOURCE_HASHES[module_name]
+
+    # Hash the name and source of each module
+    source_hash = hashlib.sha256(module_name.encode('utf-8'))
+    for source_name, source_file in list_source_modules(module_name):
+        source_hash.update(source_name.encode('utf-8'))
+        with open(source_file, 'rb') as source_reader:
+            source_hash.update(source_reader.read())
+    SOURCE_HASHES[module_name] = source_hash.hexdigest()
+    return SOURCE_HASHES[module_name]
+
+# Define a function to calculate the version hash of a geoprocessing function
+def hash_function(geoprocessing_function):
+    """
+    Description: calculates a hash of the name of a geoprocessing function and the source code of its module and the package modules it runs, so that changes to the helper and backend modules that perform the work invalidate outputs while changes to profiling, caching, and scheduling modules do not
+    Inputs: geoprocessing_function -- a geoprocessing function
+    Returned Value: Returns a hexadecimal hash string
+    Preconditions: none
+    """
+
+    # Import packages
+    import hashlib
+
+    # Hash the qualified name and the module sources
+    function_name = f'{geoprocessing_function.__module__}.{geoprocessing_function.__qualname__}'
+    try:
+        module_source = hash_source(geoprocessing_function.__module__)
+    except (OSError, SyntaxError):
+        module_source = ''
+    return hashlib.sha256((function_name + module_source).encode('utf-8')).hexdigest()
+
+# Define a function to define the manifest path for an output
+def get_manifest_path(output_data):
+    """
+    Description: defines the path of the manifest stored next to an output
+    Inputs: output_data -- path to an output dataset
+    Returned Value: Returns the manifest path, or None if the output cannot hold a manifest next to it
+    Preconditions: outputs inside a file geodatabase are not cached
+    """
+
+    # Import packages
+    import os
+
+    # Outputs inside a geodatabase cannot store a manifest next to them
+    if '.gdb' in os.path.normpath(output_data).lower():
+        return None
+    return output_data + '.manifest.json'
+
+# Define a function to calculate the cache key of a geoprocessing step
+def calculate_cache_key(geoprocessing_function, previous_inputs=None, **kwargs):
+    """
+    Description: calculates the cache key of a geoprocessing step from its function version, key word arguments, and input hashes
+    Inputs: geoprocessing_function -- a geoprocessing function
+            previous_inputs -- a dictionary of input records from a previous manifest used to skip rehashing unchanged files (optional)
+            **kwargs -- key word arguments for the geoprocessing function, including 'input_array'
+    Returned Value: Returns a tuple of the cache key and a list of input records
+    Preconditions: all inputs must exist
+    """
+
+    # Import packages
+    import hashlib
+    import json
+
+    # Hash each input, reusing previous hashes for files and geodatabases with unchanged sizes and modification times
+    if previous_inputs is None:
+        previous_inputs = {}
+    input_records = []
+    for input_data in kwargs.get('input_array', []):
+        file_state = get_file_state(input_data, resolve_dataset=True)
+        previous_record = previous_inputs.get(input_data)
+        if (file_state is not None and previous_record is not None
+                and all(previous_record.get(name) == value for name, value in file_state.items())):
+            input_hash = previous_record['sha256']
+        else:
+            input_hash = hash_dataset(input_data)
+        input_record = {'path': input_data, 'sha256': input_hash}
+        if file_state is not None:
+            input_record.update(file_state)
+        input_records.append(input_record)
+
+    # Hash the key word arguments other than the input and output arrays
+    argument_dictionary = {key: value for key, value in kwargs.items() if key not in ('input_array', 'output_array')}
+    argument_text = json.dumps(argument_dictionary, sort_keys=True, default=str)
+
+    # Combine the function version, arguments, and input hashes into the cache key
+    cache_hash = hashlib.sha256()
+    cache_hash.update(hash_function(geoprocessing_function).encode('utf-8'))
+    cache_hash.update(argument_text.encode('utf-8'))
+    for input_record in input_records:
+        cache_hash.update(input_record['sha256'].encode('utf-8'))
+    return cache_hash.hexdigest(), input_records
+
+# Define a function to read a manifest
+def read_manifest(output_data):
+    """
+    Description: reads the manifest stored next to an output
+    Inputs: output_data -- path to an output dataset
+    Returned Value: Returns the manifest dictionary, or None if no readable manifest exists
+    Preconditions: none
+    """
+
+    # Import packages
+    import json
+    import os
+
+    # Read the manifest if it exists
+    manifest_path = get_manifest_path(output_data)
+    if manifest_path is None or not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r') as manifest_reader:
+            return json.load(manifest_reader)
+    except (OSError, ValueError):
+        return None
+
+# Define a function to compare the outputs of a geoprocessing step to the current cache key
+def check_outputs(geoprocessing_function, **kwargs):
+    """
+    Description: calculates the current cache key of a geoprocessing step and determines whether every output has a manifest that matches it
+    Inputs: geoprocessing_function -- a geoprocessing function
+            **kwargs -- key word arguments for the geoprocessing function, including 'input_array' and 'output_array'
+    Returned Value: Returns a tuple of a boolean that is True if all outputs are current, the cache key, and the list of input records, where the cache key and input records are None if an input is missing
+    Preconditions: none
+    """
+
+    # Check that all inputs exist before hashing so that a missing input is reported by the geoprocessing wrapper
+    for input_data in kwargs.get('input_array', []):
+        try:
+            list_dataset_files(input_data)
+        except FileNotFoundError:
+            return False, None, None
+    # Calculate the cache key, reusing the input hashes of any manifest for inputs that have not changed
+    output_array = kwargs['output_array']
+    manifests = [read_manifest(output_data) for output_data in output_array]
+    previous_inputs = {}
+    for manifest in manifests:
+        if manifest is not None:
+            previous_inputs.update({record['path']: record for record in manifest['inputs'] if 'size' in record})
+    cache_key, input_records = calculate_cache_key(geoprocessing_function, previous_inputs, **kwargs)
+    # Compare the outputs and their manifests to the cache key
+    outputs_match = all(manifest is not None
+                        and get_file_state(output_data) == manifest['output']
+                        and manifest['cache_key'] == cache_key
+                        for output_data, manifest in zip(output_array, manifests))
+    return outputs_match, cache_key, input_records
+
+# Define a function to determine if the outputs of a geoprocessing step are current
+def outputs_current(geoprocessing_function, **kwargs):
+    """
+    Description: determines whether every output of a geoprocessing step has a manifest that matches the current cache key
+    Inputs: geoprocessing_function -- a geoprocessing function
+            **kwargs -- key word arguments for the geoprocessing function, including 'input_array' and 'output_array'
+    Returned Value: Returns True if all outputs exist, are unmodified since their manifests were written, and match the cache key
+    Preconditions: none
+    """
+
+    # Read the manifests and check that the outputs have not changed since they were written before hashing inputs
+    for output_data in kwargs['output_array']:
+        manifest = read_manifest(output_data)
+        if manifest is None or get_file_state(output_data) != manifest['output']:
+            return False
+    # Compare the current cache key to the manifest cache keys
+    return check_outputs(geoprocessing_function, **kwargs)[0]
+
+# Define a function to write manifests for the outputs of a geoprocessing step
+def write_manifests(geoprocessing_function, cache_key, input_records, **kwargs):
+    """
+    Description: writes a manifest next to each output of a geoprocessing step
+    Inputs: geoprocessing_function -- a geoprocessing function
+            cache_key -- the cache key calculated before the step was executed
+            input_records -- the input records calculated before the step was executed
+            **kwargs -- key word arguments for the geoprocessing function, including 'output_array'
+    Returned Value: Returns the number of manifests written
+    Preconditions: the outputs must exist
+    """
+
+    # Import packages
+    import datetime
+    import json
+
+    # Write a manifest for each output that can hold one
+    manifest_count = 0
+    for output_data in kwargs['output_array']:
+        manifest_path = get_manifest_path(output_data)
+        output_state = get_file_state(output_data)
+        if manifest_path is None or output_state is None:
+            continue
+        manifest = {'function': f'{geoprocessing_function.__module__}.{geoprocessing_function.__qualname__}',
+                    'function_hash': hash_function(geoprocessing_function),
+                    'cache_key': cache_key,
+                    'inputs': input_records,
+                    'output': output_state,
+                    'created': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        with open(manifest_path, 'w') as manifest_writer:
+            json.dump(manifest, manifest_writer, indent=2)
+        manifest_count += 1
+    return manifest_count
+
+# Define a wrapper function that skips geoprocessing steps with current outputs
+def cached_geoprocessing(geoprocessing_function, check_output=True, check_input=True, force=False, **kwargs):
+    """
+    Description: wraps the geoprocessing wrapper so that steps are only executed if their outputs are missing or out of date
+    Inputs: geoprocessing function -- any geoprocessing function that receives ** kwargs arguments
+            check_output -- boolean input passed to the geoprocessing wrapper
+            check_input -- boolean input passed to the geoprocessing wrapper
+            force -- if True, the step is executed and its manifests are rewritten even if its outputs are current (optional, default is False)
+            **kwargs -- key word arguments that are used in the wrapper and passed to the geoprocessing function
+                'input_array' -- an array of the input datasets that define the cache key
+                'output_array' -- an array of the output datasets that receive manifests
+    Returned Value: Returns True if the geoprocessing function was executed and False if the outputs were current
+    Preconditions: geoprocessing function and kwargs must be defined
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.arcpyGeoprocessing import arcpy_geoprocessing
+    from package_GeospatialProcessing.stageProfiling import profile_stage
+
+    # Skip the step if all outputs are current unless it is forced
+    current, cache_key, input_records = check_outputs(geoprocessing_function, **kwargs)
+    if current and not force:
+        print('\tOutputs are current with their inputs and will not be recalculated.')
+        return False
+    # Execute the step and keep the cache key calculated before execution so that the manifest describes the inputs that were used
+    with profile_stage('cached_geoprocessing', function=geoprocessing_function.__name__, output=kwargs['output_array'][0]):
+        arcpy_geoprocessing(geoprocessing_function, check_output, check_input, **kwargs)
+    # Do not store manifests for a step that ran without all of its inputs, because no cache key describes it
+    if cache_key is not None:
+        write_manifests(geoprocessing_function, cache_key, input_records, **kwargs)
+    return True
@@ -23,10 +23,10 @@ def project_xy_table(**kwargs):
     """
 
     # Import packages
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
     import arcpy
-    import datetime
     import os
-    import time
 
     # Parse key word argument inputs
     longitude_field = kwargs['coordinate_fields'][0]
@@ -52,21 +52,15 @@ def project_xy_table(**kwargs):
     target_projection = arcpy.SpatialReference(output_projection)
 
     # Start timing function
-    iteration_start = time.time()
+    stage = start_stage('project_xy_table.convert_table', output=kwargs['output_array'][0])
     print(f'\tConverting point table to feature class...')
     # Convert xy coordinates to table feature class
     arcpy.management.XYTableToPoint(input_csv, point_feature, longitude_field, latitude_field, '', initial_projection)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    # End timing and report success
+    end_stage(stage)
 
     # Start timing function
-    iteration_start = time.time()
+    stage = start_stage('project_xy_table.project', output=kwargs['output_array'][0])
     print(f'\tProjecting xy coordinates...')
     # Project xy coordinates
     arcpy.management.Project(point_feature, output_feature, target_projection, transformation, initial_projection, '', '', '')
@@ -76,13 +70,7 @@ def project_xy_table(**kwargs):
     # Delete point feature if it exists
     if arcpy.Exists(point_feature) == 1:
         arcpy.management.Delete(point_feature)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    # End timing and report success
+    end_stage(stage)
     out_process = 'Successfully converted and projected coordinates.'
     return out_process
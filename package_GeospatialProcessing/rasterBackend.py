@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Raster backend
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation. The numpy backend requires numpy, scipy, and rasterio. The arcpy backend must be executed in an ArcGIS Pro Python 3.6 installation with Spatial Analyst.
+# Description: "Raster backend" is a set of functions that select the module that performs raster operations for the geospatial processing functions. Every backend module defines the same operations: dataset_exists, get_raster_properties, reclassify_classes, con_is_null, extract_by_mask, mosaic_rasters, euclidean_distance, rasterize_features, and copy_raster.
+# ---------------------------------------------------------------------------
+
+# Define the environment variable that stores the backend name so that worker processes inherit it
+BACKEND_VARIABLE = 'GEOPROCESSING_RASTER_BACKEND'
+
+# Define the modules of the available backends
+RASTER_BACKENDS = {'numpy': 'package_GeospatialProcessing.rasterBackendNumpy',
+                   'arcpy': 'package_GeospatialProcessing.rasterBackendArcpy'}
+
+# Define a function to set the raster backend
+def set_raster_backend(backend_name):
+    """
+    Description: sets the raster backend used in this process and in worker processes started afterwards
+    Inputs: backend_name -- the name of a backend in RASTER_BACKENDS, or None to select the backend automatically
+    Returned Value: Returns the backend name
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Store the backend name in the environment
+    if backend_name is None:
+        os.environ.pop(BACKEND_VARIABLE, None)
+    elif backend_name not in RASTER_BACKENDS:
+        raise ValueError(f'Raster backend must be one of {", ".join(RASTER_BACKENDS)}.')
+    else:
+        os.environ[BACKEND_VARIABLE] = backend_name
+    return backend_name
+
+# Define a function to get the raster backend
+def get_raster_backend(backend_name=None):
+    """
+    Description: imports the module of a raster backend
+    Inputs: backend_name -- the name of a backend in RASTER_BACKENDS (optional, default is the backend set by set_raster_backend or the numpy backend)
+    Returned Value: Returns the backend module
+    Preconditions: the packages of the backend must be installed
+    """
+
+    # Import packages
+    import importlib
+    import os
+
+    # Select the requested backend, otherwise the numpy backend which runs on all platforms
+    backend_name = backend_name or os.environ.get(BACKEND_VARIABLE) or 'numpy'
+    if backend_name not in RASTER_BACKENDS:
+        raise ValueError(f'Raster backend must be one of {", ".join(RASTER_BACKENDS)}.')
+    return importlib.import_module(RASTER_BACKENDS[backend_name])
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Arcpy raster backend
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with Spatial Analyst.
+# Description: "Arcpy raster backend" is a set of functions that perform the raster operations of the geospatial processing functions with arcpy and Spatial Analyst. Results are snapped to the study area and saved to disk as GeoTIFF.
+# ---------------------------------------------------------------------------
+
+# Define the Esri raster value types in the order of their value type numbers
+VALUE_TYPES = ['1_BIT',
+               '2_BIT',
+               '4_BIT',
+               '8_BIT_UNSIGNED',
+               '8_BIT_SIGNED',
+               '16_BIT_UNSIGNED',
+               '16_BIT_SIGNED',
+               '32_BIT_UNSIGNED',
+               '32_BIT_SIGNED',
+               '32_BIT_FLOAT',
+               '64_BIT']
+
+# Define a function to set the arcpy environment to a study area
+def set_environment(study_area):
+    """
+    Description: sets the overwrite option, parallel processing factor, snap raster, extent, and cell size to a study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+    Returned Value: Returns the study area raster object
+    Preconditions: requires an existing study area raster
+    """
+
+    # Import packages
+    import arcpy
+    from arcpy.sa import Raster
+
+    # Check out the Spatial Analyst extension
+    arcpy.CheckOutExtension('Spatial')
+
+    # Set overwrite option
+    arcpy.env.overwriteOutput = True
+
+    # Use half of cores on processes that can be split.
+    arcpy.env.parallelProcessingFactor = '50%'
+
+    # Set snap raster, extent, and cell size
+    study_raster = Raster(study_area)
+    arcpy.env.snapRaster = study_area
+    arcpy.env.extent = study_raster.extent
+    arcpy.env.cellSize = 'MINOF'
+    return study_raster
+
+# Define a function to save a raster to disk
+def save_raster(input_raster, output_raster, value_type, no_data):
+    """
+    Description: saves a raster or raster object to disk as a GeoTIFF with a value type and no data value
+    Inputs: input_raster -- a raster object or path to a raster
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: none
+    """
+
+    # Import packages
+    import arcpy
+
+    # Copy the raster to disk
+    arcpy.management.CopyRaster(input_raster,
+                                output_raster,
+                                '',
+                                '',
+                                str(no_data),
+                                'NONE',
+                                'NONE',
+                                value_type,
+                                'NONE',
+                                'NONE',
+                                'TIFF',
+                                'NONE',
+                                'CURRENT_SLICE',
+                                'NO_TRANSPOSE')
+    return 1
+
+# Define a function to create a where clause that excludes values
+def exclude_values_clause(class_values):
+    """
+    Description: creates a where clause that is true for cells with values other than the selected values
+    Inputs: class_values -- a list of class values
+    Returned Value: Returns a where clause string
+    Preconditions: none
+    """
+
+    # Join the values
+    return f'VALUE NOT IN ({", ".join(str(int(value)) for value in class_values)})'
+
+# Define a function to determine if a dataset exists
+def dataset_exists(dataset):
+    """
+    Description: determines if a dataset exists in a folder or geodatabase
+    Inputs: dataset -- path to a dataset
+    Returned Value: Returns True if the dataset exists
+    Preconditions: none
+    """
+
+    # Import packages
+    import arcpy
+
+    # Check the dataset with arcpy
+    return arcpy.Exists(dataset) == True
+
+# Define a function to determine the value type and no data value of a raster
+def get_raster_properties(input_raster):
+    """
+    Description: determines the Esri value type and no data value of a raster
+    Inputs: input_raster -- path to a raster dataset
+    Returned Value: Returns a tuple of the value type string and the no data value
+    Preconditions: requires an existing raster dataset
+    """
+
+    # Import packages
+    import arcpy
+    from arcpy.sa import Raster
+
+    # Read the value type number and no data value
+    type_number = arcpy.management.GetRasterProperties(input_raster, 'VALUETYPE').getOutput(0)
+    return VALUE_TYPES[int(type_number)], Raster(input_raster).noDataValue
+
+# Define a function to reclassify a categorical raster into multiple outputs
+def reclassify_classes(study_area, input_raster, output_rasters, reclass_tables, value_type, no_data, mask_rasters=None,
+                       block_size=2048):
+    """
+    Description: reclassifies a categorical raster into one or more outputs, where each output assigns output values to selected classes, sets all other cells to null, and is extracted to the study area and an optional mask
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the categorical input raster
+            output_rasters -- a list of output raster paths
+            reclass_tables -- a list of dictionaries, one per output raster, that map class values to output values
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            mask_rasters -- a list of mask raster paths, one per output raster (optional, default is the study area for all outputs)
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is one per output raster
+    Preconditions: requires an existing categorical raster
+    """
+
+    # Import packages
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import Raster
+    from arcpy.sa import Reclassify
+    from arcpy.sa import RemapValue
+
+    # Reclassify the selected classes, set all other values to null, and extract each output to its mask
+    set_environment(study_area)
+    mask_rasters = mask_rasters or [study_area] * len(output_rasters)
+    for output_raster, reclass_table, mask_raster in zip(output_rasters, reclass_tables, mask_rasters):
+        remap_values = RemapValue([[class_value, out_value] for class_value, out_value in reclass_table.items()])
+        reclass_raster = Reclassify(Raster(input_raster), 'VALUE', remap_values, 'NODATA')
+        extract_raster = ExtractByMask(reclass_raster, mask_raster)
+        if mask_raster != study_area:
+            extract_raster = ExtractByMask(extract_raster, study_area)
+        save_raster(extract_raster, output_raster, value_type, no_data)
+    return len(output_rasters)
+
+# Define a function to convert null and data values to constants
+def con_is_null(study_area, input_raster, output_raster, data_value, null_value, value_type, no_data, block_size=2048):
+    """
+    Description: assigns one value to null cells and another value to data cells of a raster and extracts the result to the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster
+            output_raster -- path to the output raster
+            data_value -- the value assigned to cells with data
+            null_value -- the value assigned to null cells
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires an existing raster
+    """
+
+    # Import packages
+    from arcpy.sa import Con
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import IsNull
+    from arcpy.sa import Raster
+
+    # Convert null values and data values
+    set_environment(study_area)
+    converted_raster = Con(IsNull(Raster(input_raster)), null_value, data_value)
+    extract_raster = ExtractByMask(converted_raster, study_area)
+    return save_raster(extract_raster, output_raster, value_type, no_data)
+
+# Define a function to extract a raster to a mask raster
+def extract_by_mask(study_area, input_raster, mask_raster, output_raster, value_type, no_data, no_data_replace='',
+                    block_size=2048):
+    """
+    Description: extracts a raster to the data cells of a mask raster and optionally replaces no data within the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster
+            mask_raster -- path to the mask raster
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            no_data_replace -- a value to replace no data values (optional)
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires existing input and mask rasters
+    """
+
+    # Import packages
+    from arcpy.sa import Con
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import IsNull
+    from arcpy.sa import Raster
+
+    # Extract raster to the mask
+    set_environment(study_area)
+    extract_raster = ExtractByMask(input_raster, mask_raster)
+    # Convert no data values to data if no_data_replace is not null
+    if no_data_replace != '':
+        nonull_raster = Con(IsNull(Raster(extract_raster)), no_data_replace, Raster(extract_raster))
+        extract_raster = ExtractByMask(nonull_raster, study_area)
+    return save_raster(extract_raster, output_raster, value_type, no_data)
+
+# Define a function to mosaic rasters
+def mosaic_rasters(study_area, input_rasters, output_raster, value_type, no_data, mosaic_method='MINIMUM', block_size=2048):
+    """
+    Description: merges overlapping rasters with a mosaic operator and extracts the result to the study area without an intermediate mosaic dataset
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_rasters -- a list of input raster paths in mosaic order
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            mosaic_method -- the mosaic operator: 'MINIMUM', 'MAXIMUM', 'FIRST', 'LAST', or 'MEAN' (optional, default is 'MINIMUM')
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires existing numeric rasters
+    """
+
+    # Import packages
+    from arcpy.sa import CellStatistics
+    from arcpy.sa import Con
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import IsNull
+    from arcpy.sa import Raster
+
+    # Merge the cells with data with cell statistics or by filling null cells in mosaic order
+    set_environment(study_area)
+    mosaic_method = mosaic_method.upper()
+    if mosaic_method in ['MINIMUM', 'MAXIMUM', 'MEAN']:
+        mosaic_raster = CellStatistics(input_rasters, mosaic_method, 'DATA')
+    elif mosaic_method in ['FIRST', 'LAST']:
+        ordered_rasters = input_rasters if mosaic_method == 'FIRST' else input_rasters[::-1]
+        mosaic_raster = Raster(ordered_rasters[0])
+        for input_raster in ordered_rasters[1:]:
+            mosaic_raster = Con(IsNull(mosaic_raster), Raster(input_raster), mosaic_raster)
+    else:
+        raise ValueError('Mosaic method must be MINIMUM, MAXIMUM, FIRST, LAST, or MEAN.')
+    extract_raster = ExtractByMask(mosaic_raster, study_area)
+    return save_raster(extract_raster, output_raster, value_type, no_data)
+
+# Define a function to calculate euclidean distance to source cells
+def euclidean_distance(study_area, input_raster, output_raster, value_type, no_data, source_values=None, scale=1):
+    """
+    Description: calculates the euclidean distance from each cell to the nearest source cell, multiplies it by a scale, and extracts the result to the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster where data cells are sources
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            source_values -- a list of the values of source cells (optional, default is all data cells)
+            scale -- a multiplier of the distance (optional, default is 1)
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires an existing raster
+    """
+
+    # Import packages
+    from arcpy.sa import EucDistance
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import Raster
+    from arcpy.sa import SetNull
+
+    # Set all values except for the source values to null
+    set_environment(study_area)
+    source_raster = Raster(input_raster)
+    if source_values is not None:
+        source_raster = SetNull(source_raster, 1, exclude_values_clause(source_values))
+    # Calculate and scale the euclidean distance
+    distance_raster = EucDistance(source_raster) * scale
+    extract_raster = ExtractByMask(distance_raster, study_area)
+    return save_raster(extract_raster, output_raster, value_type, no_data)
+
+# Define a function to convert selected features to raster
+def rasterize_features(study_area, input_feature, output_raster, where_clause, input_projection, value_type, no_data,
+                       geographic_transformation='', coverage_fraction=False, supersample=10, block_size=2048):
+    """
+    Description: converts the features selected by a where clause to a raster on the study area grid where cells covered by features are one and other cells within the study area are zero, or optionally the percent of each cell covered by features, without writing a projected feature class
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, cell size, and output coordinate system
+            input_feature -- path to the input feature class
+            output_raster -- path to the output raster
+            where_clause -- a SQL query that defines the selected features, or an empty string to select all features
+            input_projection -- not used by the arcpy backend, which reads the coordinate system of the feature class
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            geographic_transformation -- the string representation of the geographic transformation (blank if none required)
+            coverage_fraction -- if True, the output is the percent of each cell covered by features (optional, default is False)
+            supersample -- the number of sub-cell rows and columns per cell used to calculate the percent coverage (optional, default is 10)
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires an existing feature class with a defined coordinate system
+    """
+
+    # Import packages
+    import arcpy
+    from arcpy.sa import Aggregate
+    from arcpy.sa import Con
+    from arcpy.sa import ExtractByMask
+    from arcpy.sa import Int
+    from arcpy.sa import IsNull
+    from arcpy.sa import Raster
+
+    # Project the selected features on the fly to the study area coordinate system
+    study_raster = set_environment(study_area)
+    arcpy.env.outputCoordinateSystem = study_raster.spatialReference
+    arcpy.env.geographicTransformations = geographic_transformation
+    feature_layer = arcpy.management.MakeFeatureLayer(input_feature, 'selected_features', where_clause)
+    feature_raster = arcpy.CreateScratchName('features', '', 'RasterDataset', arcpy.env.scratchFolder)
+    try:
+        # Convert the selected features to raster at the study area cell size or at the sub-cell size
+        cell_size = study_raster.meanCellWidth
+        if coverage_fraction:
+            cell_size = cell_size / supersample
+        arcpy.conversion.FeatureToRaster(feature_layer,
+                                         arcpy.Describe(input_feature).OIDFieldName,
+                                         feature_raster,
+                                         cell_size)
+        # Convert values to one and null to zero, and sum the sub-cells to percent coverage if requested
+        burned_raster = Con(IsNull(Raster(feature_raster)), 0, 1)
+        if coverage_fraction:
+            burned_raster = Int(Aggregate(burned_raster, supersample, 'SUM', 'EXPAND', 'DATA') * 100.0
+                                / supersample ** 2 + 0.5)
+        extract_raster = ExtractByMask(burned_raster, study_area)
+        return save_raster(extract_raster, output_raster, value_type, no_data)
+    finally:
+        arcpy.management.Delete(feature_layer)
+        if arcpy.Exists(feature_raster):
+            arcpy.management.Delete(feature_raster)
+
+# Define a function to copy a raster to a value type and no data value
+def copy_raster(input_raster, output_raster, value_type, no_data, block_size=2048):
+    """
+    Description: copies a raster to a GeoTIFF with a new value type and no data value
+    Inputs: input_raster -- path to the input raster
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            block_size -- not used by the arcpy backend
+    Returned Value: Returns the number of blocks written, which is always one
+    Preconditions: requires an existing raster
+    """
+
+    # Copy the raster
+    return save_raster(input_raster, output_raster, value_type, no_data)
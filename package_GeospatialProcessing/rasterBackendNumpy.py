@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Numpy raster backend
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, and rasterio. Feature rasterization also requires fiona 1.9 or later. Does not require arcpy.
+# Description: "Numpy raster backend" is a set of functions that perform the raster operations of the geospatial processing functions with numpy and GDAL through rasterio. Cell operations are evaluated as fused raster expressions on aligned blocks snapped to the study area grid and euclidean distance is calculated in memory with an exact distance transform.
+# ---------------------------------------------------------------------------
+
+# Define a function to determine if a dataset exists
+def dataset_exists(dataset):
+    """
+    Description: determines if a dataset exists on disk
+    Inputs: dataset -- path to a dataset
+    Returned Value: Returns True if the dataset exists
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Check the path
+    return os.path.exists(dataset)
+
+# Define a function to determine the value type and no data value of a raster
+def get_raster_properties(input_raster):
+    """
+    Description: determines the Esri value type and no data value of a raster
+    Inputs: input_raster -- path to a raster dataset
+    Returned Value: Returns a tuple of the value type string and the no data value
+    Preconditions: requires an existing raster dataset
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_raster_properties as read_raster_properties
+
+    # Read the properties from the statistics index of the raster, otherwise with rasterio
+    return read_raster_properties(input_raster)
+
+# Define a function to create a lookup table for a reclass table
+def create_lookup_table(reclass_table, input_type, output_type):
+    """
+    Description: creates a lookup table that holds an output value and a selection flag for every value of an 8 or 16 bit integer data type
+    Inputs: reclass_table -- a dictionary that maps class values to output values
+            input_type -- the numpy data type of the categorical input raster
+            output_type -- the numpy data type of the output raster
+    Returned Value: Returns a tuple of the unsigned index data type, the array of output values, and the boolean array of selected classes
+    Preconditions: the input data type must be an 8 or 16 bit integer type
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Define the unsigned data type whose values index the table
+    input_type = np.dtype(input_type)
+    if input_type.kind not in 'iu' or input_type.itemsize > 2:
+        raise ValueError('Reclassified rasters must have an 8 or 16 bit integer value type.')
+    index_type = np.dtype(f'uint{input_type.itemsize * 8}')
+
+    # Assign output values to the selected classes that the input data type can store
+    lookup_values = np.zeros(2 ** (input_type.itemsize * 8), dtype=output_type)
+    lookup_selected = np.zeros(lookup_values.shape, dtype=bool)
+    input_range = np.iinfo(input_type)
+    for class_value, out_value in reclass_table.items():
+        if input_range.min <= class_value <= input_range.max:
+            index = np.array(class_value, dtype=input_type).view(index_type)
+            lookup_values[index] = out_value
+            lookup_selected[index] = True
+    return index_type, lookup_values, lookup_selected
+
+# Define a function to reclassify a block with lookup tables
+def reclassify_blocks(input_blocks, study_block, index_type, lookup_tables):
+    """
+    Description: reclassifies a categorical block into one output block per lookup table, where unselected classes, null input cells, and cells outside the study area or the mask of each output are null
+    Inputs: input_blocks -- a list of the masked categorical input block followed by one masked mask block per lookup table
+            study_block -- a boolean block that is True within the study area
+            index_type -- the unsigned data type whose values index the lookup tables
+            lookup_tables -- a list of tuples of output values and selected classes returned by create_lookup_table
+    Returned Value: Returns a list of masked output blocks
+    Preconditions: this function is called by process_raster_blocks
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Index the lookup tables with the class values of the block
+    index_block = np.ma.getdata(input_blocks[0]).view(index_type)
+    data_block = study_block & ~np.ma.getmaskarray(input_blocks[0])
+    output_blocks = []
+    for (lookup_values, lookup_selected), mask_block in zip(lookup_tables, input_blocks[1:]):
+        selected_block = lookup_selected[index_block] & data_block & ~np.ma.getmaskarray(mask_block)
+        output_blocks.append(np.ma.masked_array(lookup_values[index_block], mask=~selected_block))
+    return output_blocks
+
+# Define a function to reclassify a categorical raster into multiple outputs
+def reclassify_classes(study_area, input_raster, output_rasters, reclass_tables, value_type, no_data, mask_rasters=None,
+                       block_size=2048):
+    """
+    Description: reclassifies a categorical raster into one or more outputs in a single read, where each output assigns output values to selected classes, sets all other cells to null, and is extracted to the study area and an optional mask
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the categorical input raster
+            output_rasters -- a list of output raster paths
+            reclass_tables -- a list of dictionaries, one per output raster, that map class values to output values
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            mask_rasters -- a list of mask raster paths, one per output raster (optional, default is the study area for all outputs)
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires an existing categorical raster with an 8 or 16 bit integer value type
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_data_type
+    from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+    import rasterio
+
+    # Create a lookup table for each output from the input data type
+    with rasterio.open(input_raster) as input_dataset:
+        input_type = input_dataset.dtypes[0]
+    lookup_tables = [create_lookup_table(reclass_table, input_type, get_data_type(value_type))
+                     for reclass_table in reclass_tables]
+    index_type = lookup_tables[0][0]
+
+    # Read the input once and write every output
+    mask_rasters = mask_rasters or [study_area] * len(output_rasters)
+    return process_raster_blocks(reclassify_blocks,
+                                 study_area,
+                                 [input_raster] + list(mask_rasters),
+                                 list(output_rasters),
+                                 value_type,
+                                 no_data,
+                                 block_size,
+                                 index_type=index_type,
+                                 lookup_tables=[lookup_table[1:] for lookup_table in lookup_tables])
+
+# Define a function to convert null and data values to constants
+def con_is_null(study_area, input_raster, output_raster, data_value, null_value, value_type, no_data, block_size=2048):
+    """
+    Description: assigns one value to null cells and another value to data cells of a raster and extracts the result to the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster
+            output_raster -- path to the output raster
+            data_value -- the value assigned to cells with data
+            null_value -- the value assigned to null cells
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires an existing raster
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterExpression import evaluate_expression
+    from package_GeospatialProcessing.rasterExpression import open_raster
+    from package_GeospatialProcessing.rasterExpression import study_area_mask
+    from package_GeospatialProcessing.rasterExpression import where
+
+    # Assign values by the null cells of the input within the study area
+    converted_expression = where(open_raster(input_raster).isnull(), null_value, data_value)
+    return evaluate_expression(converted_expression.mask(study_area_mask()),
+                               study_area,
+                               output_raster,
+                               value_type,
+                               no_data,
+                               block_size)
+
+# Define a function to extract a raster to a mask raster
+def extract_by_mask(study_area, input_raster, mask_raster, output_raster, value_type, no_data, no_data_replace='',
+                    block_size=2048):
+    """
+    Description: extracts a raster to the data cells of a mask raster and optionally replaces no data within the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster
+            mask_raster -- path to the mask raster
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            no_data_replace -- a value to replace no data values (optional)
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires existing input and mask rasters
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterExpression import evaluate_expression
+    from package_GeospatialProcessing.rasterExpression import open_raster
+    from package_GeospatialProcessing.rasterExpression import study_area_mask
+
+    # Extract the input to the mask and convert no data values to data within the study area if no_data_replace is not null
+    extract_expression = open_raster(input_raster).mask(open_raster(mask_raster))
+    if no_data_replace != '':
+        extract_expression = extract_expression.fill_null(no_data_replace).mask(study_area_mask())
+    return evaluate_expression(extract_expression,
+                               study_area,
+                               output_raster,
+                               value_type,
+                               no_data,
+                               block_size)
+
+# Define a function to mosaic rasters
+def mosaic_rasters(study_area, input_rasters, output_raster, value_type, no_data, mosaic_method='MINIMUM', block_size=2048):
+    """
+    Description: merges overlapping rasters with a mosaic operator and extracts the result to the study area in one pass
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_rasters -- a list of input raster paths in mosaic order
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            mosaic_method -- the mosaic operator: 'MINIMUM', 'MAXIMUM', 'FIRST', 'LAST', or 'MEAN' (optional, default is 'MINIMUM')
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires existing numeric rasters
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterExpression import evaluate_expression
+    from package_GeospatialProcessing.rasterExpression import mosaic
+    from package_GeospatialProcessing.rasterExpression import open_raster
+    from package_GeospatialProcessing.rasterExpression import study_area_mask
+
+    # Merge the cells with data within the study area
+    mosaic_expression = mosaic(*[open_raster(input_raster) for input_raster in input_rasters], method=mosaic_method)
+    return evaluate_expression(mosaic_expression.mask(study_area_mask()),
+                               study_area,
+                               output_raster,
+                               value_type,
+                               no_data,
+                               block_size)
+
+# Define a function to calculate euclidean distance to source cells
+def euclidean_distance(study_area, input_raster, output_raster, value_type, no_data, source_values=None, scale=1):
+    """
+    Description: calculates the exact euclidean distance from each cell to the nearest source cell, multiplies it by a scale, and extracts the result to the study area
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_raster -- path to the input raster where data cells are sources
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            source_values -- a list of the values of source cells (optional, default is all data cells)
+            scale -- a multiplier of the distance (optional, default is 1)
+    Returned Value: Returns the number of blocks written
+    Preconditions: the study area grid must fit in memory
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_data_type
+    from package_GeospatialProcessing.rasterBlocks import open_aligned
+    from package_GeospatialProcessing.rasterBlocks import temporary_output
+    import numpy as np
+    import rasterio
+    from scipy.ndimage import distance_transform_edt
+
+    # Define output data type and no data value
+    data_type = get_data_type(value_type)
+    no_data = np.dtype(data_type).type(float(no_data))
+
+    # Read the sources on the study area grid
+    with rasterio.open(study_area) as study_dataset:
+        output_profile = study_dataset.profile.copy()
+        study_mask = study_dataset.read_masks(1) > 0
+        cell_size = abs(study_dataset.transform.a)
+        input_dataset = open_aligned(input_raster, study_dataset)
+        try:
+            input_array = input_dataset.read(1, masked=True)
+        finally:
+            source_dataset = getattr(input_dataset, 'src_dataset', None)
+            input_dataset.close()
+            if source_dataset is not None:
+                source_dataset.close()
+    source_array = ~np.ma.getmaskarray(input_array)
+    if source_values is not None:
+        source_array &= np.isin(np.ma.getdata(input_array), source_values)
+    del input_array
+
+    # Calculate the distance to the nearest source and set cells without sources to no data
+    no_data_array = ~study_mask
+    if source_array.any():
+        distance_array = distance_transform_edt(~source_array, sampling=cell_size)
+        distance_array *= scale
+    else:
+        distance_array = np.zeros(study_mask.shape)
+        no_data_array[:] = True
+    output_array = distance_array.astype(data_type)
+    output_array[no_data_array] = no_data
+
+    # Save the distance raster to disk
+    output_profile.update(driver='GTiff',
+                          dtype=data_type,
+                          nodata=no_data.item(),
+                          count=1,
+                          compress='lzw',
+                          tiled=True,
+                          blockxsize=256,
+                          blockysize=256,
+                          BIGTIFF='IF_SAFER')
+    with temporary_output(output_raster) as temporary_raster:
+        with rasterio.open(temporary_raster, 'w', **output_profile) as output_dataset:
+            output_dataset.write(output_array, 1)
+    return 1
+
+# Define a function to split a feature class path into a dataset and layer
+def split_feature_path(input_feature):
+    """
+    Description: splits a feature class path in a file geodatabase, including feature classes in feature datasets, into the geodatabase path and the layer name
+    Inputs: input_feature -- path to a feature class or a single layer vector dataset
+    Returned Value: Returns a tuple of the dataset path and the layer name, which is None for single layer datasets
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Search the parent folders for a file geodatabase
+    dataset_path = input_feature
+    while not dataset_path.lower().endswith('.gdb') and os.path.dirname(dataset_path) != dataset_path:
+        dataset_path = os.path.dirname(dataset_path)
+    if dataset_path.lower().endswith('.gdb'):
+        return dataset_path, os.path.basename(input_feature)
+    return input_feature, None
+
+# Define a function to calculate the bounds of a geometry
+def geometry_bounds(geometry):
+    """
+    Description: calculates the bounding box of a GeoJSON-like geometry
+    Inputs: geometry -- a GeoJSON-like geometry dictionary
+    Returned Value: Returns a tuple of the minimum x, minimum y, maximum x, and maximum y
+    Preconditions: geometry must not be empty
+    """
+
+    # Import packages
+    from numbers import Number
+    import numpy as np
+
+    # Collect the bounds of each point sequence
+    def sequence_bounds(coordinates):
+        if isinstance(coordinates[0], Number):
+            return [coordinates[:2] * 2]
+        if isinstance(coordinates[0][0], Number):
+            points = np.asarray(coordinates, dtype='float64')[:, :2]
+            return [[*points.min(axis=0), *points.max(axis=0)]]
+        return [bounds for part in coordinates for bounds in sequence_bounds(part)]
+
+    if geometry['type'] == 'GeometryCollection':
+        part_bounds = np.array([geometry_bounds(part) for part in geometry['geometries']])
+    else:
+        part_bounds = np.array(sequence_bounds(geometry['coordinates']))
+    return (*part_bounds[:, :2].min(axis=0), *part_bounds[:, 2:].max(axis=0))
+
+# Define a function to read selected features on the study area grid
+def read_features(input_feature, where_clause, input_projection, study_dataset):
+    """
+    Description: streams the features that match a where clause and intersect the study area and projects only the selected geometries to the study area coordinate system in memory
+    Inputs: input_feature -- path to a feature class or a single layer vector dataset
+            where_clause -- a SQL query that defines the selected features, or an empty string to select all features
+            input_projection -- the EPSG code of the input coordinate system
+            study_dataset -- an open rasterio dataset of the study area raster
+    Returned Value: Returns a tuple of a list of projected geometries and an array of their bounds
+    Preconditions: requires fiona 1.9 or later for attribute filters
+    """
+
+    # Import packages
+    import fiona
+    import numpy as np
+    from rasterio.warp import transform_bounds
+    from rasterio.warp import transform_geom
+
+    # Define the input coordinate system and the study area bounds in that coordinate system
+    input_crs = f'EPSG:{input_projection}'
+    filter_bounds = transform_bounds(study_dataset.crs, input_crs, *study_dataset.bounds, densify_pts=21)
+
+    # Project the selected geometries that intersect the study area
+    dataset_path, layer_name = split_feature_path(input_feature)
+    geometries = []
+    with fiona.open(dataset_path, layer=layer_name) as feature_collection:
+        for feature in feature_collection.filter(bbox=filter_bounds, where=where_clause or None):
+            if feature['geometry'] is None:
+                continue
+            geometry = getattr(feature['geometry'], '__geo_interface__', feature['geometry'])
+            geometries.append(transform_geom(input_crs, study_dataset.crs, geometry))
+    bounds_array = np.array([geometry_bounds(geometry) for geometry in geometries]).reshape(-1, 4)
+    return geometries, bounds_array
+
+# Define a function to burn features into a raster block
+def burn_blocks(input_blocks, study_block, window_transform, geometries, bounds_array, coverage_fraction, supersample):
+    """
+    Description: burns the geometries that intersect a block into a mask or into the percent of each cell covered by the geometries
+    Inputs: input_blocks -- an empty list of input blocks
+            study_block -- a boolean block that is True within the study area
+            window_transform -- the affine transform of the block
+            geometries -- a list of geometries in the study area coordinate system
+            bounds_array -- an array of the bounds of the geometries
+            coverage_fraction -- if True, the output is the percent of each cell covered by the geometries, otherwise one where cell centers are covered
+            supersample -- the number of sub-cell rows and columns per cell used to calculate the percent coverage
+    Returned Value: Returns a masked output block
+    Preconditions: this function is called by process_raster_blocks
+    """
+
+    # Import packages
+    from affine import Affine
+    import numpy as np
+    from rasterio.features import rasterize
+
+    # Select the geometries that intersect the block
+    height, width = study_block.shape
+    left, top = window_transform * (0, 0)
+    right, bottom = window_transform * (width, height)
+    selected = ((bounds_array[:, 0] <= max(left, right)) & (bounds_array[:, 2] >= min(left, right))
+                & (bounds_array[:, 1] <= max(top, bottom)) & (bounds_array[:, 3] >= min(top, bottom)))
+    shapes = [(geometries[index], 1) for index in np.flatnonzero(selected)]
+
+    # Burn the geometries at cell centers
+    output_block = np.zeros((height, width), dtype='uint8')
+    if shapes and not coverage_fraction:
+        output_block = rasterize(shapes, out_shape=(height, width), transform=window_transform, fill=0, dtype='uint8')
+    # Burn the geometries at sub-cell centers in row strips and convert the sub-cell counts to percent coverage
+    elif shapes:
+        strip_rows = max(1, 16777216 // (width * supersample * supersample))
+        for row_off in range(0, height, strip_rows):
+            rows = min(strip_rows, height - row_off)
+            strip_transform = window_transform * Affine.translation(0, row_off) * Affine.scale(1 / supersample)
+            subcell_strip = rasterize(shapes,
+                                      out_shape=(rows * supersample, width * supersample),
+                                      transform=strip_transform,
+                                      fill=0,
+                                      dtype='uint8')
+            subcell_count = subcell_strip.reshape(rows, supersample, width, supersample).sum(axis=(1, 3))
+            output_block[row_off:row_off + rows] = np.rint(subcell_count * 100 / supersample ** 2)
+    return np.ma.masked_array(output_block, mask=~study_block)
+
+# Define a function to convert selected features to raster
+def rasterize_features(study_area, input_feature, output_raster, where_clause, input_projection, value_type, no_data,
+                       geographic_transformation='', coverage_fraction=False, supersample=10, block_size=2048):
+    """
+    Description: converts the features selected by a where clause to a raster on the study area grid where cells covered by features are one and other cells within the study area are zero, or optionally the percent of each cell covered by features
+    Inputs: study_area -- path to the study area raster that defines the grid, extent, cell size, and output coordinate system
+            input_feature -- path to the input feature class
+            output_raster -- path to the output raster
+            where_clause -- a SQL query that defines the selected features, or an empty string to select all features
+            input_projection -- the EPSG code of the input coordinate system
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            geographic_transformation -- not used by the numpy backend, which selects the transformation with PROJ
+            coverage_fraction -- if True, the output is the percent of each cell covered by features (optional, default is False)
+            supersample -- the number of sub-cell rows and columns per cell used to calculate the percent coverage (optional, default is 10)
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires fiona 1.9 or later and the selected geometries must fit in memory
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+    import rasterio
+
+    # Read and project the selected features
+    with rasterio.open(study_area) as study_dataset:
+        geometries, bounds_array = read_features(input_feature, where_clause, input_projection, study_dataset)
+
+    # Burn the features into each block of the study area grid
+    return process_raster_blocks(burn_blocks,
+                                 study_area,
+                                 [],
+                                 output_raster,
+                                 value_type,
+                                 no_data,
+                                 block_size,
+                                 pass_transform=True,
+                                 geometries=geometries,
+                                 bounds_array=bounds_array,
+                                 coverage_fraction=coverage_fraction,
+                                 supersample=supersample)
+
+# Define a function to copy a raster to a value type and no data value
+def copy_raster(input_raster, output_raster, value_type, no_data, block_size=2048):
+    """
+    Description: copies a raster to a GeoTIFF with a new value type and no data value
+    Inputs: input_raster -- path to the input raster
+            output_raster -- path to the output raster
+            value_type -- the output raster value type
+            no_data -- the output raster no data value
+            block_size -- the number of rows and columns processed per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: requires an existing raster
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterExpression import evaluate_expression
+    from package_GeospatialProcessing.rasterExpression import open_raster
+
+    # Copy block by block on the grid of the input raster
+    return evaluate_expression(open_raster(input_raster),
+                               input_raster,
+                               output_raster,
+                               value_type,
+                               no_data,
+                               block_size)
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Raster block processing
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Raster block processing" is a set of functions that stream aligned windows from input rasters snapped to a study area raster, apply a per-block function, and write each block to one or more output GeoTIFFs that replace the previous outputs only when they are complete, with reading, computing, and writing overlapped in a bounded pipeline of threads.
+# ---------------------------------------------------------------------------
+
+# Define a function to convert an Esri raster value type to a numpy data type
+def get_data_type(value_type):
+    """
+    Description: converts an Esri raster value type to a numpy data type
+    Inputs: value_type -- an Esri raster value type string (e.g., '16_BIT_SIGNED')
+    Returned Value: Returns a numpy data type string
+    Preconditions: value type must be an 8, 16, 32, or 64 bit value type
+    """
+
+    # Define data types for raster value types
+    data_types = {'8_BIT_UNSIGNED': 'uint8',
+                  '8_BIT_SIGNED': 'int8',
+                  '16_BIT_UNSIGNED': 'uint16',
+                  '16_BIT_SIGNED': 'int16',
+                  '32_BIT_UNSIGNED': 'uint32',
+                  '32_BIT_SIGNED': 'int32',
+                  '32_BIT_FLOAT': 'float32',
+                  '64_BIT': 'float64'}
+    return data_types[value_type]
+
+# Define a function to determine the value type and no data value of a raster
+def get_raster_properties(input_raster, use_statistics=True):
+    """
+    Description: determines the Esri value type and no data value of a raster
+    Inputs: input_raster -- path to a raster dataset
+            use_statistics -- if True, the properties are read from a current statistics sidecar when one exists (optional, default is True)
+    Returned Value: Returns a tuple of the value type string and the no data value
+    Preconditions: requires an existing raster dataset
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterStatistics import read_raster_statistics
+    import rasterio
+
+    # Use the statistics index of the raster if it is current
+    if use_statistics:
+        statistics = read_raster_statistics(input_raster, calculate=False)
+        if statistics is not None:
+            return statistics['value_type'], statistics['no_data']
+
+    # Define raster value types for data types
+    value_types = {'uint8': '8_BIT_UNSIGNED',
+                   'int8': '8_BIT_SIGNED',
+                   'uint16': '16_BIT_UNSIGNED',
+                   'int16': '16_BIT_SIGNED',
+                   'uint32': '32_BIT_UNSIGNED',
+                   'int32': '32_BIT_SIGNED',
+                   'float32': '32_BIT_FLOAT',
+                   'float64': '64_BIT'}
+
+    # Read the data type and no data value of the first band
+    with rasterio.open(input_raster) as raster_dataset:
+        value_type = value_types[raster_dataset.dtypes[0]]
+        no_data = raster_dataset.nodata
+    return value_type, no_data
+
+# Define a function to iterate through block windows of a grid
+def iterate_blocks(width, height, block_size):
+    """
+    Description: generates row-major block windows that cover a grid
+    Inputs: width -- the number of columns in the grid
+            height -- the number of rows in the grid
+            block_size -- the number of rows and columns in each block
+    Returned Value: Yields rasterio windows
+    Preconditions: block size must be a positive integer
+    """
+
+    # Import packages
+    from rasterio.windows import Window
+
+    # Yield windows in row-major order
+    for row_off in range(0, height, block_size):
+        for col_off in range(0, width, block_size):
+            yield Window(col_off,
+                         row_off,
+                         min(block_size, width - col_off),
+                         min(block_size, height - row_off))
+
+# Define a function to open a raster aligned to the study area grid
+def open_aligned(input_raster, study_dataset):
+    """
+    Description: opens a raster so that its windows match the windows of the study area grid
+    Inputs: input_raster -- path to a raster dataset
+            study_dataset -- an open rasterio dataset of the study area raster
+    Returned Value: Returns an open rasterio dataset or warped virtual dataset snapped to the study area grid
+    Preconditions: the returned dataset and its source dataset must be closed by the caller
+    """
+
+    # Import packages
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.vrt import WarpedVRT
+
+    # Return the dataset directly if it already shares the study area grid
+    input_dataset = rasterio.open(input_raster)
+    if (input_dataset.crs == study_dataset.crs
+            and input_dataset.transform == study_dataset.transform
+            and input_dataset.shape == study_dataset.shape):
+        return input_dataset
+    # Otherwise snap the dataset to the study area grid with nearest neighbor resampling
+    return WarpedVRT(input_dataset,
+                     crs=study_dataset.crs,
+                     transform=study_dataset.transform,
+                     width=study_dataset.width,
+                     height=study_dataset.height,
+                     resampling=Resampling.nearest)
+
+# Define a function to write an output raster through a unique temporary file
+def temporary_output(output_raster):
+    """
+    Description: provides a unique temporary path next to an output raster and replaces the output with the temporary raster only after it is completely written, so that concurrent or failed runs never leave partial outputs
+    Inputs: output_raster -- path to the output raster
+    Returned Value: Returns a context manager that yields the temporary raster path
+    Preconditions: the temporary raster must be closed before the context exits
+    """
+
+    # Import packages
+    import contextlib
+    import os
+    import uuid
+
+    @contextlib.contextmanager
+    def temporary_context():
+        output_base, output_extension = os.path.splitext(os.path.abspath(output_raster))
+        temporary_raster = f'{output_base}.{os.getpid()}_{uuid.uuid4().hex[:8]}.tmp{output_extension}'
+        try:
+            yield temporary_raster
+            os.replace(temporary_raster, output_raster)
+        finally:
+            if os.path.exists(temporary_raster):
+                os.remove(temporary_raster)
+    return temporary_context()
+
+# Define the environment variable that stores the block pipeline settings so that worker processes inherit them
+PIPELINE_VARIABLE = 'GEOPROCESSING_BLOCK_PIPELINE'
+
+# Define a function to set the block pipeline
+def set_block_pipeline(queue_depth=2, read_workers=1, compute_workers=1):
+    """
+    Description: sets the number of blocks queued between the read, compute, and write stages of process_raster_blocks and the number of threads that read and compute blocks in this process and in worker processes started afterwards
+    Inputs: queue_depth -- the number of blocks that each stage may run ahead of the next stage (optional, default is 2)
+            read_workers -- the number of threads that read input blocks (optional, default is 1)
+            compute_workers -- the number of threads that apply the block function (optional, default is 1)
+    Returned Value: Returns a dictionary of the pipeline settings
+    Preconditions: the block function must be safe to call from several threads if compute workers is more than one
+    """
+
+    # Import packages
+    import json
+    import os
+
+    # Store the pipeline settings in the environment
+    pipeline = {'queue_depth': int(queue_depth),
+                'read_workers': int(read_workers),
+                'compute_workers': int(compute_workers)}
+    if min(pipeline.values()) < 1:
+        raise ValueError('Queue depth and worker counts must be at least one.')
+    os.environ[PIPELINE_VARIABLE] = json.dumps(pipeline)
+    return pipeline
+
+# Define a function to get the block pipeline
+def get_block_pipeline():
+    """
+    Description: reads the block pipeline settings
+    Inputs: none
+    Returned Value: Returns a dictionary of the queue depth, read workers, and compute workers
+    Preconditions: none
+    """
+
+    # Import packages
+    import json
+    import os
+
+    # Read the settings set by set_block_pipeline, otherwise the defaults
+    pipeline = {'queue_depth': 2, 'read_workers': 1, 'compute_workers': 1}
+    if os.environ.get(PIPELINE_VARIABLE):
+        pipeline.update(json.loads(os.environ[PIPELINE_VARIABLE]))
+    return pipeline
+
+# Define a function to close a raster opened to the study area grid
+def close_aligned(input_dataset):
+    """
+    Description: closes a dataset returned by open_aligned and its source dataset
+    Inputs: input_dataset -- an open rasterio dataset or warped virtual dataset
+    Returned Value: none
+    Preconditions: none
+    """
+
+    # Close the virtual dataset before its source dataset
+    source_dataset = getattr(input_dataset, 'src_dataset', None)
+    input_dataset.close()
+    if source_dataset is not None:
+        source_dataset.close()
+
+# Define a function to process aligned raster blocks
+def process_raster_blocks(block_function, study_area, input_rasters, output_raster, value_type, no_data,
+                          block_size=2048, pass_transform=False, **function_kwargs):
+    """
+    Description: applies a block function to aligned windows of input rasters and writes each block to one or more output rasters in a pipeline where reading the next blocks, computing the current block, and compressing and writing the previous blocks overlap
+    Inputs: block_function -- a function that receives a list of masked input blocks, a boolean study area block, and function_kwargs, and returns a masked output block, or a list of masked output blocks if there are multiple output rasters
+            study_area -- path to the study area raster that defines the grid, extent, and cell size
+            input_rasters -- a list of input raster paths
+            output_raster -- path to the output GeoTIFF, or a list of paths to output GeoTIFFs that share the value type and no data value
+            value_type -- the output raster value type (e.g., '16_BIT_SIGNED')
+            no_data -- the output raster no data value
+            block_size -- the number of rows and columns read and written per block
+            pass_transform -- if True, the affine transform of each block window is passed to the block function as window_transform (optional, default is False)
+            **function_kwargs -- key word arguments passed to the block function
+    Returned Value: Returns the number of blocks written, stores a statistics sidecar for each output raster, and reports the time spent in each stage and the throughput
+    Preconditions: input rasters must overlap the study area raster; the queue depth and worker counts are set by set_block_pipeline
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterStatistics import create_statistics
+    from package_GeospatialProcessing.rasterStatistics import update_statistics
+    from package_GeospatialProcessing.rasterStatistics import write_raster_statistics
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    import contextlib
+    import numpy as np
+    import queue
+    import rasterio
+    import threading
+    import time
+    from rasterio.windows import transform as get_window_transform
+
+    # Define output data type and no data value
+    data_type = get_data_type(value_type)
+    no_data = np.dtype(data_type).type(float(no_data)).item()
+    pipeline = get_block_pipeline()
+    queue_depth = pipeline['queue_depth']
+    output_rasters = output_raster if isinstance(output_raster, (list, tuple)) else [output_raster]
+    stage = start_stage('process_raster_blocks', output=output_rasters[0], **pipeline)
+    stage_times = {'read_time': 0.0, 'compute_time': 0.0, 'write_time': 0.0}
+
+    # Define the output profile from the study area grid
+    with rasterio.open(study_area) as study_dataset:
+        study_transform = study_dataset.transform
+        study_width = study_dataset.width
+        study_height = study_dataset.height
+        output_profile = study_dataset.profile.copy()
+    output_profile.update(driver='GTiff',
+                          dtype=data_type,
+                          nodata=no_data,
+                          count=1,
+                          compress='lzw',
+                          tiled=True,
+                          blockxsize=256,
+                          blockysize=256,
+                          BIGTIFF='IF_SAFER')
+    output_statistics = [create_statistics(value_type, no_data, study_width, study_height)
+                         for output_path in output_rasters]
+
+    # Read a block with datasets that belong to the reading thread, because datasets cannot be shared between threads
+    reader_state = threading.local()
+    reader_datasets = []
+    reader_lock = threading.Lock()
+
+    def read_block(window):
+        read_start = time.perf_counter()
+        if not hasattr(reader_state, 'datasets'):
+            study_reader = rasterio.open(study_area)
+            input_readers = []
+            with reader_lock:
+                reader_datasets.append((study_reader, input_readers))
+            for input_raster in input_rasters:
+                input_readers.append(open_aligned(input_raster, study_reader))
+            reader_state.datasets = (study_reader, input_readers)
+        study_reader, input_readers = reader_state.datasets
+        study_block = study_reader.read_masks(1, window=window) > 0
+        input_blocks = [input_reader.read(1, window=window, masked=True) for input_reader in input_readers]
+        return study_block, input_blocks, time.perf_counter() - read_start
+
+    # Apply the block function to a block once it is read and convert the outputs to filled blocks
+    def compute_block(window, read_future):
+        study_block, input_blocks, read_time = read_future.result()
+        compute_start = time.perf_counter()
+        block_kwargs = dict(function_kwargs)
+        if pass_transform:
+            block_kwargs['window_transform'] = get_window_transform(window, study_transform)
+        output_blocks = block_function(input_blocks, study_block, **block_kwargs)
+        if not isinstance(output_raster, (list, tuple)):
+            output_blocks = [output_blocks]
+        output_blocks = [np.ma.filled(np.ma.asarray(output_block).astype(data_type), no_data)
+                         for output_block in output_blocks]
+        return output_blocks, read_time, time.perf_counter() - compute_start
+
+    # Write blocks in order in a single thread and keep draining the queue after a failure so that the pipeline never stalls
+    write_queue = queue.Queue(maxsize=queue_depth)
+    write_errors = []
+
+    def write_blocks(output_datasets):
+        while True:
+            queue_item = write_queue.get()
+            if queue_item is None:
+                return
+            if write_errors:
+                continue
+            window, output_blocks = queue_item
+            write_start = time.perf_counter()
+            try:
+                for output_dataset, statistics, output_block in zip(output_datasets,
+                                                                    output_statistics,
+                                                                    output_blocks):
+                    output_dataset.write(output_block, 1, window=window)
+                    # Index the block as it will be read from the output
+                    no_data_block = (output_block == no_data) if no_data == no_data else np.isnan(output_block)
+                    update_statistics(statistics, np.ma.masked_array(output_block, mask=no_data_block))
+            except Exception as write_error:
+                write_errors.append(write_error)
+            stage_times['write_time'] += time.perf_counter() - write_start
+
+    # Pass a completed block to the writer
+    def queue_block(window, compute_future):
+        output_blocks, read_time, compute_time = compute_future.result()
+        stage_times['read_time'] += read_time
+        stage_times['compute_time'] += compute_time
+        write_queue.put((window, output_blocks))
+        if write_errors:
+            raise write_errors[0]
+
+    # Open a temporary dataset for each output
+    block_count = 0
+    try:
+        with contextlib.ExitStack() as output_stack:
+            output_datasets = []
+            for output_path in output_rasters:
+                temporary_raster = output_stack.enter_context(temporary_output(output_path))
+                output_datasets.append(output_stack.enter_context(rasterio.open(temporary_raster, 'w',
+                                                                                **output_profile)))
+            writer_thread = threading.Thread(target=write_blocks, args=(output_datasets,), daemon=True)
+            writer_thread.start()
+            compute_futures = deque()
+            try:
+                # Stream each block from the readers through the compute workers to the writer with bounded queues
+                with ThreadPoolExecutor(max_workers=pipeline['read_workers']) as read_pool, \
+                        ThreadPoolExecutor(max_workers=pipeline['compute_workers']) as compute_pool:
+                    try:
+                        for window in iterate_blocks(study_width, study_height, block_size):
+                            read_future = read_pool.submit(read_block, window)
+                            compute_futures.append((window, compute_pool.submit(compute_block, window, read_future)))
+                            block_count += 1
+                            if len(compute_futures) > queue_depth:
+                                queue_block(*compute_futures.popleft())
+                        while compute_futures:
+                            queue_block(*compute_futures.popleft())
+                    finally:
+                        for window, compute_future in compute_futures:
+                            compute_future.cancel()
+            finally:
+                write_queue.put(None)
+                writer_thread.join()
+            if write_errors:
+                raise write_errors[0]
+        # Store the statistics of the completed outputs
+        for output_path, statistics in zip(output_rasters, output_statistics):
+            write_raster_statistics(output_path, statistics)
+    except BaseException:
+        end_stage(stage, status='failed', report=False)
+        raise
+    finally:
+        for study_reader, input_readers in reader_datasets:
+            for input_reader in input_readers:
+                close_aligned(input_reader)
+            study_reader.close()
+
+    # Report the time spent in each stage and the throughput
+    stage['attributes'].update({name: round(value, 6) for name, value in stage_times.items()})
+    stage_record = end_stage(stage, report=False)
+    megapixels = study_width * study_height * len(output_rasters) / 1e6
+    throughput = megapixels / stage_record['wall_time'] if stage_record['wall_time'] > 0 else 0
+    print(f'\tStreamed {block_count} blocks at {throughput:.1f} megapixels per second '
+          f'(read {stage_times["read_time"]:.1f} s, compute {stage_times["compute_time"]:.1f} s, '
+          f'write {stage_times["write_time"]:.1f} s, elapsed {stage_record["wall_time"]:.1f} s).')
+    return block_count
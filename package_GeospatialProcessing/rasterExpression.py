@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Raster expression
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Raster expression" is a lazy raster algebra where operations on rasters build an expression graph instead of intermediate rasters. The whole graph is evaluated block by block in one pass on the study area grid so that each input raster is read once per block and only the final output is written.
+# ---------------------------------------------------------------------------
+
+# Define a class for a node of a lazy raster expression
+class RasterExpression(object):
+    """
+    Description: a node of a lazy raster expression that records an operation and its arguments; arithmetic, comparison, and logical operators return new nodes
+    Inputs: operation -- the name of the operation
+            arguments -- a tuple of argument nodes or constants
+            parameters -- a dictionary of parameters of the operation (optional)
+    Preconditions: nodes should be created with open_raster, study_area_mask, and the expression functions
+    """
+
+    def __init__(self, operation, arguments=(), parameters=None):
+        self.operation = operation
+        self.arguments = tuple(arguments)
+        self.parameters = parameters or {}
+
+    # Define arithmetic operators
+    def __add__(self, other):
+        return RasterExpression('add', (self, other))
+
+    def __radd__(self, other):
+        return RasterExpression('add', (other, self))
+
+    def __sub__(self, other):
+        return RasterExpression('subtract', (self, other))
+
+    def __rsub__(self, other):
+        return RasterExpression('subtract', (other, self))
+
+    def __mul__(self, other):
+        return RasterExpression('multiply', (self, other))
+
+    def __rmul__(self, other):
+        return RasterExpression('multiply', (other, self))
+
+    def __truediv__(self, other):
+        return RasterExpression('divide', (self, other))
+
+    def __rtruediv__(self, other):
+        return RasterExpression('divide', (other, self))
+
+    # Define comparison operators
+    def __lt__(self, other):
+        return RasterExpression('less', (self, other))
+
+    def __le__(self, other):
+        return RasterExpression('less_equal', (self, other))
+
+    def __gt__(self, other):
+        return RasterExpression('greater', (self, other))
+
+    def __ge__(self, other):
+        return RasterExpression('greater_equal', (self, other))
+
+    def __eq__(self, other):
+        return RasterExpression('equal', (self, other))
+
+    def __ne__(self, other):
+        return RasterExpression('not_equal', (self, other))
+
+    # Define logical operators
+    def __and__(self, other):
+        return RasterExpression('logical_and', (self, other))
+
+    def __or__(self, other):
+        return RasterExpression('logical_or', (self, other))
+
+    def __invert__(self):
+        return RasterExpression('logical_not', (self,))
+
+    # Nodes are compared by identity so that they can be used as dictionary keys
+    __hash__ = object.__hash__
+
+    # Define methods for the common null and type operations
+    def isnull(self):
+        return isnull(self)
+
+    def fill_null(self, value):
+        return fill_null(self, value)
+
+    def mask(self, mask_expression):
+        return mask(self, mask_expression)
+
+    def isin(self, values):
+        return isin(self, values)
+
+    def clip(self, minimum_value=None, maximum_value=None):
+        return clip(self, minimum_value, maximum_value)
+
+    def astype(self, data_type):
+        return RasterExpression('astype', (self,), {'data_type': data_type})
+
+    def inputs(self):
+        return get_expression_inputs(self)
+
+    def evaluate(self, study_area, output_raster, value_type, no_data, block_size=2048):
+        return evaluate_expression(self, study_area, output_raster, value_type, no_data, block_size)
+
+# Define a function to create an input raster node
+def open_raster(input_raster):
+    """
+    Description: creates an expression node that reads a raster on the study area grid
+    Inputs: input_raster -- path to a raster dataset
+    Returned Value: Returns a raster expression
+    Preconditions: the raster is only read when the expression is evaluated
+    """
+
+    # Import packages
+    import os
+
+    # Normalize the path so that repeated references share one input
+    return RasterExpression('raster', parameters={'path': os.path.normpath(input_raster)})
+
+# Define a function to create a study area mask node
+def study_area_mask():
+    """
+    Description: creates an expression node for the study area of the evaluation grid, which has data inside the study area and is null outside
+    Inputs: none
+    Returned Value: Returns a raster expression
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('study_area_mask')
+
+# Define a function to identify null cells
+def isnull(expression):
+    """
+    Description: creates an expression that is true where a raster is null, as in the IsNull tool
+    Inputs: expression -- a raster expression
+    Returned Value: Returns a raster expression without null cells
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('isnull', (expression,))
+
+# Define a function to replace null cells with a value
+def fill_null(expression, value):
+    """
+    Description: creates an expression that replaces the null cells of a raster with a value
+    Inputs: expression -- a raster expression
+            value -- the value assigned to null cells
+    Returned Value: Returns a raster expression without null cells
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('fill_null', (expression,), {'value': value})
+
+# Define a function to extract a raster to a mask
+def mask(expression, mask_expression):
+    """
+    Description: creates an expression that sets cells of a raster to null where a mask is null, as in the Extract by Mask tool
+    Inputs: expression -- a raster expression
+            mask_expression -- a raster expression of the mask
+    Returned Value: Returns a raster expression
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('mask', (expression, mask_expression))
+
+# Define a function to select values by a condition
+def where(condition, true_value, false_value=None):
+    """
+    Description: creates an expression that selects values by a condition, as in the Con tool, where cells are null where the condition is null or the selected value is null
+    Inputs: condition -- a boolean raster expression
+            true_value -- a raster expression or constant selected where the condition is true
+            false_value -- a raster expression or constant selected where the condition is false (optional, default is null)
+    Returned Value: Returns a raster expression
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('where', (condition, true_value, false_value))
+
+# Define a function to test membership in a set of values
+def isin(expression, values):
+    """
+    Description: creates an expression that is true where a raster value is one of a set of values
+    Inputs: expression -- a raster expression
+            values -- a list of values
+    Returned Value: Returns a boolean raster expression that is null where the raster is null
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('isin', (expression,), {'values': list(values)})
+
+# Define a function to mosaic rasters
+def mosaic(*expressions, method='minimum'):
+    """
+    Description: creates an expression that merges overlapping rasters by a mosaic operator, where only cells with data are merged
+    Inputs: *expressions -- raster expressions in mosaic order
+            method -- the mosaic operator: 'minimum', 'maximum', 'first', 'last', or 'mean' (optional, default is 'minimum')
+    Returned Value: Returns a raster expression that is null where all rasters are null
+    Preconditions: none
+    """
+
+    # Check the mosaic operator
+    method = method.lower()
+    if method not in ['minimum', 'maximum', 'first', 'last', 'mean']:
+        raise ValueError('Mosaic method must be minimum, maximum, first, last, or mean.')
+    # Create the node
+    return RasterExpression('mosaic', expressions, {'method': method})
+
+# Define a function to calculate the minimum of rasters
+def minimum(*expressions):
+    """
+    Description: creates an expression of the minimum of the cells with data of multiple rasters, as in a mosaic with the minimum operator
+    Inputs: *expressions -- raster expressions
+    Returned Value: Returns a raster expression that is null where all rasters are null
+    Preconditions: none
+    """
+
+    # Create the node
+    return mosaic(*expressions, method='minimum')
+
+# Define a function to calculate the maximum of rasters
+def maximum(*expressions):
+    """
+    Description: creates an expression of the maximum of the cells with data of multiple rasters, as in a mosaic with the maximum operator
+    Inputs: *expressions -- raster expressions
+    Returned Value: Returns a raster expression that is null where all rasters are null
+    Preconditions: none
+    """
+
+    # Create the node
+    return mosaic(*expressions, method='maximum')
+
+# Define a function to sum rasters into one accumulator
+def accumulate(*expressions, data_type='int64'):
+    """
+    Description: creates an expression of the sum of multiple rasters with null cells treated as zero, where each raster is added in place to a single accumulator
+    Inputs: *expressions -- raster expressions
+            data_type -- the numpy data type of the accumulator (optional, default is int64)
+    Returned Value: Returns a raster expression without null cells
+    Preconditions: the accumulator data type must hold the sum
+    """
+
+    # Create the node
+    return RasterExpression('accumulate', expressions, {'data_type': data_type})
+
+# Define a function to limit raster values to a range
+def clip(expression, minimum_value=None, maximum_value=None):
+    """
+    Description: creates an expression that limits the values of a raster to a range
+    Inputs: expression -- a raster expression
+            minimum_value -- the lowest value of the output (optional)
+            maximum_value -- the highest value of the output (optional)
+    Returned Value: Returns a raster expression
+    Preconditions: none
+    """
+
+    # Create the node
+    return RasterExpression('clip', (expression,), {'minimum_value': minimum_value, 'maximum_value': maximum_value})
+
+# Define a function to list the input rasters of an expression
+def get_expression_inputs(expression):
+    """
+    Description: lists the distinct input rasters of an expression in the order they are first referenced
+    Inputs: expression -- a raster expression
+    Returned Value: Returns a list of raster paths
+    Preconditions: none
+    """
+
+    # Visit each node once
+    input_rasters = []
+    visited = set()
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, RasterExpression) or id(node) in visited:
+            continue
+        visited.add(id(node))
+        if node.operation == 'raster' and node.parameters['path'] not in input_rasters:
+            input_rasters.append(node.parameters['path'])
+        pending.extend(reversed(node.arguments))
+    return input_rasters
+
+# Define a function to evaluate an expression for a block
+def evaluate_block(expression, input_blocks, study_block):
+    """
+    Description: evaluates an expression for one block, computing each node once
+    Inputs: expression -- a raster expression
+            input_blocks -- a dictionary of masked input blocks by raster path
+            study_block -- a boolean block that is true inside the study area
+    Returned Value: Returns a masked block
+    Preconditions: input blocks must include every input of the expression
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Define functions for binary operations
+    binary_functions = {'add': np.ma.add,
+                        'subtract': np.ma.subtract,
+                        'multiply': np.ma.multiply,
+                        'divide': np.ma.true_divide,
+                        'less': np.ma.less,
+                        'less_equal': np.ma.less_equal,
+                        'greater': np.ma.greater,
+                        'greater_equal': np.ma.greater_equal,
+                        'equal': np.ma.equal,
+                        'not_equal': np.ma.not_equal,
+                        'logical_and': np.ma.logical_and,
+                        'logical_or': np.ma.logical_or}
+
+    # Define a function to convert a constant to a block
+    def as_block(value):
+        if np.ma.isMaskedArray(value):
+            return value
+        return np.ma.masked_array(np.full(study_block.shape, value), mask=np.zeros(study_block.shape, dtype=bool))
+
+    # Count the references to each node so that only the results of shared nodes are kept
+    reference_counts = {}
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, RasterExpression):
+            continue
+        reference_counts[id(node)] = reference_counts.get(id(node), 0) + 1
+        if reference_counts[id(node)] == 1:
+            pending.extend(node.arguments)
+
+    # Evaluate nodes after their arguments and release shared results after their last reference
+    results = {}
+
+    def evaluate_node(node):
+        if not isinstance(node, RasterExpression):
+            return node
+        if id(node) in results:
+            result = results[id(node)]
+            reference_counts[id(node)] -= 1
+            if reference_counts[id(node)] == 1:
+                del results[id(node)]
+            return result
+        operation = node.operation
+        if operation == 'accumulate':
+            # Add each argument to the accumulator as soon as it is evaluated so that argument blocks are not held together
+            result = np.zeros(study_block.shape, dtype=node.parameters['data_type'])
+            for argument in node.arguments:
+                np.add(result, np.ma.filled(as_block(evaluate_node(argument)), 0), out=result, casting='unsafe')
+            result = np.ma.masked_array(result)
+            if reference_counts[id(node)] > 1:
+                results[id(node)] = result
+            return result
+        if operation == 'mosaic':
+            # Merge each argument into the result as soon as it is evaluated so that argument blocks are not held together
+            method = node.parameters['method']
+            result_data = None
+            for argument in (node.arguments[::-1] if method == 'last' else node.arguments):
+                argument_block = as_block(evaluate_node(argument))
+                argument_data = np.ma.getdata(argument_block)
+                argument_missing = np.ma.getmaskarray(argument_block)
+                if result_data is None:
+                    if method == 'mean':
+                        result_data = np.where(argument_missing, 0, argument_data).astype('float64')
+                        data_count = (~argument_missing).astype('int32')
+                    else:
+                        result_data = argument_data.copy()
+                    result_missing = argument_missing.copy()
+                    continue
+                if method == 'mean':
+                    np.add(result_data, np.where(argument_missing, 0, argument_data), out=result_data)
+                    data_count += ~argument_missing
+                else:
+                    result_data = result_data.astype(np.result_type(result_data, argument_data), copy=False)
+                    if method == 'minimum':
+                        replace_cells = ~argument_missing & (result_missing | (argument_data < result_data))
+                    elif method == 'maximum':
+                        replace_cells = ~argument_missing & (result_missing | (argument_data > result_data))
+                    else:
+                        replace_cells = ~argument_missing & result_missing
+                    np.copyto(result_data, argument_data, where=replace_cells)
+                result_missing &= argument_missing
+            if method == 'mean':
+                result_data /= np.maximum(data_count, 1)
+            result = np.ma.masked_array(result_data, mask=result_missing)
+            if reference_counts[id(node)] > 1:
+                results[id(node)] = result
+            return result
+        arguments = [evaluate_node(argument) for argument in node.arguments]
+        if operation == 'raster':
+            result = input_blocks[node.parameters['path']]
+        elif operation == 'study_area_mask':
+            result = np.ma.masked_array(np.ones(study_block.shape, dtype=bool), mask=~study_block)
+        elif operation in binary_functions:
+            result = binary_functions[operation](as_block(arguments[0]), as_block(arguments[1]))
+        elif operation == 'logical_not':
+            result = np.ma.logical_not(as_block(arguments[0]))
+        elif operation == 'isnull':
+            result = np.ma.masked_array(np.ma.getmaskarray(as_block(arguments[0])).copy())
+        elif operation == 'fill_null':
+            result = np.ma.masked_array(np.ma.filled(as_block(arguments[0]), node.parameters['value']))
+        elif operation == 'astype':
+            result = as_block(arguments[0]).astype(node.parameters['data_type'])
+        elif operation == 'mask':
+            value_block = as_block(arguments[0])
+            result = np.ma.masked_array(np.ma.getdata(value_block),
+                                        mask=np.ma.getmaskarray(value_block) | np.ma.getmaskarray(as_block(arguments[1])))
+        elif operation == 'isin':
+            value_block = as_block(arguments[0])
+            result = np.ma.masked_array(np.isin(np.ma.getdata(value_block), node.parameters['values']),
+                                        mask=np.ma.getmaskarray(value_block))
+        elif operation == 'where':
+            condition_block = as_block(arguments[0])
+            condition = np.ma.filled(condition_block, False).astype(bool)
+            true_block = as_block(arguments[1])
+            if arguments[2] is None:
+                false_data = np.zeros(study_block.shape, dtype=np.ma.getdata(true_block).dtype)
+                false_mask = np.ones(study_block.shape, dtype=bool)
+            else:
+                false_block = as_block(arguments[2])
+                false_data = np.ma.getdata(false_block)
+                false_mask = np.ma.getmaskarray(false_block)
+            result = np.ma.masked_array(np.where(condition, np.ma.getdata(true_block), false_data),
+                                        mask=(np.ma.getmaskarray(condition_block)
+                                              | np.where(condition, np.ma.getmaskarray(true_block), false_mask)))
+        elif operation == 'clip':
+            value_block = as_block(arguments[0])
+            result = value_block
+            if node.parameters['minimum_value'] is not None or node.parameters['maximum_value'] is not None:
+                result = np.ma.masked_array(np.clip(np.ma.getdata(value_block),
+                                                    node.parameters['minimum_value'],
+                                                    node.parameters['maximum_value']),
+                                            mask=np.ma.getmaskarray(value_block))
+        else:
+            raise ValueError(f'Unknown raster expression operation {operation}.')
+        if reference_counts[id(node)] > 1:
+            results[id(node)] = result
+        return result
+    return as_block(evaluate_node(expression))
+
+# Define a block function to evaluate an expression
+def expression_blocks(input_blocks, study_block, expression, expression_inputs):
+    """
+    Description: evaluates an expression for aligned input blocks
+    Inputs: input_blocks -- a list of masked input blocks in the order of the input rasters
+            study_block -- a boolean block that is true inside the study area
+            expression -- a raster expression
+            expression_inputs -- the list of input raster paths of the expression
+    Returned Value: Returns a masked output block
+    Preconditions: input blocks must share a shape
+    """
+
+    # Evaluate the expression with the blocks of each input
+    return evaluate_block(expression, dict(zip(expression_inputs, input_blocks)), study_block)
+
+# Define a function to evaluate an expression to a raster
+def evaluate_expression(expression, study_area, output_raster, value_type, no_data, block_size=2048):
+    """
+    Description: evaluates a raster expression block by block on the study area grid in a single pass and writes only the final output
+    Inputs: expression -- a raster expression
+            study_area -- path to the study area raster that defines the grid, extent, and cell size
+            output_raster -- path to the output GeoTIFF
+            value_type -- the output raster value type (e.g., '16_BIT_SIGNED')
+            no_data -- the output raster no data value
+            block_size -- the number of rows and columns read and written per block
+    Returned Value: Returns the number of blocks written
+    Preconditions: input rasters must overlap the study area raster
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+
+    # Read each distinct input once per block and evaluate the whole expression
+    input_rasters = get_expression_inputs(expression)
+    return process_raster_blocks(expression_blocks,
+                                 study_area,
+                                 input_rasters,
+                                 output_raster,
+                                 value_type,
+                                 no_data,
+                                 block_size,
+                                 expression=expression,
+                                 expression_inputs=input_rasters)
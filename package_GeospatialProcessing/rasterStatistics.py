@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Raster statistics
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Raster statistics" is a set of functions that build an index of the value type, no data value, minimum, maximum, no data count, and value histogram of a raster in a single streaming pass and store it in a sidecar file next to the raster so that later steps do not rescan the raster.
+# ---------------------------------------------------------------------------
+
+# Define the largest number of distinct values that are stored in a histogram
+MAXIMUM_HISTOGRAM_VALUES = 65536
+
+# Define a function to determine the path of the statistics sidecar of a raster
+def get_statistics_path(input_raster):
+    """
+    Description: determines the path of the statistics sidecar file of a raster
+    Inputs: input_raster -- path to a raster dataset
+    Returned Value: Returns the path of the sidecar file
+    Preconditions: none
+    """
+
+    # Append the sidecar extension to the raster name
+    return f'{input_raster}.stats.json'
+
+# Define a function to create empty raster statistics
+def create_statistics(value_type, no_data, width, height):
+    """
+    Description: creates an empty statistics record that blocks of a raster are added to
+    Inputs: value_type -- the Esri value type of the raster
+            no_data -- the no data value of the raster
+            width -- the number of columns of the raster
+            height -- the number of rows of the raster
+    Returned Value: Returns a statistics dictionary
+    Preconditions: none
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Create the record with a histogram for integer rasters
+    from package_GeospatialProcessing.rasterBlocks import get_data_type
+    integer_type = np.dtype(get_data_type(value_type)).kind in 'iu'
+    return {'value_type': value_type,
+            'no_data': None if no_data is None else float(no_data),
+            'width': width,
+            'height': height,
+            'minimum': None,
+            'maximum': None,
+            'data_count': 0,
+            'no_data_count': 0,
+            'histogram': {} if integer_type else None}
+
+# Define a function to add a block to raster statistics
+def update_statistics(statistics, block):
+    """
+    Description: adds the cells of a masked block to a statistics record
+    Inputs: statistics -- a statistics dictionary returned by create_statistics, which is updated in place
+            block -- a masked array block of the raster
+    Returned Value: Returns the statistics dictionary
+    Preconditions: none
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Count the data and no data cells
+    data_values = np.ma.asarray(block).compressed()
+    statistics['data_count'] += int(data_values.size)
+    statistics['no_data_count'] += int(np.ma.asarray(block).size - data_values.size)
+    if data_values.size == 0:
+        return statistics
+
+    # Update the minimum and maximum
+    block_minimum = data_values.min().item()
+    block_maximum = data_values.max().item()
+    if statistics['minimum'] is None or block_minimum < statistics['minimum']:
+        statistics['minimum'] = block_minimum
+    if statistics['maximum'] is None or block_maximum > statistics['maximum']:
+        statistics['maximum'] = block_maximum
+
+    # Add the value counts to the histogram until it holds more distinct values than are stored
+    histogram = statistics['histogram']
+    if histogram is None:
+        return statistics
+    if block_maximum - block_minimum < MAXIMUM_HISTOGRAM_VALUES:
+        # Offset the values in 64-bit integers so that the range of small signed types does not overflow
+        value_counts = np.bincount(data_values.astype('int64') - block_minimum)
+        block_values = np.flatnonzero(value_counts)
+        value_counts = value_counts[block_values]
+        block_values = block_values + block_minimum
+    else:
+        block_values, value_counts = np.unique(data_values, return_counts=True)
+    for value, count in zip(block_values.tolist(), value_counts.tolist()):
+        histogram[value] = histogram.get(value, 0) + count
+    if len(histogram) > MAXIMUM_HISTOGRAM_VALUES:
+        statistics['histogram'] = None
+    return statistics
+
+# Define a function to write raster statistics to a sidecar file
+def write_raster_statistics(input_raster, statistics):
+    """
+    Description: stores a statistics record in the sidecar file of a raster together with the size and modification time of the raster
+    Inputs: input_raster -- path to a raster dataset
+            statistics -- a statistics dictionary
+    Returned Value: Returns True if the sidecar file was written
+    Preconditions: the raster must be completely written
+    """
+
+    # Import packages
+    import json
+    import os
+    import uuid
+
+    # Record the state of the raster so that the sidecar is ignored after the raster changes
+    raster_state = os.stat(input_raster)
+    sidecar_record = dict(statistics, source={'size': raster_state.st_size, 'mtime_ns': raster_state.st_mtime_ns})
+    if sidecar_record['histogram'] is not None:
+        sidecar_record['histogram'] = {str(value): count for value, count in sorted(sidecar_record['histogram'].items())}
+
+    # Write the sidecar through a temporary file and skip rasters in folders that cannot be written
+    statistics_path = get_statistics_path(input_raster)
+    temporary_path = f'{statistics_path}.{os.getpid()}_{uuid.uuid4().hex[:8]}.tmp'
+    try:
+        with open(temporary_path, 'w') as statistics_file:
+            json.dump(sidecar_record, statistics_file)
+        os.replace(temporary_path, statistics_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return False
+    return True
+
+# Define a function to calculate the statistics of a raster
+def calculate_raster_statistics(input_raster, block_size=2048):
+    """
+    Description: calculates the statistics of the first band of a raster in a single streaming pass
+    Inputs: input_raster -- path to a raster dataset
+            block_size -- the number of rows and columns read per block (optional, default is 2048)
+    Returned Value: Returns a statistics dictionary
+    Preconditions: requires an existing raster dataset
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_raster_properties
+    from package_GeospatialProcessing.rasterBlocks import iterate_blocks
+    import rasterio
+
+    # Add each block of the raster to the statistics
+    value_type, no_data = get_raster_properties(input_raster, use_statistics=False)
+    with rasterio.open(input_raster) as raster_dataset:
+        statistics = create_statistics(value_type, no_data, raster_dataset.width, raster_dataset.height)
+        for window in iterate_blocks(raster_dataset.width, raster_dataset.height, block_size):
+            update_statistics(statistics, raster_dataset.read(1, window=window, masked=True))
+    return statistics
+
+# Define a function to read the statistics of a raster
+def read_raster_statistics(input_raster, calculate=True, block_size=2048):
+    """
+    Description: reads the statistics of a raster from its sidecar file if the raster has not changed since the sidecar was written, otherwise optionally calculates the statistics and writes the sidecar
+    Inputs: input_raster -- path to a raster dataset
+            calculate -- if True, statistics that are missing or out of date are calculated (optional, default is True)
+            block_size -- the number of rows and columns read per block (optional, default is 2048)
+    Returned Value: Returns a statistics dictionary with integer histogram keys, or None if the statistics are not current and are not calculated
+    Preconditions: requires an existing raster dataset
+    """
+
+    # Import packages
+    import json
+    import os
+
+    # Read the sidecar if it matches the current state of the raster
+    statistics_path = get_statistics_path(input_raster)
+    if os.path.exists(statistics_path) and os.path.exists(input_raster):
+        raster_state = os.stat(input_raster)
+        try:
+            with open(statistics_path) as statistics_file:
+                statistics = json.load(statistics_file)
+        except (OSError, ValueError):
+            statistics = None
+        if (statistics is not None
+                and statistics.get('source') == {'size': raster_state.st_size, 'mtime_ns': raster_state.st_mtime_ns}):
+            del statistics['source']
+            if statistics['histogram'] is not None:
+                statistics['histogram'] = {int(value): count for value, count in statistics['histogram'].items()}
+            return statistics
+
+    # Calculate and store the statistics
+    if not calculate:
+        return None
+    statistics = calculate_raster_statistics(input_raster, block_size)
+    write_raster_statistics(input_raster, statistics)
+    return statistics
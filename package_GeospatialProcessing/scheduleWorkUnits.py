@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Schedule work units
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation. Scripts that call the scheduler must protect their entry point with if __name__ == '__main__'.
+# Description: "Schedule work units" is a set of functions that run geoprocessing work units on a process pool in dependency order and skip work units whose outputs are current with their inputs.
+# ---------------------------------------------------------------------------
+
+# Define a function to execute a single work unit in a worker process
+def run_work_unit(geoprocessing_function, unit_kwargs, force=False):
+    """
+    Description: executes a geoprocessing function through the cached geoprocessing wrapper in a worker process
+    Inputs: geoprocessing_function -- a module-level geoprocessing function that receives **kwargs arguments
+            unit_kwargs -- key word arguments passed to the geoprocessing function
+            force -- if True, the geoprocessing function is executed even if its outputs are current (optional, default is False)
+    Returned Value: Returns True if the geoprocessing function was executed and False if the outputs were current
+    Preconditions: the function and key word arguments must be picklable
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.outputCache import cached_geoprocessing
+
+    # Execute the geoprocessing function and write output manifests
+    return cached_geoprocessing(geoprocessing_function, force=force, **unit_kwargs)
+
+# Define a function to create a work unit
+def create_work_unit(covariate, geoprocessing_function, unit_kwargs, depends_on=None):
+    """
+    Description: creates a work unit for the scheduler
+    Inputs: covariate -- the name of the covariate produced by the work unit, which is the key of the work unit
+            geoprocessing_function -- a module-level geoprocessing function that receives **kwargs arguments
+            unit_kwargs -- key word arguments for the geoprocessing function, including 'input_array' and 'output_array'
+            depends_on -- a list of covariate names whose work units must complete before the work unit starts (optional)
+    Returned Value: Returns a work unit dictionary
+    Preconditions: none
+    """
+
+    # Create the work unit dictionary
+    work_unit = {'key': covariate,
+                 'function': geoprocessing_function,
+                 'kwargs': unit_kwargs,
+                 'depends_on': list(depends_on) if depends_on else []}
+    return work_unit
+
+# Define a function to determine if the outputs of a work unit are current
+def work_unit_complete(work_unit):
+    """
+    Description: determines whether all outputs of a work unit have manifests that match their current inputs
+    Inputs: work_unit -- a work unit dictionary
+    Returned Value: Returns True if every output is current
+    Preconditions: the work unit key word arguments must contain 'output_array'
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.outputCache import outputs_current
+
+    # Check the output manifests
+    return outputs_current(work_unit['function'], **work_unit['kwargs'])
+
+# Define a function to order work unit keys so that dependencies come first
+def order_work_units(units):
+    """
+    Description: orders work unit keys so that each work unit follows its dependencies
+    Inputs: units -- a dictionary of work units indexed by key
+    Returned Value: Returns a list of work unit keys
+    Preconditions: dependencies must refer to keys in the dictionary
+    """
+
+    # Add work units once all of their dependencies have been added
+    ordered = []
+    remaining = list(units)
+    while remaining:
+        ready = [key for key in remaining if all(dependency in ordered for dependency in units[key]['depends_on'])]
+        if not ready:
+            raise ValueError(f'Work units {remaining} have circular dependencies.')
+        ordered.extend(ready)
+        remaining = [key for key in remaining if key not in ready]
+    return ordered
+
+# Define a function to run work units on a process pool in dependency order
+def run_work_units(work_units, worker_count=None, resume=True):
+    """
+    Description: runs work units on a process pool, starting each work unit once its dependencies have completed
+    Inputs: work_units -- a list of work unit dictionaries created by create_work_unit
+            worker_count -- the number of worker processes (optional, default is the number of processors)
+            resume -- boolean input to control if work units with current outputs are skipped, where False reruns every work unit
+    Returned Value: Returns a dictionary of work unit keys and their final status ('completed', 'skipped', 'failed', or 'blocked')
+    Preconditions: work unit keys must be unique and dependencies must refer to keys in the list
+    """
+
+    # Import packages
+    from concurrent.futures import FIRST_COMPLETED
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures import wait
+    import datetime
+    import os
+    import time
+
+    # Index work units by key and validate dependencies
+    units = {}
+    for work_unit in work_units:
+        if work_unit['key'] in units:
+            raise ValueError(f'Work unit {work_unit["key"]} is defined more than once.')
+        units[work_unit['key']] = work_unit
+    for work_unit in work_units:
+        for dependency in work_unit['depends_on']:
+            if dependency not in units:
+                raise ValueError(f'Work unit {work_unit["key"]} depends on undefined work unit {dependency}.')
+
+    # Set the number of worker processes
+    if worker_count is None:
+        worker_count = os.cpu_count() or 1
+    worker_count = max(1, min(worker_count, len(units)))
+
+    # Mark work units with current outputs as skipped if resuming
+    # Work units downstream of a work unit that will run are checked again in the worker after their inputs are rebuilt
+    status = {}
+    if resume == True:
+        for key in order_work_units(units):
+            work_unit = units[key]
+            if (all(status.get(dependency) == 'skipped' for dependency in work_unit['depends_on'])
+                    and work_unit_complete(work_unit)):
+                status[key] = 'skipped'
+                print(f'Outputs for {key} are current.')
+    pending = [key for key in units if key not in status]
+    print(f'Running {len(pending)} of {len(units)} work units on {worker_count} worker processes...')
+    print('----------')
+
+    # Submit work units as their dependencies complete
+    total_start = time.time()
+    running = {}
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        while pending or running:
+            # Block work units that depend on failed or blocked work units
+            for key in list(pending):
+                if any(status.get(dependency) in ('failed', 'blocked') for dependency in units[key]['depends_on']):
+                    status[key] = 'blocked'
+                    pending.remove(key)
+                    print(f'Work unit {key} blocked by a failed dependency.')
+            # Submit work units whose dependencies are complete
+            for key in list(pending):
+                if len(running) >= worker_count:
+                    break
+                if all(status.get(dependency) in ('completed', 'skipped') for dependency in units[key]['depends_on']):
+                    future = executor.submit(run_work_unit, units[key]['function'], units[key]['kwargs'], resume != True)
+                    running[future] = (key, time.time())
+                    pending.remove(key)
+                    print(f'Started {key}...')
+            if not running:
+                if pending:
+                    raise ValueError(f'Work units {pending} have circular dependencies.')
+                continue
+            # Wait for the next work unit to finish and report its status
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                key, iteration_start = running.pop(future)
+                iteration_elapsed = int(time.time() - iteration_start)
+                iteration_success_time = datetime.datetime.now()
+                try:
+                    executed = future.result()
+                except BaseException as err:
+                    status[key] = 'failed'
+                    print(f'Failed {key} at {iteration_success_time.strftime("%Y-%m-%d %H:%M")}: {err!r}')
+                else:
+                    # Report work units whose outputs the worker found current after their dependencies completed as skipped
+                    status[key] = 'completed' if executed else 'skipped'
+                    print(f'{status[key].capitalize()} {key} at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
+                print('----------')
+
+    # Report the overall results
+    total_elapsed = int(time.time() - total_start)
+    total_success_time = datetime.datetime.now()
+    completed_count = sum(1 for value in status.values() if value == 'completed')
+    print(f'Completed {completed_count} work units at {total_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=total_elapsed)})')
+    print('----------')
+    return status
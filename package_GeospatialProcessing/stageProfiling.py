@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Stage profiling
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation. Peak memory and input/output bytes are recorded if psutil is installed or, on Linux, from the operating system.
+# Description: "Stage profiling" is a set of functions that record the wall time, processor time, memory high-water mark, and bytes read and written by named and nested processing stages, append the records to a JSON lines log, and summarize a log across a full build.
+# ---------------------------------------------------------------------------
+
+# Define the environment variable that stores the profile log path so that worker processes inherit it
+PROFILE_LOG_VARIABLE = 'GEOPROCESSING_PROFILE_LOG'
+
+# Define a dictionary that stores the open stages of each thread so that nested stages record their parent stage
+OPEN_STAGES = {}
+
+# Define a function to set the profile log
+def set_profile_log(log_file):
+    """
+    Description: sets the JSON lines log that receives stage records in this process and in worker processes started afterwards
+    Inputs: log_file -- path to the JSON lines log, or None to stop logging
+    Returned Value: Returns the log path
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Store the log path in the environment
+    if log_file is None:
+        os.environ.pop(PROFILE_LOG_VARIABLE, None)
+    else:
+        os.environ[PROFILE_LOG_VARIABLE] = os.path.abspath(log_file)
+    return log_file
+
+# Define a function to read the resource usage of the current process
+def get_resource_usage():
+    """
+    Description: reads the processor time, peak memory, and input/output bytes of the current process
+    Inputs: none
+    Returned Value: Returns a dictionary of 'cpu_time' in seconds, 'peak_rss' as the high-water mark of the resident memory of the process since it started in bytes, and 'read_bytes' and 'write_bytes', where unavailable values are None
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+    import sys
+    import time
+
+    # Read the processor time
+    usage = {'cpu_time': time.process_time(),
+             'peak_rss': None,
+             'read_bytes': None,
+             'write_bytes': None}
+
+    # Read memory and input/output counters from psutil if it is installed
+    try:
+        import psutil
+        process = psutil.Process()
+        memory_info = process.memory_info()
+        usage['peak_rss'] = getattr(memory_info, 'peak_wset', None)
+        try:
+            io_counters = process.io_counters()
+            usage['read_bytes'] = io_counters.read_bytes
+            usage['write_bytes'] = io_counters.write_bytes
+        except (AttributeError, psutil.Error):
+            pass
+    except ImportError:
+        pass
+
+    # Otherwise read peak memory and input/output counters from the operating system
+    if usage['peak_rss'] is None:
+        try:
+            import resource
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            usage['peak_rss'] = peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+        except ImportError:
+            pass
+    if usage['read_bytes'] is None and os.path.exists('/proc/self/io'):
+        with open('/proc/self/io', 'r') as io_reader:
+            io_counters = dict(line.split(': ') for line in io_reader.read().splitlines())
+        usage['read_bytes'] = int(io_counters['read_bytes'])
+        usage['write_bytes'] = int(io_counters['write_bytes'])
+    return usage
+
+# Define a function to start a profiled stage
+def start_stage(stage, **attributes):
+    """
+    Description: starts timing a named processing stage
+    Inputs: stage -- the name of the stage, such as the function name and step
+            **attributes -- additional values to store in the stage record, such as the output dataset
+    Returned Value: Returns a stage record to pass to end_stage, which records the innermost open stage of the thread as its parent
+    Preconditions: none
+    """
+
+    # Import packages
+    import datetime
+    import threading
+    import time
+
+    # Record the parent stage, start time, and resource usage
+    open_stages = OPEN_STAGES.setdefault(threading.get_ident(), [])
+    stage_record = {'stage': stage,
+                    'parent': open_stages[-1]['stage'] if open_stages else None,
+                    'attributes': attributes,
+                    'start_time': datetime.datetime.now().isoformat(timespec='seconds'),
+                    'start_clock': time.perf_counter(),
+                    'start_usage': get_resource_usage()}
+    open_stages.append(stage_record)
+    return stage_record
+
+# Define a function to end a profiled stage
+def end_stage(stage_record, description=None, status='completed', report=True, log_file=None):
+    """
+    Description: ends timing a processing stage, appends the stage record to the profile log, and reports success
+    Inputs: stage_record -- a stage record returned by start_stage
+            description -- a description of the completed work, such as '12 blocks' (optional)
+            status -- the status of the stage (optional, default is 'completed')
+            report -- boolean input to control if the completion message is printed
+            log_file -- path to the JSON lines log (optional, default is the log set by set_profile_log)
+    Returned Value: Returns the completed stage record, where process_peak_rss is the high-water mark of the process at the end of the stage, which can be set by an earlier stage, and peak_rss_increase is the amount by which the stage raised that mark
+    Preconditions: the stage must be started by start_stage
+    """
+
+    # Import packages
+    import datetime
+    import json
+    import os
+    import threading
+    import time
+
+    # Close the stage and any nested stages that were not ended because of an error
+    open_stages = OPEN_STAGES.setdefault(threading.get_ident(), [])
+    for stage_index in range(len(open_stages) - 1, -1, -1):
+        if open_stages[stage_index] is stage_record:
+            del open_stages[stage_index:]
+            break
+
+    # Calculate the elapsed time and resource usage of the stage
+    end_clock = time.perf_counter()
+    end_usage = get_resource_usage()
+    start_usage = stage_record['start_usage']
+
+    def usage_change(name):
+        if start_usage[name] is None or end_usage[name] is None:
+            return None
+        return end_usage[name] - start_usage[name]
+    record = {'stage': stage_record['stage'],
+              'parent': stage_record['parent'],
+              'status': status,
+              'start_time': stage_record['start_time'],
+              'pid': os.getpid(),
+              'wall_time': round(end_clock - stage_record['start_clock'], 6),
+              'cpu_time': round(usage_change('cpu_time'), 6),
+              'process_peak_rss': end_usage['peak_rss'],
+              'peak_rss_increase': usage_change('peak_rss'),
+              'read_bytes': usage_change('read_bytes'),
+              'write_bytes': usage_change('write_bytes')}
+    record.update(stage_record['attributes'])
+
+    # Append the record to the profile log
+    log_file = log_file or os.environ.get(PROFILE_LOG_VARIABLE)
+    if log_file:
+        with open(log_file, 'a') as log_writer:
+            log_writer.write(json.dumps(record, default=str) + '\n')
+
+    # Report success
+    if report == True:
+        iteration_success_time = datetime.datetime.now()
+        completed_text = f'Completed {description}' if description else 'Completed'
+        print(
+            f'\t{completed_text} at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=int(record["wall_time"]))})')
+        print('\t----------')
+    return record
+
+# Define a context manager to profile a stage
+def profile_stage(stage, **attributes):
+    """
+    Description: profiles the statements in a with block as a named stage and records failed stages with a failed status
+    Inputs: stage -- the name of the stage
+            **attributes -- additional values to store in the stage record
+    Returned Value: Returns a context manager that yields the stage record
+    Preconditions: none
+    """
+
+    # Import packages
+    import contextlib
+
+    @contextlib.contextmanager
+    def stage_context():
+        stage_record = start_stage(stage, **attributes)
+        try:
+            yield stage_record
+        except BaseException:
+            end_stage(stage_record, status='failed', report=False)
+            raise
+        end_stage(stage_record, report=False)
+    return stage_context()
+
+# Define a decorator to profile a function
+def profiled(stage=None):
+    """
+    Description: profiles every call of the decorated function as a stage
+    Inputs: stage -- the name of the stage (optional, default is the function name)
+    Returned Value: Returns a decorator
+    Preconditions: none
+    """
+
+    # Import packages
+    import functools
+
+    def decorator(function):
+        @functools.wraps(function)
+        def profiled_function(*args, **kwargs):
+            with profile_stage(stage or function.__name__):
+                return function(*args, **kwargs)
+        return profiled_function
+    return decorator
+
+# Define a function to summarize a profile log
+def summarize_profile_log(log_file, baseline_file=None, output_file=None):
+    """
+    Description: summarizes the stage records of a profile log by stage and optionally compares them to the records of a previous run
+    Inputs: log_file -- path to the JSON lines log
+            baseline_file -- path to the JSON lines log of a previous run to compare against (optional)
+            output_file -- path to a JSON file where the summary is saved (optional)
+    Returned Value: Returns a list of stage summaries sorted by total wall time
+    Preconditions: the log must be written by end_stage
+    """
+
+    # Import packages
+    import json
+
+    # Aggregate the records of each stage, keeping the parent of nested stages
+    def read_summary(input_file):
+        summary = {}
+        with open(input_file, 'r') as log_reader:
+            for line in log_reader:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                stage = summary.setdefault(record['stage'], {'stage': record['stage'],
+                                                             'parent': record.get('parent'),
+                                                             'count': 0,
+                                                             'failed': 0,
+                                                             'wall_time': 0.0,
+                                                             'cpu_time': 0.0,
+                                                             'process_peak_rss': 0,
+                                                             'peak_rss_increase': 0,
+                                                             'read_bytes': 0,
+                                                             'write_bytes': 0})
+                stage['count'] += 1
+                stage['failed'] += int(record['status'] == 'failed')
+                for name in ['wall_time', 'cpu_time', 'read_bytes', 'write_bytes']:
+                    stage[name] += record[name] or 0
+                stage['process_peak_rss'] = max(stage['process_peak_rss'],
+                                                record.get('process_peak_rss', record.get('peak_rss')) or 0)
+                stage['peak_rss_increase'] = max(stage['peak_rss_increase'], record.get('peak_rss_increase') or 0)
+        return summary
+    summary = read_summary(log_file)
+    if baseline_file is not None:
+        baseline = read_summary(baseline_file)
+        for name, stage in summary.items():
+            if name in baseline and baseline[name]['wall_time'] > 0:
+                stage['wall_time_ratio'] = round(stage['wall_time'] / baseline[name]['wall_time'], 3)
+    stages = sorted(summary.values(), key=lambda stage: stage['wall_time'], reverse=True)
+
+    # Report the summary, where totals and shares count only top-level stages because nested stages are part of their parents
+    top_stages = [stage for stage in stages if stage['parent'] is None]
+    total_wall_time = sum(stage['wall_time'] for stage in top_stages)
+    print(f'{"Stage":<60}{"Count":>7}{"Wall (s)":>12}{"CPU (s)":>12}{"Peak RSS (MB)":>15}{"Peak Rise (MB)":>16}'
+          f'{"Read (MB)":>12}{"Write (MB)":>12}{"Share":>8}')
+    for stage in stages:
+        share = stage['wall_time'] / total_wall_time if total_wall_time > 0 else 0
+        stage_text = stage['stage'] if stage['parent'] is None else f'{stage["parent"]} > {stage["stage"]}'
+        ratio_text = f'  x{stage["wall_time_ratio"]} of baseline' if 'wall_time_ratio' in stage else ''
+        print(f'{stage_text[:59]:<60}{stage["count"]:>7}{stage["wall_time"]:>12.1f}{stage["cpu_time"]:>12.1f}'
+              f'{stage["process_peak_rss"] / 1048576:>15.1f}{stage["peak_rss_increase"] / 1048576:>16.1f}'
+              f'{stage["read_bytes"] / 1048576:>12.1f}{stage["write_bytes"] / 1048576:>12.1f}'
+              f'{share:>8.1%}{ratio_text}')
+    print(f'{"Total of top-level stages":<60}{sum(stage["count"] for stage in top_stages):>7}{total_wall_time:>12.1f}'
+          f'{sum(stage["cpu_time"] for stage in top_stages):>12.1f}{"":>31}'
+          f'{sum(stage["read_bytes"] for stage in top_stages) / 1048576:>12.1f}'
+          f'{sum(stage["write_bytes"] for stage in top_stages) / 1048576:>12.1f}')
+    print('----------')
+
+    # Save the summary
+    if output_file is not None:
+        with open(output_file, 'w') as summary_writer:
+            json.dump(stages, summary_writer, indent=2)
+    return stages
@@ -2,146 +2,127 @@
 # ---------------------------------------------------------------------------
 # Sum rasters
 # Author: Timm Nawrocki
-# Last Updated: 2020-11-01
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
-# Description: "Sum rasters" is a function that sums n number of rasters and returns a single output raster.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio.
+# Description: "Sum rasters" is a function that sums n number of rasters into a single accumulator in one pass and returns a single output raster in a value type that holds the sum.
 # ---------------------------------------------------------------------------
 
+# Define a function to determine a value type that holds the sum of rasters
+def get_sum_value_type(input_rasters, maximum_value=None):
+    """
+    Description: determines the accumulator data type and the narrowest output value type and no data value that hold the sum of a set of rasters
+    Inputs: input_rasters -- a list of input raster paths
+            maximum_value -- the highest value of the sum after clipping (optional)
+    Returned Value: Returns a tuple of the accumulator data type, the output value type, and the output no data value
+    Preconditions: requires existing numeric raster datasets
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import get_data_type
+    from package_GeospatialProcessing.rasterBlocks import get_raster_properties
+    from package_GeospatialProcessing.rasterStatistics import read_raster_statistics
+    import numpy as np
+
+    # Read the value type and no data value of each input
+    raster_properties = [get_raster_properties(input_raster) for input_raster in input_rasters]
+    raster_statistics = [read_raster_statistics(input_raster, calculate=False) for input_raster in input_rasters]
+    data_types = [np.dtype(get_data_type(value_type)) for value_type, _ in raster_properties]
+    no_data_value = raster_properties[0][1]
+
+    # Sum floating point rasters in 64 bits and write them in the widest input float type
+    if any(data_type.kind == 'f' for data_type in data_types):
+        float_types = [data_type for data_type in data_types if data_type.kind == 'f']
+        output_type = '64_BIT' if np.dtype('float64') in float_types else '32_BIT_FLOAT'
+        if no_data_value is None:
+            no_data_value = -9999
+        return 'float64', output_type, no_data_value
+
+    # Bound the sum of integer rasters by the indexed range of each input, otherwise the range of its type, and the optional maximum
+    lowest_values = [int(np.iinfo(data_type).min) if statistics is None or statistics['minimum'] is None
+                     else statistics['minimum']
+                     for data_type, statistics in zip(data_types, raster_statistics)]
+    highest_values = [int(np.iinfo(data_type).max) if statistics is None or statistics['maximum'] is None
+                      else statistics['maximum']
+                      for data_type, statistics in zip(data_types, raster_statistics)]
+    lowest_sum = sum(min(value, 0) for value in lowest_values)
+    highest_sum = sum(max(value, 0) for value in highest_values)
+    if maximum_value is not None:
+        highest_sum = min(highest_sum, int(maximum_value))
+    # Select the narrowest type that holds the sum and leaves a value outside the sum for no data, preferring the input type
+    value_types = {'uint8': '8_BIT_UNSIGNED',
+                   'int8': '8_BIT_SIGNED',
+                   'uint16': '16_BIT_UNSIGNED',
+                   'int16': '16_BIT_SIGNED',
+                   'uint32': '32_BIT_UNSIGNED',
+                   'int32': '32_BIT_SIGNED'}
+    candidate_types = [np.result_type(*data_types), np.dtype('int16'), np.dtype('int32')]
+    for candidate_type in candidate_types:
+        if candidate_type.name not in value_types:
+            continue
+        type_range = np.iinfo(candidate_type)
+        if (type_range.min <= lowest_sum and highest_sum <= type_range.max
+                and (type_range.min < lowest_sum or highest_sum < type_range.max)):
+            break
+    else:
+        # Sums beyond the 32 bit range are written as 64 bit floating point
+        return 'int64', '64_BIT', no_data_value if no_data_value is not None else -9999
+    # Keep the input no data value if it cannot be a sum, otherwise use the lowest or highest value of the output type
+    if (no_data_value is None
+            or not type_range.min <= no_data_value <= type_range.max
+            or lowest_sum <= no_data_value <= highest_sum):
+        no_data_value = type_range.min if type_range.min < lowest_sum else type_range.max
+    return 'int64', value_types[candidate_type.name], no_data_value
+
 # Define a function to sum n number of rasters
 def sum_rasters(**kwargs):
     """
-    Description: calculates the sum of all input rasters in an array
-    Inputs: 'work_geodatabase' -- path to a file geodatabase that will serve as the workspace
+    Description: calculates the sum of all input rasters in an array with no data treated as zero
+    Inputs: 'maximum_value' -- the highest value of the sum, such as 100 for percent cover (optional, default is no maximum)
+            'value_type' -- the output raster value type (optional, default is the narrowest type that holds the sum)
+            'no_data' -- the output raster no data value (optional, default is the no data value of the first input if it cannot be a sum)
+            'block_size' -- the number of rows and columns processed per block (optional, default is 2048)
             'input_array' -- an array containing a raster study area (must be first) and all input rasters to be summed
             'output_array' -- an array containing the output summed raster
     Returned Value: Returns a raster dataset on disk containing the summed values
-    Preconditions: requires existing numeric raster datasets of the same value type
+    Preconditions: requires existing numeric raster datasets
     """
 
     # Import packages
-    import arcpy
-    from arcpy.sa import Con
-    from arcpy.sa import ExtractByMask
-    from arcpy.sa import IsNull
-    from arcpy.sa import Raster
-    import datetime
-    import time
+    from package_GeospatialProcessing.rasterExpression import accumulate
+    from package_GeospatialProcessing.rasterExpression import evaluate_expression
+    from package_GeospatialProcessing.rasterExpression import open_raster
+    from package_GeospatialProcessing.rasterExpression import study_area_mask
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
 
     # Parse key word argument inputs
-    work_geodatabase = kwargs['work_geodatabase']
-    input_rasters = kwargs['input_array']
-    study_area = input_rasters.pop(0)
+    maximum_value = kwargs.get('maximum_value', None)
+    block_size = kwargs.get('block_size', 2048)
+    study_area = kwargs['input_array'][0]
+    input_rasters = kwargs['input_array'][1:]
     output_raster = kwargs['output_array'][0]
     input_length = len(input_rasters)
 
-    # Set overwrite option
-    arcpy.env.overwriteOutput = True
-
-    # Set workspace
-    arcpy.env.workspace = work_geodatabase
-
-    # Use two thirds of cores on processes that can be split.
-    arcpy.env.parallelProcessingFactor = "66%"
-
-    # Set snap raster, extent, and cell size
-    arcpy.env.snapRaster = study_area
-    arcpy.env.extent = Raster(study_area).extent
-    arcpy.env.cellSize = "MINOF"
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tAdding rasters 1 and 2 of {input_length}...')
-    # Prepare the first two rasters in the input list
-    raster_one = input_rasters.pop(0)
-    raster_two = input_rasters.pop(0)
-    # Convert null values to zeros
-    cover_one = Con(IsNull(Raster(raster_one)), 0, Raster(raster_one))
-    cover_two = Con(IsNull(Raster(raster_two)), 0, Raster(raster_two))
-    # Sum the first two rasters in the input list
-    summed_raster = cover_one + cover_two
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
-
-    # If the remaining input raster list length is greater than zero, iteratively add other rasters
-    if len(input_rasters) > 0:
-        for raster in input_rasters:
-            # Start timing function
-            iteration_start = time.time()
-            raster_number = input_rasters.index(raster) + 3
-            print(f'\tAdd raster {raster_number} of {input_length}...')
-            # Convert null values to zeros
-            cover_raster = Con(IsNull(Raster(raster)), 0, Raster(raster))
-            # Add raster to the previous sum
-            summed_raster = summed_raster + cover_raster
-            # End timing
-            iteration_end = time.time()
-            iteration_elapsed = int(iteration_end - iteration_start)
-            iteration_success_time = datetime.datetime.now()
-            # Report success
-            print(
-                f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-            print('\t----------')
-
-    # Start timing function
-    iteration_start = time.time()
-    print(f'\tExtracting the summed raster to study area...')
-    # Extract the summed raster to the study area
-    extract_raster = ExtractByMask(summed_raster, study_area)
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    # Determine the accumulator type and the output value type and no data value
+    accumulator_type, value_type, no_data_value = get_sum_value_type(input_rasters, maximum_value)
+    value_type = kwargs.get('value_type', value_type)
+    no_data_value = kwargs.get('no_data', no_data_value)
 
-    # Determine raster type and no data value
-    no_data_value = Raster(raster_one).noDataValue
-    type_number = arcpy.management.GetRasterProperties(raster_one, 'VALUETYPE').getOutput(0)
-    value_types = ['1_BIT',
-                   '2_BIT',
-                   '4_BIT',
-                   '8_BIT_UNSIGNED',
-                   '8_BIT_SIGNED',
-                   '16_BIT_UNSIGNED',
-                   '16_BIT_SIGNED',
-                   '32_BIT_UNSIGNED',
-                   '32_BIT_SIGNED',
-                   '32_BIT_FLOAT',
-                   '64_BIT']
-    value_type = value_types[int(type_number)]
-    print(f'\tSaving summed raster to disk as {value_type} raster with NODATA value of {no_data_value}...')
     # Start timing function
-    iteration_start = time.time()
-    # Save the summed raster to disk
-    arcpy.management.CopyRaster(extract_raster,
-                                output_raster,
-                                '',
-                                '',
-                                no_data_value,
-                                'NONE',
-                                'NONE',
-                                value_type,
-                                'NONE',
-                                'NONE',
-                                'TIFF',
-                                'NONE',
-                                'CURRENT_SLICE',
-                                'NO_TRANSPOSE')
-    arcpy.management.BuildRasterAttributeTable(output_raster, "Overwrite")
-    # End timing
-    iteration_end = time.time()
-    iteration_elapsed = int(iteration_end - iteration_start)
-    iteration_success_time = datetime.datetime.now()
-    # Report success
-    print(
-        f'\tCompleted at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
-    print('\t----------')
+    stage = start_stage('sum_rasters', output=kwargs['output_array'][0])
+    print(f'\tSumming {input_length} rasters and saving to disk as {value_type} raster with NODATA value of {no_data_value}...')
+    # Add each input to one accumulator with null values treated as zero and extract the sum to the study area in one pass
+    summed_raster = accumulate(*[open_raster(input_raster) for input_raster in input_rasters],
+                               data_type=accumulator_type)
+    if maximum_value is not None:
+        summed_raster = summed_raster.clip(maximum_value=maximum_value)
+    block_count = evaluate_expression(summed_raster.mask(study_area_mask()),
+                                      study_area,
+                                      output_raster,
+                                      value_type,
+                                      no_data_value,
+                                      block_size)
+    # End timing and report success
+    end_stage(stage, f'{block_count} blocks')
     out_process = 'Successfully summed rasters.'
     return out_process
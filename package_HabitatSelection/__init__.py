@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Initialization for Habitat Selection Module
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Individual functions have varying requirements. All functions require numpy and functions that operate on data frames require pandas.
+# Description: This initialization file imports modules in the package so that the contents are accessible.
+# ---------------------------------------------------------------------------
+
+# Import functions from modules
+from package_HabitatSelection.compactForest import export_forest
+from package_HabitatSelection.compactForest import open_forest
+from package_HabitatSelection.compactForest import predict_forest
+from package_HabitatSelection.compositeSelection import composite_selection
+from package_HabitatSelection.compositeSelection import read_threshold
+from package_HabitatSelection.compositeSelection import selection_values
+from package_HabitatSelection.crossValidation import nested_cross_validation
+from package_HabitatSelection.crossValidation import optimize_threshold
+from package_HabitatSelection.predictSelectionRaster import predict_selection_raster
+from package_HabitatSelection.thresholdOptimization import determine_optimal_threshold
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Compact forest
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy, joblib, and scikit-learn. Prediction from an exported forest requires only numpy.
+# Description: "Compact forest" is a set of functions that flatten the trees of a trained random forest classifier into contiguous node arrays stored in a single memory-mappable file with a JSON header and predict class probabilities from the node arrays in batches across multiple threads.
+# ---------------------------------------------------------------------------
+
+# Define a function to define the header path of a compact forest
+def get_forest_header_path(forest_file):
+    """
+    Description: defines the path of the JSON header stored next to a compact forest
+    Inputs: forest_file -- path to a compact forest bin file
+    Returned Value: Returns the header path
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Replace the bin extension with a json extension
+    return os.path.splitext(forest_file)[0] + '.json'
+
+# Define a function to export a random forest classifier to a compact forest
+def export_forest(**kwargs):
+    """
+    Description: flattens the trees of a trained random forest classifier into node arrays and writes them to a memory-mappable file
+    Inputs: 'input_array' -- an array containing the classifier joblib file
+            'output_array' -- an array containing the output forest bin file (must be first) and the output header json file with the same base name (must be second)
+    Returned Value: Returns a compact forest on disk with feature, threshold, child, and leaf probability arrays for all trees
+    Preconditions: requires a trained scikit-learn random forest classifier
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
+    import joblib
+    import json
+    import numpy as np
+    import os
+
+    # Parse key word argument inputs
+    classifier_file = kwargs['input_array'][0]
+    forest_file = kwargs['output_array'][0]
+    header_file = kwargs['output_array'][1]
+    if os.path.normpath(header_file) != os.path.normpath(get_forest_header_path(forest_file)):
+        raise ValueError(f'Header file must be {get_forest_header_path(forest_file)}.')
+
+    # Start timing function
+    stage = start_stage('export_forest', output=kwargs['output_array'][0])
+    classifier = joblib.load(classifier_file)
+    print(f'\tFlattening {len(classifier.estimators_)} trees...')
+
+    # Concatenate the nodes of all trees with child indices offset to the position of each tree
+    tree_roots = []
+    tree_depths = []
+    features = []
+    thresholds = []
+    children = []
+    leaf_values = []
+    node_offset = 0
+    for estimator in classifier.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        node_index = np.arange(tree.node_count) + node_offset
+        tree_roots.append(node_offset)
+        tree_depths.append(tree.max_depth)
+        # Leaves point to themselves so that rows can descend a fixed number of levels
+        features.append(np.where(is_leaf, 0, tree.feature))
+        # Round thresholds down to float32 so that float32 comparisons match the float64 thresholds
+        tree_thresholds = tree.threshold.astype('float32')
+        tree_thresholds = np.where(tree_thresholds.astype('float64') > tree.threshold,
+                                   np.nextafter(tree_thresholds, np.float32(-np.inf)),
+                                   tree_thresholds)
+        thresholds.append(np.where(is_leaf, np.float32(np.inf), tree_thresholds))
+        # Store the right child before the left child so that the child is indexed by the comparison result
+        children.append(np.stack([np.where(is_leaf, node_index, tree.children_right + node_offset),
+                                  np.where(is_leaf, node_index, tree.children_left + node_offset)], axis=1))
+        # Normalize node values to class probabilities as in the tree predict_proba
+        node_values = tree.value[:, 0, :]
+        node_totals = node_values.sum(axis=1, keepdims=True)
+        node_totals[node_totals == 0] = 1
+        leaf_values.append(node_values / node_totals)
+        node_offset += tree.node_count
+    forest_arrays = {'roots': np.asarray(tree_roots, dtype='int64'),
+                     'depths': np.asarray(tree_depths, dtype='int32'),
+                     'feature': np.concatenate(features).astype('int32'),
+                     'threshold': np.concatenate(thresholds).astype('float32'),
+                     'children': np.concatenate(children).reshape(-1).astype('int32'),
+                     'value': np.concatenate(leaf_values).astype('float32')}
+
+    # Write the arrays to the forest file and record their positions in the header
+    array_records = []
+    with open(forest_file, 'wb') as forest_writer:
+        for name, array in forest_arrays.items():
+            array_records.append({'name': name,
+                                  'dtype': array.dtype.str,
+                                  'shape': list(array.shape),
+                                  'offset': forest_writer.tell()})
+            forest_writer.write(np.ascontiguousarray(array).tobytes())
+    feature_names = [str(name) for name in getattr(classifier, 'feature_names_in_', [])]
+    header = {'format': 'compact_forest',
+              'version': 1,
+              'classes': [int(value) for value in classifier.classes_],
+              'n_features': int(classifier.n_features_in_),
+              'feature_names': feature_names,
+              'n_trees': len(tree_roots),
+              'node_count': node_offset,
+              'arrays': array_records}
+    with open(header_file, 'w') as header_writer:
+        json.dump(header, header_writer, indent=2)
+    # End timing and report success
+    end_stage(stage, f'{node_offset} nodes')
+    out_process = 'Successfully exported compact forest.'
+    return out_process
+
+# Define a function to open a compact forest
+def open_forest(forest_file):
+    """
+    Description: opens the node arrays of a compact forest as read-only memory maps with its header
+    Inputs: forest_file -- path to a compact forest bin file
+    Returned Value: Returns a dictionary containing the 'header' and a dictionary of memory-mapped node 'arrays'
+    Preconditions: the forest must be exported by export_forest
+    """
+
+    # Import packages
+    import json
+    import numpy as np
+
+    # Read the header and memory map each array
+    with open(get_forest_header_path(forest_file), 'r') as header_reader:
+        header = json.load(header_reader)
+    forest_arrays = {}
+    for record in header['arrays']:
+        forest_arrays[record['name']] = np.memmap(forest_file,
+                                                  dtype=np.dtype(record['dtype']),
+                                                  mode='r',
+                                                  offset=record['offset'],
+                                                  shape=tuple(record['shape']))
+    return {'header': header, 'arrays': forest_arrays}
+
+# Define a function to sum class probabilities of a set of trees for a batch of rows
+def predict_forest_trees(forest_arrays, X_columns, row_count, tree_index):
+    """
+    Description: moves all rows of a batch through a set of trees one tree at a time and sums the leaf probabilities
+    Inputs: forest_arrays -- the node arrays of a compact forest
+            X_columns -- a flattened float32 array of predictor values stored column by column
+            row_count -- the number of rows in the batch
+            tree_index -- an array of the indices of the trees to evaluate
+    Returned Value: Returns a float64 array of summed class probabilities with shape (number of rows, number of classes)
+    Preconditions: predictor values must not contain missing values
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Descend each tree for all rows at once for the depth of the tree
+    feature = forest_arrays['feature']
+    threshold = forest_arrays['threshold']
+    children = forest_arrays['children']
+    leaf_value = forest_arrays['value']
+    row_offset = np.arange(row_count, dtype='int64')
+    probability_sum = np.zeros((row_count, leaf_value.shape[1]), dtype='float64')
+    for tree in tree_index:
+        nodes = np.full(row_count, forest_arrays['roots'][tree], dtype='int64')
+        for _ in range(int(forest_arrays['depths'][tree])):
+            go_left = X_columns[np.multiply(feature[nodes], row_count, dtype='int64') + row_offset] <= threshold[nodes]
+            nodes = children[2 * nodes + go_left]
+        probability_sum += leaf_value[nodes]
+    return probability_sum
+
+# Define a function to predict class probabilities from a compact forest
+def predict_forest(forest, X_data, batch_size=16384, thread_count=None):
+    """
+    Description: predicts class probabilities from a compact forest in batches of rows, with the trees of each batch distributed across threads
+    Inputs: forest -- a compact forest opened by open_forest
+            X_data -- an array or data frame of predictor values in the order used to train the classifier
+            batch_size -- the number of rows moved through the trees at once (optional, default is 16384)
+            thread_count -- the number of threads (optional, default is the number of processors)
+    Returned Value: Returns a float64 array of class probabilities with one column per class in the order of the header classes
+    Preconditions: predictor values must be in the order used to train the classifier and must not contain missing values
+    """
+
+    # Import packages
+    from concurrent.futures import ThreadPoolExecutor
+    import numpy as np
+    import os
+
+    # Convert predictors to float32 as in the classifier
+    header = forest['header']
+    X_data = np.asarray(X_data, dtype='float32')
+    if X_data.ndim != 2 or X_data.shape[1] != header['n_features']:
+        raise ValueError(f'Predictor array must have {header["n_features"]} columns.')
+    probabilities = np.empty((X_data.shape[0], len(header['classes'])), dtype='float64')
+
+    # Split the trees into one group per thread
+    if thread_count is None:
+        thread_count = os.cpu_count() or 1
+    tree_groups = np.array_split(np.arange(header['n_trees']), max(1, min(thread_count, header['n_trees'])))
+    forest_arrays = {name: np.asarray(array) for name, array in forest['arrays'].items()}
+
+    # Predict each batch of rows with the tree groups on separate threads
+    with ThreadPoolExecutor(max_workers=len(tree_groups)) as executor:
+        for row_start in range(0, X_data.shape[0], batch_size):
+            row_end = min(row_start + batch_size, X_data.shape[0])
+            X_columns = np.ascontiguousarray(X_data[row_start:row_end].T).reshape(-1)
+            group_sums = executor.map(lambda tree_index: predict_forest_trees(forest_arrays,
+                                                                              X_columns,
+                                                                              row_end - row_start,
+                                                                              tree_index),
+                                      tree_groups)
+            probabilities[row_start:row_end] = sum(group_sums) / header['n_trees']
+    return probabilities
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Composite selection
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy and pandas.
+# Description: "Composite selection" is a set of functions that read the presence threshold and convert predicted presence probabilities to a selection value that ranges from -1 (avoidance) to 1 (selection).
+# ---------------------------------------------------------------------------
+
+# Define a function to read threshold values from text file
+def read_threshold(input_file):
+    """
+    Description: reads a presence threshold from the first line of a text file
+    Inputs: input_file -- path to the threshold text file
+    Returned Value: Returns the threshold as a float
+    Preconditions: the threshold file must be written by the train and test script
+    """
+
+    # Read the first line of the threshold file
+    with open(input_file, 'r') as threshold_reader:
+        threshold = threshold_reader.readline()
+    return float(threshold)
+
+# Define a function to convert presence probabilities to selection values
+def selection_values(presence_values, threshold, positive_range=None, negative_range=None):
+    """
+    Description: standardizes presence probabilities to values from -1 (avoidance) to 1 (selection) around a threshold
+    Inputs: presence_values -- an array of presence probabilities
+            threshold -- the presence threshold that separates avoidance from selection
+            positive_range -- the range of probabilities above the threshold (optional, default is 1 - threshold)
+            negative_range -- the range of probabilities below the threshold (optional, default is threshold)
+    Returned Value: Returns a float array of selection values where probabilities equal to the threshold are 0 and missing probabilities remain missing
+    Preconditions: presence probabilities must be predicted by a classifier
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Determine positive and negative ranges
+    if positive_range is None:
+        positive_range = 1 - threshold
+    if negative_range is None:
+        negative_range = threshold
+
+    # Scale differences from the threshold by the range on the same side of the threshold
+    difference = np.asarray(presence_values, dtype='float64') - threshold
+    with np.errstate(divide='ignore', invalid='ignore'):
+        selection = np.where(difference > 0, difference / positive_range, difference / negative_range)
+    selection[difference == 0] = 0
+    return selection
+
+# Define a function to composite model results in a data frame
+def composite_selection(input_data, presence, threshold, output, range_method='probability'):
+    """
+    Description: adds a selection column to a data frame of predicted presence probabilities
+    Inputs: input_data -- a data frame containing the presence probabilities
+            presence -- a list containing the name of the presence probability column
+            threshold -- the presence threshold that separates avoidance from selection
+            output -- a list containing the name of the output selection column
+            range_method -- 'probability' to scale by the full probability range or 'data' to scale by the range of the presence probabilities in the data
+    Returned Value: Returns the data frame with the selection column added
+    Preconditions: presence probabilities must be predicted by a classifier
+    """
+
+    # Determine positive and negative ranges
+    presence_values = input_data[presence[0]].to_numpy()
+    if range_method == 'probability':
+        positive_range = 1 - threshold
+        negative_range = threshold
+    elif range_method == 'data':
+        positive_range = input_data[presence[0]].max() - threshold
+        negative_range = threshold - input_data[presence[0]].min()
+    else:
+        raise ValueError(f'Range method "{range_method}" must be "probability" or "data".')
+
+    # Threshold presences and absences and standardize values from -1 (avoidance) to 1 (selection)
+    input_data[output[0]] = selection_values(presence_values, threshold, positive_range, negative_range)
+    return input_data
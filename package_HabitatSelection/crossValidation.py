@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Cross validation
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy, pandas, pyarrow, and scikit-learn. Scripts that call the cross validation must protect their entry point with if __name__ == '__main__' unless run as a Jupyter Notebook.
+# Description: "Cross validation" is a set of functions that conduct group-aware nested cross validation with threshold optimization in the inner folds. Outer folds are distributed across a process pool and each completed outer fold is checkpointed so that an interrupted run resumes.
+# ---------------------------------------------------------------------------
+
+# Define a function to create group cross validation folds
+def create_group_folds(groups, n_splits=None):
+    """
+    Description: creates the train and test indices of group cross validation folds
+    Inputs: groups -- an array of group labels, where all rows of a group are withheld together
+            n_splits -- the number of folds (optional, default is one fold per group)
+    Returned Value: Returns a list of tuples of train and test index arrays
+    Preconditions: the number of folds cannot exceed the number of groups
+    """
+
+    # Import packages
+    import numpy as np
+    from sklearn.model_selection import GroupKFold
+    from sklearn.model_selection import LeaveOneGroupOut
+
+    # Split the rows by group
+    if n_splits is None:
+        cv_splits = LeaveOneGroupOut()
+    else:
+        cv_splits = GroupKFold(n_splits=n_splits)
+    groups = np.asarray(groups)
+    return list(cv_splits.split(np.zeros((len(groups), 1)), groups=groups))
+
+# Define a function to predict each row once in inner cross validation
+def predict_inner_folds(classifier, X_data, y_data, groups, inner_splits=5):
+    """
+    Description: predicts presence probabilities for each row from a classifier trained on the other inner cross validation folds
+    Inputs: classifier -- an untrained classifier with fit and predict_proba methods
+            X_data -- an array of predictor values
+            y_data -- an array of observed presences (1) and absences (0)
+            groups -- an array of group labels
+            inner_splits -- the number of inner cross validation folds (optional, default is 5)
+    Returned Value: Returns an array of presence probabilities aligned with the input rows
+    Preconditions: the classifier is refit in each fold
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Train on the inner train folds and predict the inner test fold
+    presence_values = np.empty(len(y_data), dtype='float64')
+    for train_index, test_index in create_group_folds(groups, inner_splits):
+        classifier.fit(X_data[train_index], y_data[train_index])
+        presence_column = list(classifier.classes_).index(1)
+        presence_values[test_index] = classifier.predict_proba(X_data[test_index])[:, presence_column]
+    return presence_values
+
+# Define a function to optimize a presence threshold in inner cross validation
+def optimize_threshold(classifier, X_data, y_data, groups, inner_splits=5):
+    """
+    Description: determines the presence threshold from the inner cross validation predictions of a classifier
+    Inputs: classifier -- an untrained classifier with fit and predict_proba methods
+            X_data -- an array of predictor values
+            y_data -- an array of observed presences (1) and absences (0)
+            groups -- an array of group labels
+            inner_splits -- the number of inner cross validation folds (optional, default is 5)
+    Returned Value: Returns a tuple of the optimal threshold and its sensitivity, specificity, auc, and accuracy
+    Preconditions: each inner train fold must contain presences and absences
+    """
+
+    # Import packages
+    from package_HabitatSelection.thresholdOptimization import determine_optimal_threshold
+
+    # Predict each row once and determine the threshold from the merged predictions
+    presence_values = predict_inner_folds(classifier, X_data, y_data, groups, inner_splits)
+    return determine_optimal_threshold(presence_values, y_data)
+
+# Define a function to write fold results atomically
+def write_fold_results(fold_results, checkpoint_file):
+    """
+    Description: writes the results of an outer fold to a checkpoint file through a temporary file so that partial files are never read
+    Inputs: fold_results -- a data frame of outer fold results
+            checkpoint_file -- path to the parquet checkpoint file
+    Returned Value: Returns the checkpoint file on disk
+    Preconditions: none
+    """
+
+    # Import packages
+    import os
+
+    # Write to a temporary file and replace the checkpoint
+    temporary_file = checkpoint_file + '.tmp'
+    fold_results.to_parquet(temporary_file, index=False)
+    os.replace(temporary_file, checkpoint_file)
+
+# Define a function to conduct a single outer cross validation fold
+def run_outer_fold(iteration, classifier, X_data, y_data, groups, train_index, test_index, inner_splits, checkpoint_file=None):
+    """
+    Description: optimizes a threshold in inner cross validation on the outer train fold, trains the classifier on the outer train fold, and predicts the outer test fold
+    Inputs: iteration -- the outer fold number
+            classifier -- an untrained classifier with fit and predict_proba methods
+            X_data -- an array of predictor values
+            y_data -- an array of observed presences (1) and absences (0)
+            groups -- an array of group labels
+            train_index -- an array of outer train row indices
+            test_index -- an array of outer test row indices
+            inner_splits -- the number of inner cross validation folds
+            checkpoint_file -- path to a parquet file where the fold results are saved (optional)
+    Returned Value: Returns a data frame with the 'row', 'absence', 'presence', 'threshold', and 'iteration' of each outer test row
+    Preconditions: the function and its inputs must be picklable
+    """
+
+    # Import packages
+    import pandas as pd
+
+    # Optimize the threshold on the outer train fold
+    threshold = optimize_threshold(classifier,
+                                   X_data[train_index],
+                                   y_data[train_index],
+                                   groups[train_index],
+                                   inner_splits)[0]
+
+    # Train the classifier on the outer train fold and predict the outer test fold
+    classifier.fit(X_data[train_index], y_data[train_index])
+    presence_column = list(classifier.classes_).index(1)
+    probability_prediction = classifier.predict_proba(X_data[test_index])
+    fold_results = pd.DataFrame({'row': test_index,
+                                 'absence': probability_prediction[:, 1 - presence_column],
+                                 'presence': probability_prediction[:, presence_column],
+                                 'threshold': threshold,
+                                 'iteration': iteration})
+
+    # Save the fold results
+    if checkpoint_file is not None:
+        write_fold_results(fold_results, checkpoint_file)
+    return fold_results
+
+# Define a function to conduct nested cross validation
+def nested_cross_validation(input_data, classifier, predictors, response, group, inner_splits=5, worker_count=None,
+                            fold_jobs=1, checkpoint_folder=None):
+    """
+    Description: predicts every row once from a classifier trained without its group, where the presence threshold of each outer fold is optimized in inner group cross validation
+    Inputs: input_data -- a data frame containing the predictors, response, and group
+            classifier -- an untrained classifier with fit and predict_proba methods
+            predictors -- a list of predictor column names
+            response -- a list containing the name of the response column
+            group -- the name of the group column, where each group forms one outer fold
+            inner_splits -- the number of inner cross validation folds (optional, default is 5)
+            worker_count -- the number of outer folds processed in parallel (optional, default is the number of processors divided by fold_jobs)
+            fold_jobs -- the number of jobs used by the classifier within each outer fold (optional, default is 1)
+            checkpoint_folder -- a folder where completed outer folds are saved and read when the run resumes (optional)
+    Returned Value: Returns a tuple of the outer results data frame, with 'absence', 'presence', 'prediction', 'selection', and 'iteration' columns added to the input data, and the list of outer fold thresholds
+    Preconditions: checkpoints in the folder must have been written for the same data, classifier, and folds
+    """
+
+    # Import packages
+    from concurrent.futures import FIRST_COMPLETED
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures import wait
+    from package_HabitatSelection.compositeSelection import selection_values
+    from sklearn.base import clone
+    import datetime
+    import hashlib
+    import json
+    import numpy as np
+    import os
+    import pandas as pd
+    import time
+
+    # Prepare the predictor, response, and group arrays and collect all outer folds up front
+    input_data = input_data.reset_index(drop=True)
+    X_data = input_data[predictors].to_numpy(dtype='float64')
+    y_data = input_data[response[0]].to_numpy(dtype='int32')
+    groups = input_data[group].to_numpy()
+    outer_folds = create_group_folds(groups)
+    print(f'Created {len(outer_folds)} outer cross-validation group splits.')
+
+    # Set the classifier jobs within each fold and the number of worker processes
+    classifier = clone(classifier)
+    if 'n_jobs' in classifier.get_params():
+        classifier.set_params(n_jobs=fold_jobs)
+    if worker_count is None:
+        worker_count = max(1, (os.cpu_count() or 1) // max(1, fold_jobs))
+    worker_count = max(1, min(worker_count, len(outer_folds)))
+
+    # Read completed folds from the checkpoint folder
+    fold_results = {}
+    checkpoint_files = {}
+    if checkpoint_folder is not None:
+        if os.path.exists(checkpoint_folder) == 0:
+            os.makedirs(checkpoint_folder)
+        run_hash = hashlib.sha256()
+        run_hash.update(np.ascontiguousarray(X_data).tobytes())
+        run_hash.update(np.ascontiguousarray(y_data).tobytes())
+        run_hash.update(json.dumps([str(value) for value in groups]).encode('utf-8'))
+        run_hash.update(json.dumps([predictors, inner_splits, repr(classifier)]).encode('utf-8'))
+        run_key = run_hash.hexdigest()
+        run_file = os.path.join(checkpoint_folder, 'cross_validation.json')
+        if os.path.exists(run_file):
+            with open(run_file, 'r') as run_reader:
+                if json.load(run_reader)['run_key'] != run_key:
+                    raise ValueError(f'Checkpoint folder {checkpoint_folder} belongs to a different cross validation run.')
+        else:
+            with open(run_file, 'w') as run_writer:
+                json.dump({'run_key': run_key, 'folds': len(outer_folds)}, run_writer, indent=2)
+        for iteration in range(1, len(outer_folds) + 1):
+            checkpoint_files[iteration] = os.path.join(checkpoint_folder, f'fold_{iteration:04d}.parquet')
+            if os.path.exists(checkpoint_files[iteration]):
+                fold_results[iteration] = pd.read_parquet(checkpoint_files[iteration])
+        if fold_results:
+            print(f'Resuming from {len(fold_results)} completed outer folds.')
+    pending = [iteration for iteration in range(1, len(outer_folds) + 1) if iteration not in fold_results]
+    print(f'Running {len(pending)} of {len(outer_folds)} outer folds on {worker_count} worker processes...')
+    print('----------')
+
+    # Submit outer folds to the process pool and collect them as they finish
+    total_start = time.time()
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        running = {}
+        for iteration in pending:
+            train_index, test_index = outer_folds[iteration - 1]
+            future = executor.submit(run_outer_fold,
+                                     iteration,
+                                     classifier,
+                                     X_data,
+                                     y_data,
+                                     groups,
+                                     train_index,
+                                     test_index,
+                                     inner_splits,
+                                     checkpoint_files.get(iteration))
+            running[future] = iteration
+        while running:
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                iteration = running.pop(future)
+                fold_results[iteration] = future.result()
+                iteration_elapsed = int(time.time() - total_start)
+                iteration_success_time = datetime.datetime.now()
+                print(f'Completed outer fold {iteration} of {len(outer_folds)} at {iteration_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=iteration_elapsed)})')
+
+    # Concatenate the fold results once in fold order
+    outer_predictions = pd.concat([fold_results[iteration] for iteration in sorted(fold_results)], ignore_index=True)
+    outer_results = input_data.iloc[outer_predictions['row'].to_numpy()].reset_index(drop=True)
+    outer_results = outer_results.assign(absence=outer_predictions['absence'].to_numpy(),
+                                         presence=outer_predictions['presence'].to_numpy(),
+                                         iteration=outer_predictions['iteration'].to_numpy())
+
+    # Convert probability to presence-absence and to selection scaled by the range of each outer fold
+    threshold_values = outer_predictions['threshold'].to_numpy()
+    fold_presence = outer_predictions.groupby('iteration')['presence']
+    outer_results['prediction'] = (outer_results['presence'].to_numpy() >= threshold_values).astype('int32')
+    outer_results['selection'] = selection_values(outer_results['presence'].to_numpy(),
+                                                  threshold_values,
+                                                  fold_presence.transform('max').to_numpy() - threshold_values,
+                                                  threshold_values - fold_presence.transform('min').to_numpy())
+    threshold_list = outer_predictions.groupby('iteration')['threshold'].first().tolist()
+
+    # Report the overall results
+    total_elapsed = int(time.time() - total_start)
+    total_success_time = datetime.datetime.now()
+    print(f'Completed {len(outer_folds)} outer folds at {total_success_time.strftime("%Y-%m-%d %H:%M")} (Elapsed time: {datetime.timedelta(seconds=total_elapsed)})')
+    print('----------')
+    return outer_results, threshold_list
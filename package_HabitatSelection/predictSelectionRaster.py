@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Predict selection raster
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, rasterio, joblib, and scikit-learn.
+# Description: "Predict selection raster" is a function that reads the covariate rasters block by block, predicts presence probability with a trained classifier, converts the probability to selection, and writes the selection raster directly to disk.
+# ---------------------------------------------------------------------------
+
+# Define a block function to predict selection from covariate blocks
+def predict_blocks(input_blocks, study_block, classifier, predictor_index, threshold, presence_column):
+    """
+    Description: predicts selection values for the cells of a block that have data for all covariates
+    Inputs: input_blocks -- a list of masked covariate blocks
+            study_block -- a boolean block that is true inside the study area
+            classifier -- a trained classifier with a predict_proba method
+            predictor_index -- a list containing, for each predictor in model order, the list of input block indices summed to form the predictor
+            threshold -- the presence threshold that separates avoidance from selection
+            presence_column -- the column of the predicted probabilities that represents presence
+    Returned Value: Returns a masked block of selection values
+    Preconditions: predictors must be listed in the order used to train the classifier
+    """
+
+    # Import packages
+    import numpy as np
+    import warnings
+    from package_HabitatSelection.compositeSelection import selection_values
+
+    # Identify cells inside the study area that have data for all covariates
+    valid_block = study_block.copy()
+    for input_block in input_blocks:
+        valid_block &= ~np.ma.getmaskarray(input_block)
+    selection_block = np.zeros(study_block.shape, dtype='float32')
+    if not valid_block.any():
+        return np.ma.masked_array(selection_block, mask=~valid_block)
+
+    # Assemble the predictor matrix for the valid cells
+    X_data = np.empty((int(valid_block.sum()), len(predictor_index)), dtype='float64')
+    for column, block_indices in enumerate(predictor_index):
+        X_data[:, column] = 0
+        for block_index in block_indices:
+            X_data[:, column] += np.ma.getdata(input_blocks[block_index])[valid_block]
+
+    # Predict presence probability and convert to selection, ignoring warnings for predictor arrays without feature names
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        presence_values = classifier.predict_proba(X_data)[:, presence_column]
+    selection_block[valid_block] = selection_values(presence_values, threshold)
+    return np.ma.masked_array(selection_block, mask=~valid_block)
+
+# Define a function to predict a selection raster from covariate rasters
+def predict_selection_raster(**kwargs):
+    """
+    Description: predicts habitat selection from covariate rasters and writes a selection raster
+    Inputs: 'predictors' -- a dictionary of predictor names in model order, each with a list of covariate rasters that are summed to form the predictor
+            'value_type' -- the raster value type (optional, default is '32_BIT_FLOAT')
+            'no_data' -- the raster no data value (optional, default is '-9999')
+            'block_size' -- the number of rows and columns processed per block (optional, default is 1024)
+            'input_array' -- an array containing the study area raster (must be first), the classifier joblib file (must be second), the threshold text file (must be third), and all covariate rasters
+            'output_array' -- an array containing the output selection raster
+    Returned Value: Returns a raster dataset on disk containing the selection values from -1 (avoidance) to 1 (selection)
+    Preconditions: requires a trained classifier, a threshold file, and covariate rasters that overlap the study area
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+    from package_HabitatSelection.compositeSelection import read_threshold
+    from package_GeospatialProcessing.stageProfiling import end_stage
+    from package_GeospatialProcessing.stageProfiling import start_stage
+    import joblib
+
+    # Parse key word argument inputs
+    predictors = kwargs['predictors']
+    value_type = kwargs.get('value_type', '32_BIT_FLOAT')
+    no_data = kwargs.get('no_data', '-9999')
+    block_size = kwargs.get('block_size', 1024)
+    study_area = kwargs['input_array'][0]
+    classifier_file = kwargs['input_array'][1]
+    threshold_file = kwargs['input_array'][2]
+    covariate_rasters = kwargs['input_array'][3:]
+    output_raster = kwargs['output_array'][0]
+
+    # Load the classifier and threshold
+    classifier = joblib.load(classifier_file)
+    threshold = read_threshold(threshold_file)
+    presence_column = list(classifier.classes_).index(1)
+
+    # Order predictors to match the classifier if feature names were stored during training
+    predictor_names = list(predictors)
+    if hasattr(classifier, 'feature_names_in_'):
+        missing_names = [name for name in classifier.feature_names_in_ if name not in predictors]
+        if missing_names:
+            raise ValueError(f'Predictors {missing_names} are required by the classifier.')
+        predictor_names = list(classifier.feature_names_in_)
+
+    # Map each predictor to the covariate rasters that form it
+    predictor_index = []
+    for name in predictor_names:
+        for raster in predictors[name]:
+            if raster not in covariate_rasters:
+                raise ValueError(f'Covariate raster {raster} for predictor {name} must be in the input array.')
+        predictor_index.append([covariate_rasters.index(raster) for raster in predictors[name]])
+
+    # Start timing function
+    stage = start_stage('predict_selection_raster', output=kwargs['output_array'][0])
+    print(f'\tPredicting selection from {len(predictor_names)} predictors...')
+    # Predict selection block by block and save the selection raster to disk
+    block_count = process_raster_blocks(predict_blocks,
+                                        study_area,
+                                        covariate_rasters,
+                                        output_raster,
+                                        value_type,
+                                        no_data,
+                                        block_size,
+                                        classifier=classifier,
+                                        predictor_index=predictor_index,
+                                        threshold=threshold,
+                                        presence_column=presence_column)
+    # End timing and report success
+    end_stage(stage, f'{block_count} blocks')
+    out_process = 'Successfully predicted selection raster.'
+    return out_process
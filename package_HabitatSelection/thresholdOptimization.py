@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Threshold optimization
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy.
+# Description: "Threshold optimization" is a set of functions that calculate the performance of a presence threshold and determine the threshold that minimizes the absolute value difference between sensitivity and specificity. Probabilities are sorted once and true and false positive counts are accumulated so that all candidate thresholds are evaluated in a single pass.
+# ---------------------------------------------------------------------------
+
+# Define a function to count true and false positives at every threshold
+def sweep_thresholds(presence_values, y_test):
+    """
+    Description: sorts presence probabilities once and accumulates the true and false positives at each distinct probability
+    Inputs: presence_values -- an array of presence probabilities
+            y_test -- an array of observed presences (1) and absences (0)
+    Returned Value: Returns a tuple of the distinct probabilities in descending order, the true and false positive counts when each distinct probability is the threshold, and the total presences and absences
+    Preconditions: the observed data must contain presences and absences
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Sort probabilities from highest to lowest
+    presence_values = np.asarray(presence_values, dtype='float64')
+    y_test = np.asarray(y_test) == 1
+    sort_order = np.argsort(-presence_values, kind='mergesort')
+    sorted_values = presence_values[sort_order]
+    sorted_observed = y_test[sort_order]
+
+    # Accumulate positives and keep the counts at the last row of each distinct probability
+    true_positive = np.cumsum(sorted_observed)
+    false_positive = np.cumsum(~sorted_observed)
+    distinct_end = np.r_[np.flatnonzero(np.diff(sorted_values) != 0), len(sorted_values) - 1]
+    total_presence = int(true_positive[-1])
+    total_absence = int(false_positive[-1])
+    if total_presence == 0 or total_absence == 0:
+        raise ValueError('Observed data must contain presences and absences.')
+    return (sorted_values[distinct_end],
+            true_positive[distinct_end],
+            false_positive[distinct_end],
+            total_presence,
+            total_absence)
+
+# Define a function to calculate the area under the receiver operating characteristic curve from a threshold sweep
+def sweep_auc(true_positive, false_positive, total_presence, total_absence):
+    """
+    Description: integrates the receiver operating characteristic curve defined by a threshold sweep with the trapezoidal rule
+    Inputs: true_positive -- the true positive counts in descending threshold order
+            false_positive -- the false positive counts in descending threshold order
+            total_presence -- the total number of presences
+            total_absence -- the total number of absences
+    Returned Value: Returns the AUC
+    Preconditions: counts must be calculated by sweep_thresholds
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Integrate the true positive rate over the false positive rate
+    true_positive_rate = np.r_[0, true_positive] / total_presence
+    false_positive_rate = np.r_[0, false_positive] / total_absence
+    return float(np.sum(np.diff(false_positive_rate) * (true_positive_rate[1:] + true_positive_rate[:-1]) / 2))
+
+# Define a function to calculate performance metrics based on a specified threshold value
+def test_presence_threshold(presence_values, threshold, y_test):
+    """
+    Description: calculates the performance of the presence-absence classification at a threshold
+    Inputs: presence_values -- an array of presence probabilities
+            threshold -- the presence threshold where probabilities greater than or equal to the threshold are presences
+            y_test -- an array of observed presences (1) and absences (0)
+    Returned Value: Returns a tuple of sensitivity, specificity, auc, and accuracy
+    Preconditions: the observed data must contain presences and absences
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Count the true and false positives of the probabilities greater than or equal to the threshold
+    distinct_values, true_positive, false_positive, total_presence, total_absence = sweep_thresholds(presence_values, y_test)
+    classified_count = int(np.searchsorted(-distinct_values, -threshold, side='right'))
+    threshold_true_positive = true_positive[classified_count - 1] if classified_count > 0 else 0
+    threshold_false_positive = false_positive[classified_count - 1] if classified_count > 0 else 0
+
+    # Calculate sensitivity, specificity, auc, and overall accuracy
+    sensitivity = threshold_true_positive / total_presence
+    specificity = (total_absence - threshold_false_positive) / total_absence
+    auc = sweep_auc(true_positive, false_positive, total_presence, total_absence)
+    accuracy = (threshold_true_positive + total_absence - threshold_false_positive) / (total_presence + total_absence)
+    return sensitivity, specificity, auc, accuracy
+
+# Define a function to determine a presence threshold
+def determine_optimal_threshold(presence_values, y_test, threshold_step=None):
+    """
+    Description: determines the presence threshold that minimizes the absolute value difference between sensitivity and specificity
+    Inputs: presence_values -- an array of presence probabilities
+            y_test -- an array of observed presences (1) and absences (0)
+            threshold_step -- the spacing of candidate thresholds between 0 and 1 (optional, default is to test every distinct probability)
+    Returned Value: Returns a tuple of the optimal threshold and its sensitivity, specificity, auc, and accuracy
+    Preconditions: the observed data must contain presences and absences
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Count true and false positives at every distinct probability
+    distinct_values, true_positive, false_positive, total_presence, total_absence = sweep_thresholds(presence_values, y_test)
+    auc = sweep_auc(true_positive, false_positive, total_presence, total_absence)
+
+    # Define the candidate thresholds from lowest to highest and their true and false positive counts
+    if threshold_step is None:
+        # Place each candidate halfway between a distinct probability and the next lower probability
+        lower_values = np.r_[distinct_values[1:], distinct_values[-1]]
+        candidates = ((distinct_values + lower_values) / 2)[::-1]
+        candidate_true_positive = true_positive[::-1]
+        candidate_false_positive = false_positive[::-1]
+    else:
+        # Divide integer steps by the step count so that candidates equal the fractions i / n exactly
+        step_count = int(round(1 / threshold_step))
+        candidates = np.arange(1, step_count + 1) / step_count
+        classified_count = np.searchsorted(-distinct_values, -candidates, side='right')
+        candidate_true_positive = np.r_[0, true_positive][classified_count]
+        candidate_false_positive = np.r_[0, false_positive][classified_count]
+
+    # Find the optimal threshold, preferring the lowest threshold among ties
+    sensitivity_list = candidate_true_positive / total_presence
+    specificity_list = (total_absence - candidate_false_positive) / total_absence
+    optimal_index = int(np.argmin(np.absolute(sensitivity_list - specificity_list)))
+    threshold = float(candidates[optimal_index])
+
+    # Calculate the performance of the optimal threshold
+    sensitivity = float(sensitivity_list[optimal_index])
+    specificity = float(specificity_list[optimal_index])
+    accuracy = float((candidate_true_positive[optimal_index] + total_absence - candidate_false_positive[optimal_index])
+                     / (total_presence + total_absence))
+    return threshold, sensitivity, specificity, auc, accuracy
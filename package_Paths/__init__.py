@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Initialization for Paths Module
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Python functions must be executed in a Python 3.6+ installation with numpy, pandas, and rasterio. R functions are loaded separately through init.R.
+# Description: This initialization file imports Python modules in the package so that the contents are accessible.
+# ---------------------------------------------------------------------------
+
+# Import functions from modules
+from package_Paths.simulateRandomPaths import read_habitat_mask
+from package_Paths.simulateRandomPaths import read_random_sample
+from package_Paths.simulateRandomPaths import simulate_random_paths
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Simulate random paths
+# Author: Timm Nawrocki, Amanda Droghini
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, pandas, and rasterio.
+# Description: "Simulate random paths" is a set of functions that generate random movement paths from random start points by drawing all bearings and step lengths at once as arrays of paths by steps and accumulating them into coordinates. Paths can be constrained to a habitat mask, in which case steps that leave the mask are redrawn in batches.
+# ---------------------------------------------------------------------------
+
+# Define a function to read a random sample written by the generate distributions script
+def read_random_sample(input_file):
+    """
+    Description: reads a single column of random numbers from a csv file without a header
+    Inputs: input_file -- path to the csv file
+    Returned Value: Returns a float array of random numbers
+    Preconditions: the csv file must be written by 01-generateDistributions.R
+    """
+
+    # Import packages
+    import pandas as pd
+
+    # Read the single column of numbers
+    return pd.read_csv(input_file, header=None).iloc[:, 0].to_numpy(dtype='float64')
+
+# Define a function to read a habitat mask into memory
+def read_habitat_mask(study_area, mask_rasters=None, block_size=2048):
+    """
+    Description: reads the study area and mask rasters into a boolean grid that is true where paths are allowed
+    Inputs: study_area -- path to the study area raster
+            mask_rasters -- a list of mask rasters that have data where paths are allowed (optional)
+            block_size -- the number of rows and columns read per block (optional, default is 2048)
+    Returned Value: Returns a dictionary containing the boolean 'valid' grid and the grid 'transform'
+    Preconditions: the grid is held in memory with one byte per study area cell
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import iterate_blocks
+    from package_GeospatialProcessing.rasterBlocks import open_aligned
+    import numpy as np
+    import rasterio
+
+    # Read the study area and mask rasters block by block
+    mask_rasters = mask_rasters or []
+    with rasterio.open(study_area) as study_dataset:
+        valid_grid = np.zeros(study_dataset.shape, dtype=bool)
+        mask_datasets = [open_aligned(raster, study_dataset) for raster in mask_rasters]
+        try:
+            for window in iterate_blocks(study_dataset.width, study_dataset.height, block_size):
+                valid_block = ~np.ma.getmaskarray(study_dataset.read(1, window=window, masked=True))
+                for dataset in mask_datasets:
+                    valid_block &= ~np.ma.getmaskarray(dataset.read(1, window=window, masked=True))
+                valid_grid[window.row_off:window.row_off + window.height,
+                           window.col_off:window.col_off + window.width] = valid_block
+        finally:
+            for dataset in mask_datasets:
+                source_dataset = getattr(dataset, 'src_dataset', None)
+                dataset.close()
+                if source_dataset is not None:
+                    source_dataset.close()
+        return {'valid': valid_grid, 'transform': study_dataset.transform}
+
+# Define a function to test coordinates against a habitat mask
+def in_habitat_mask(habitat_mask, x_coordinates, y_coordinates):
+    """
+    Description: identifies the coordinates that fall in allowed cells of a habitat mask
+    Inputs: habitat_mask -- a habitat mask read by read_habitat_mask
+            x_coordinates -- an array of x coordinates
+            y_coordinates -- an array of y coordinates
+    Returned Value: Returns a boolean array that is true for coordinates in allowed cells
+    Preconditions: coordinates must be in the coordinate system of the habitat mask
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Convert coordinates to rows and columns
+    valid_grid = habitat_mask['valid']
+    columns, rows = (~habitat_mask['transform']) * (np.asarray(x_coordinates, dtype='float64'),
+                                                    np.asarray(y_coordinates, dtype='float64'))
+    rows = np.floor(rows).astype('int64')
+    columns = np.floor(columns).astype('int64')
+
+    # Look up allowed cells inside the grid
+    inside = (rows >= 0) & (rows < valid_grid.shape[0]) & (columns >= 0) & (columns < valid_grid.shape[1])
+    allowed = np.zeros(rows.shape, dtype=bool)
+    allowed[inside] = valid_grid[rows[inside], columns[inside]]
+    return allowed
+
+# Define a function to sample start points for each path
+def sample_start_points(start_points, path_info, random_state, habitat_mask=None):
+    """
+    Description: samples start points without replacement from the random start points of each deployment
+    Inputs: start_points -- a data frame of random start points with 'deployment_id', 'POINT_X', and 'POINT_Y' columns
+            path_info -- a data frame with one row per moose-year containing 'mooseYear_id', 'deployment_id', and 'number_of_paths'
+            random_state -- a numpy random state
+            habitat_mask -- a habitat mask read by read_habitat_mask that excludes start points outside allowed cells (optional)
+    Returned Value: Returns a tuple of x and y start coordinate arrays ordered by moose-year and path
+    Preconditions: each deployment must have at least as many allowed start points as paths requested for each of its moose-years
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Remove start points outside the habitat mask
+    if habitat_mask is not None:
+        start_points = start_points[in_habitat_mask(habitat_mask,
+                                                    start_points['POINT_X'].to_numpy(),
+                                                    start_points['POINT_Y'].to_numpy())]
+
+    # Group start points by deployment
+    start_groups = {deployment: group[['POINT_X', 'POINT_Y']].to_numpy(dtype='float64')
+                    for deployment, group in start_points.groupby('deployment_id')}
+
+    # Sample start points for each moose-year
+    start_coordinates = []
+    for moose_year, deployment, number_of_paths in path_info[['mooseYear_id', 'deployment_id', 'number_of_paths']].itertuples(index=False):
+        deployment_points = start_groups.get(deployment, np.empty((0, 2)))
+        if len(deployment_points) < number_of_paths:
+            raise ValueError(f'Moose-year {moose_year} requires {number_of_paths} start points but deployment {deployment} has {len(deployment_points)}.')
+        start_coordinates.append(deployment_points[random_state.choice(len(deployment_points), number_of_paths, replace=False)])
+    start_coordinates = np.concatenate(start_coordinates)
+    return start_coordinates[:, 0], start_coordinates[:, 1]
+
+# Define a function to draw random steps
+def draw_steps(bearings, distances, path_status, step_count, random_state):
+    """
+    Description: draws random bearings and step lengths for a set of paths, using the step lengths of the calf status of each path
+    Inputs: bearings -- an array of random bearings in radians measured clockwise from north
+            distances -- a dictionary of calf status values and arrays of random step lengths in meters
+            path_status -- an array of the calf status of each path
+            step_count -- the number of steps drawn for each path
+            random_state -- a numpy random state
+    Returned Value: Returns a tuple of bearing and step length arrays with shape (number of paths, step count)
+    Preconditions: step lengths must be provided for every calf status
+    """
+
+    # Import packages
+    import numpy as np
+
+    # Draw bearings for all paths and step lengths for the paths of each calf status
+    step_bearings = bearings[random_state.randint(0, len(bearings), size=(len(path_status), step_count))]
+    step_distances = np.empty((len(path_status), step_count), dtype='float64')
+    for status, status_distances in distances.items():
+        status_paths = np.flatnonzero(path_status == status)
+        step_distances[status_paths] = status_distances[random_state.randint(0, len(status_distances),
+                                                                             size=(len(status_paths), step_count))]
+    return step_bearings, step_distances
+
+# Define a function to simulate random paths
+def simulate_random_paths(start_points, path_info, bearings, distances, seed=None, habitat_mask=None, max_attempts=1000):
+    """
+    Description: generates random paths with the same number of points as the observed path of each moose-year using random bearings and step lengths
+    Inputs: start_points -- a data frame of random start points with 'deployment_id', 'POINT_X', and 'POINT_Y' columns
+            path_info -- a data frame with one row per moose-year containing 'mooseYear_id', 'deployment_id', 'calfStatus', 'length', and 'number_of_paths'
+            bearings -- an array of random bearings in radians measured clockwise from north
+            distances -- a dictionary of calf status values and arrays of random step lengths in meters
+            seed -- the seed of the random state (optional)
+            habitat_mask -- a habitat mask read by read_habitat_mask that all start points and steps must fall in (optional)
+            max_attempts -- the number of times a step that leaves the habitat mask is redrawn before failing (optional, default is 1000)
+    Returned Value: Returns a data frame with one row per path point containing 'mooseYear_id', 'pathID', 'pointID', 'x', 'y', 'fullPath_id', 'fullPoint_id', 'calfStatus', and 'deployment_id'
+    Preconditions: coordinates must be in a projected coordinate system with units of meters (EPSG:3338)
+    """
+
+    # Import packages
+    import numpy as np
+    import pandas as pd
+
+    # Define the paths and the number of steps per path
+    random_state = np.random.RandomState(seed)
+    path_info = path_info.reset_index(drop=True)
+    number_of_paths = path_info['number_of_paths'].to_numpy(dtype='int64')
+    path_year = np.repeat(np.arange(len(path_info)), number_of_paths)
+    path_length = path_info['length'].to_numpy(dtype='int64')[path_year]
+    path_status = path_info['calfStatus'].to_numpy()[path_year]
+    step_count = int(path_length.max()) - 1
+    missing_status = set(np.unique(path_status)) - set(distances)
+    if missing_status:
+        raise ValueError(f'Step lengths must be provided for calf status values {sorted(missing_status)}.')
+
+    # Sample start points
+    start_x, start_y = sample_start_points(start_points, path_info, random_state, habitat_mask)
+    path_x = np.full((len(path_year), step_count + 1), np.nan, dtype='float64')
+    path_y = np.full((len(path_year), step_count + 1), np.nan, dtype='float64')
+    path_x[:, 0] = start_x
+    path_y[:, 0] = start_y
+
+    # Without a habitat mask, draw all steps as arrays of paths by steps and accumulate them into coordinates
+    if habitat_mask is None:
+        step_bearings, step_distances = draw_steps(bearings, distances, path_status, step_count, random_state)
+        np.cumsum(step_distances * np.sin(step_bearings), axis=1, out=path_x[:, 1:])
+        np.cumsum(step_distances * np.cos(step_bearings), axis=1, out=path_y[:, 1:])
+        path_x[:, 1:] += start_x[:, np.newaxis]
+        path_y[:, 1:] += start_y[:, np.newaxis]
+    # With a habitat mask, take each step for all paths at once and redraw the steps that leave the mask
+    else:
+        for step in range(step_count):
+            pending_paths = np.flatnonzero(path_length > step + 1)
+            attempt = 0
+            while len(pending_paths) > 0:
+                if attempt == max_attempts:
+                    raise ValueError(f'{len(pending_paths)} paths could not take step {step + 1} inside the habitat mask after {max_attempts} attempts.')
+                step_bearings, step_distances = draw_steps(bearings, distances, path_status[pending_paths], 1, random_state)
+                next_x = path_x[pending_paths, step] + step_distances[:, 0] * np.sin(step_bearings[:, 0])
+                next_y = path_y[pending_paths, step] + step_distances[:, 0] * np.cos(step_bearings[:, 0])
+                allowed = in_habitat_mask(habitat_mask, next_x, next_y)
+                path_x[pending_paths[allowed], step + 1] = next_x[allowed]
+                path_y[pending_paths[allowed], step + 1] = next_y[allowed]
+                pending_paths = pending_paths[~allowed]
+                attempt += 1
+
+    # Keep the points within the length of each path
+    point_mask = np.arange(step_count + 1)[np.newaxis, :] < path_length[:, np.newaxis]
+    point_path, point_index = np.nonzero(point_mask)
+    path_number = np.arange(len(path_year)) - np.repeat(np.cumsum(number_of_paths) - number_of_paths, number_of_paths) + 1
+
+    # Create the output data frame
+    moose_years = path_info['mooseYear_id'].to_numpy()[path_year][point_path]
+    paths_data = pd.DataFrame({'mooseYear_id': moose_years,
+                               'pathID': path_number[point_path],
+                               'pointID': point_index + 1,
+                               'x': path_x[point_mask],
+                               'y': path_y[point_mask]})
+    paths_data['fullPath_id'] = paths_data['mooseYear_id'].astype(str) + '-' + paths_data['pathID'].astype(str)
+    paths_data['fullPoint_id'] = paths_data['fullPath_id'] + '-' + paths_data['pointID'].astype(str)
+    paths_data['calfStatus'] = path_status[point_path]
+    paths_data['deployment_id'] = path_info['deployment_id'].to_numpy()[path_year][point_path]
+    return paths_data
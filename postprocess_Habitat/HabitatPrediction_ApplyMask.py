@@ -2,16 +2,15 @@
 # ---------------------------------------------------------------------------
 # Apply mask to habitat prediction
 # Author: Timm Nawrocki
-# Last Updated: 2021-06-30
-# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation.
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy and rasterio, or in an ArcGIS Pro Python 3.6 installation with the arcpy backend.
 # Description: "Apply mask to habitat prediction" extracts the habitat prediction to a mask raster of the study area excluding areas mapped as water in the NLCD 2016.
 # ---------------------------------------------------------------------------
 
 # Import packages
-import arcpy
 import os
-from package_GeospatialProcessing import arcpy_geoprocessing
 from package_GeospatialProcessing import extract_to_boundary
+from package_GeospatialProcessing.outputCache import cached_geoprocessing
 
 # Set root directory
 drive = 'N:/'
@@ -19,7 +18,6 @@ root_folder = 'ACCS_Work'
 
 # Define data folder
 data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
-work_geodatabase = os.path.join(data_folder, 'Moose_SouthwestAlaska.gdb')
 
 # Define input rasters
 raster_mask = os.path.join(data_folder, 'Data_Input/waterice_mask.tif')
@@ -46,25 +44,18 @@ for raster in input_rasters:
         raster_output = os.path.join(data_folder,
                                      f'Data_Output/data_package/version_1.0_20210630/NoCalf/rasters/{base_name}')
 
-    # If output raster does not already exist, create output raster
-    if arcpy.Exists(raster_output) == 0:
-        # Define input and output arrays
-        extract_inputs = [raster, raster_mask, study_area]
-        extract_outputs = [raster_output]
+    # Define input and output arrays
+    extract_inputs = [raster, raster_mask, study_area]
+    extract_outputs = [raster_output]
 
-        # Create key word arguments
-        extract_kwargs = {'no_data_replace': '',
-                          'work_geodatabase': work_geodatabase,
-                          'input_array': extract_inputs,
-                          'output_array': extract_outputs
-                          }
+    # Create key word arguments
+    extract_kwargs = {'no_data_replace': '',
+                      'input_array': extract_inputs,
+                      'output_array': extract_outputs
+                      }
 
-    # Combine raster tiles
+    # Extract raster to mask if the output does not exist or its inputs have changed
     print(f'Extracting raster {count} of {len(input_rasters)} to mask...')
-    arcpy_geoprocessing(extract_to_boundary, **extract_kwargs)
-    print('----------')
-    count += 1
-else:
-    print(f'Output raster {count} of {len(input_rasters)} already exists.')
+    cached_geoprocessing(extract_to_boundary, **extract_kwargs)
     print('----------')
     count += 1
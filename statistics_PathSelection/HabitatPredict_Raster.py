@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Predict habitat selection raster
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an ArcGIS Pro Python 3.6 installation with rasterio and scikit-learn.
+# Description: "Predict habitat selection raster" applies the trained classifier and threshold directly to the covariate rasters to create the selection raster for each calf status without intermediate grid tables.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import os
+from package_GeospatialProcessing.outputCache import cached_geoprocessing
+from package_HabitatSelection import predict_selection_raster
+
+# Set root directory
+drive = 'N:/'
+root_folder = 'ACCS_Work'
+
+# Define data folders
+data_folder = os.path.join(drive, root_folder, 'Projects/WildlifeEcology/Moose_SouthwestAlaska/Data')
+topography_folder = os.path.join(data_folder, 'Data_Input/topography')
+edge_folder = os.path.join(data_folder, 'Data_Input/edge_distance')
+vegetation_folder = os.path.join(data_folder, 'Data_Input/vegetation')
+
+# Define study area
+study_area = os.path.join(data_folder, 'Data_Input/southwestAlaska_StudyArea.tif')
+
+# Define predictors in model order and the covariate rasters that are summed to form each predictor
+predictors = {'elevation': [os.path.join(topography_folder, 'elevation.tif')],
+              'roughness': [os.path.join(topography_folder, 'roughness.tif')],
+              'forest_edge': [os.path.join(edge_folder, 'southwestAlaska_ForestEdge.tif')],
+              'tundra_edge': [os.path.join(edge_folder, 'southwestAlaska_TundraEdge.tif')],
+              'alnus': [os.path.join(vegetation_folder, 'alnus.tif')],
+              'betshr': [os.path.join(vegetation_folder, 'betshr.tif')],
+              'dectre': [os.path.join(vegetation_folder, 'dectre.tif')],
+              'empnig': [os.path.join(vegetation_folder, 'empnig.tif')],
+              'erivag': [os.path.join(vegetation_folder, 'erivag.tif')],
+              'picea': [os.path.join(vegetation_folder, 'picgla.tif'),
+                        os.path.join(vegetation_folder, 'picmar.tif')],
+              'rhoshr': [os.path.join(vegetation_folder, 'rhoshr.tif')],
+              'salshr': [os.path.join(vegetation_folder, 'salshr.tif')],
+              'sphagn': [os.path.join(vegetation_folder, 'sphagn.tif')],
+              'vaculi': [os.path.join(vegetation_folder, 'vaculi.tif')],
+              'vacvit': [os.path.join(vegetation_folder, 'vacvit.tif')],
+              'wetsed': [os.path.join(vegetation_folder, 'wetsed.tif')]}
+
+# Create a list of unique covariate rasters
+covariate_rasters = []
+for rasters in predictors.values():
+    for raster in rasters:
+        if raster not in covariate_rasters:
+            covariate_rasters.append(raster)
+
+# Define calf status groups
+map_groups = ['Calf', 'NoCalf']
+
+# Loop through each calf status and predict the selection raster
+count = 1
+for map_group in map_groups:
+    # Define model folder
+    model_folder = os.path.join(data_folder, 'Data_Output/model_results/round_20210702', map_group)
+    # Define output folder
+    output_folder = os.path.join(data_folder, 'Data_Output/rasters_merged/round_20210702', map_group)
+    if os.path.exists(output_folder) == 0:
+        os.makedirs(output_folder)
+
+    # Define input and output arrays
+    predict_inputs = [study_area,
+                      os.path.join(model_folder, 'classifier.joblib'),
+                      os.path.join(model_folder, 'threshold.txt')] + covariate_rasters
+    predict_outputs = [os.path.join(output_folder, f'SouthwestAlaska_Moose_Calving_{map_group}.tif')]
+
+    # Create key word arguments
+    predict_kwargs = {'predictors': predictors,
+                      'value_type': '32_BIT_FLOAT',
+                      'no_data': '-9999',
+                      'input_array': predict_inputs,
+                      'output_array': predict_outputs
+                      }
+
+    # Predict selection raster if the output does not exist or its inputs have changed
+    print(f'Predicting selection raster {count} of {len(map_groups)}...')
+    cached_geoprocessing(predict_selection_raster, **predict_kwargs)
+    print('----------')
+    count += 1
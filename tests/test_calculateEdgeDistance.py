@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Test calculate edge distance
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, scipy, rasterio, and pytest from the repository root.
+# Description: "Test calculate edge distance" compares the minimum inverse density-weighted distance to a brute force minimum over all source cells on small grids, compares incremental updates of edge rasters to full recalculations, and compares bounded tiles with halos to the full calculation saturated at the maximum distance.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import numpy as np
+import pytest
+from package_GeospatialProcessing.calculateEdgeDistance import minimum_weighted_distance
+from package_GeospatialProcessing.calculateEdgeDistance import weighted_edge_distance
+
+# Define a function to calculate the minimum inverse density-weighted distance by brute force
+def brute_force_edge_distance(cover_array, cell_size, minimum_cover):
+    """
+    Description: calculates the minimum of the euclidean distance to every source cell multiplied by 100 divided by its cover value
+    Inputs: cover_array -- a two-dimensional integer array of foliar cover values
+            cell_size -- the cell size of the array in map units
+            minimum_cover -- the minimum foliar cover value that is treated as a source
+    Returned Value: Returns a float32 array of distances (infinite where no source exists)
+    Preconditions: none
+    """
+
+    # Measure the distance from every cell to every source cell
+    row_index, column_index = np.indices(cover_array.shape)
+    edge_array = np.full(cover_array.shape, np.inf)
+    for source_row, source_column in zip(*np.nonzero(cover_array >= minimum_cover)):
+        distance_array = np.sqrt(((row_index - source_row) * cell_size) ** 2.0
+                                 + ((column_index - source_column) * cell_size) ** 2.0)
+        distance_array *= 100 / cover_array[source_row, source_column]
+        np.minimum(edge_array, distance_array, out=edge_array)
+    return edge_array.astype('float32')
+
+# Define a function to create a sparse cover array
+def create_cover_array(seed, shape, source_share=0.03):
+    """
+    Description: creates a random cover array in which a share of the cells hold cover values up to 100
+    Inputs: seed -- the seed of the random generator
+            shape -- the number of rows and columns of the array
+            source_share -- the share of cells with cover (optional, default is 0.03)
+    Returned Value: Returns an int32 cover array
+    Preconditions: none
+    """
+
+    # Keep the cover of a random share of the cells
+    random_generator = np.random.default_rng(seed)
+    cover_array = random_generator.integers(0, 101, shape).astype('int32')
+    cover_array[random_generator.random(shape) >= source_share] = 0
+    return cover_array
+
+# Test that the edge distance equals the brute force minimum
+@pytest.mark.parametrize('seed', range(5))
+def test_weighted_edge_distance_is_exact(seed):
+    # Calculate the edge distance of a sparse grid that includes values below the minimum cover
+    cover_array = create_cover_array(seed, (23, 31), source_share=0.05)
+    edge_array = weighted_edge_distance(cover_array, 30, minimum_cover=10)
+    np.testing.assert_array_equal(edge_array, brute_force_edge_distance(cover_array, 30, 10))
+
+# Test that converting the feature transform in bands of rows does not change the distances
+@pytest.mark.parametrize('band_cells', [1, 31, 100, 1048576])
+def test_minimum_weighted_distance_bands(band_cells):
+    # Calculate the weighted distance to a single cover value with different band sizes
+    cover_array = create_cover_array(7, (23, 31))
+    source_value = int(cover_array.max())
+    edge_array = np.full(cover_array.shape, np.inf, dtype='float32')
+    feature_array = np.empty((2,) + cover_array.shape, dtype='int32')
+    minimum_weighted_distance(cover_array != source_value, 100 / source_value, 30, edge_array, feature_array, band_cells)
+    source_array = np.where(cover_array == source_value, source_value, 0)
+    np.testing.assert_array_equal(edge_array, brute_force_edge_distance(source_array, 30, source_value))
+
+# Test that a grid without sources has infinite distances
+def test_weighted_edge_distance_without_sources():
+    cover_array = np.full((5, 7), 9, dtype='int32')
+    assert np.isinf(weighted_edge_distance(cover_array, 30, minimum_cover=10)).all()
+
+# Define a function to write a single band raster on a small test grid
+def write_test_raster(output_raster, input_array, no_data):
+    """
+    Description: writes an array to a GeoTIFF on a grid with a cell size of 30
+    Inputs: output_raster -- path to the output raster
+            input_array -- a two-dimensional array
+            no_data -- the no data value of the raster
+    Returned Value: Returns the output raster path
+    Preconditions: none
+    """
+
+    # Import packages
+    from rasterio.transform import from_origin
+    import rasterio
+
+    # Write the array
+    with rasterio.open(output_raster, 'w', driver='GTiff', width=input_array.shape[1], height=input_array.shape[0],
+                       count=1, dtype=input_array.dtype, nodata=no_data, crs='EPSG:3338',
+                       transform=from_origin(0, 30 * input_array.shape[0], 30, 30)) as raster_dataset:
+        raster_dataset.write(input_array, 1)
+    return output_raster
+
+# Define a function to calculate an edge raster and read it
+def read_edge_raster(study_area, cover_raster, output_raster, **kwargs):
+    """
+    Description: calculates the edge raster of a cover raster with a minimum cover of 10 and reads the output
+    Inputs: study_area -- path to the study area raster
+            cover_raster -- path to the cover raster
+            output_raster -- path to the output edge raster
+            **kwargs -- additional key word arguments for calculate_edge_distance
+    Returned Value: Returns the output array
+    Preconditions: none
+    """
+
+    # Import packages
+    from package_GeospatialProcessing.calculateEdgeDistance import calculate_edge_distance
+    import rasterio
+
+    # Calculate and read the edge raster
+    calculate_edge_distance(minimum_cover=10,
+                            value_type='32_BIT_SIGNED',
+                            no_data='-999',
+                            input_array=[study_area, cover_raster],
+                            output_array=[output_raster],
+                            **kwargs)
+    with rasterio.open(output_raster) as edge_dataset:
+        return edge_dataset.read(1)
+
+# Define a fixture that writes a study area with no data along its edges
+@pytest.fixture
+def study_area(tmp_path):
+    study_array = np.ones((60, 80), dtype='uint8')
+    study_array[:4, :] = 0
+    study_array[:, -6:] = 0
+    return write_test_raster(str(tmp_path / 'study_area.tif'), study_array, 0)
+
+# Test that incremental updates after adding and removing sources equal a full recalculation
+@pytest.mark.parametrize('maximum_distance', [None, 600])
+def test_incremental_update_matches_full(tmp_path, study_area, capsys, maximum_distance):
+    # Calculate the first edge raster and its source snapshot
+    cover_raster = str(tmp_path / 'cover.tif')
+    incremental_raster = str(tmp_path / 'edge_incremental.tif')
+    cover_array = create_cover_array(11, (60, 80))
+    write_test_raster(cover_raster, cover_array, 255)
+    read_edge_raster(study_area, cover_raster, incremental_raster, incremental=True, maximum_distance=maximum_distance)
+
+    # Add sources, remove sources, and lower cover in two successive updates
+    random_generator = np.random.default_rng(12)
+    for update_index in range(2):
+        source_cells = np.flatnonzero(cover_array >= 10)
+        cover_array.ravel()[random_generator.choice(source_cells, 8, replace=False)] = 0
+        cover_array.ravel()[random_generator.choice(source_cells, 4, replace=False)] = 10
+        cover_array.ravel()[random_generator.choice(cover_array.size, 8, replace=False)] = random_generator.integers(10, 101, 8)
+        write_test_raster(cover_raster, cover_array, 255)
+        capsys.readouterr()
+        incremental_array = read_edge_raster(study_area, cover_raster, incremental_raster, incremental=True,
+                                             maximum_distance=maximum_distance)
+        assert 'Updating inverse density-weighted distance' in capsys.readouterr().out
+
+        # Compare the update to a full recalculation
+        full_array = read_edge_raster(study_area, cover_raster, str(tmp_path / f'edge_full_{update_index}.tif'),
+                                      maximum_distance=maximum_distance)
+        np.testing.assert_array_equal(incremental_array, full_array)
+
+# Test that bounded tiles with halos equal the full calculation saturated at the maximum distance
+@pytest.mark.parametrize('block_size, workers, mask_sources', [(16, 2, False), (16, 2, True), (7, 1, False)])
+def test_bounded_tiles_match_saturated_full(tmp_path, study_area, block_size, workers, mask_sources):
+    # Calculate the full edge raster and the bounded edge raster in tiles much smaller than the grid
+    cover_raster = write_test_raster(str(tmp_path / 'cover.tif'), create_cover_array(13, (60, 80), source_share=0.01), 255)
+    full_array = read_edge_raster(study_area, cover_raster, str(tmp_path / 'edge_full.tif'), mask_sources=mask_sources)
+    bounded_array = read_edge_raster(study_area, cover_raster, str(tmp_path / 'edge_bounded.tif'),
+                                     mask_sources=mask_sources, maximum_distance=200, block_size=block_size,
+                                     workers=workers)
+
+    # Compare the distances, where cells outside the study area remain no data
+    assert (full_array != -999).any() and (full_array > 200).any()
+    np.testing.assert_array_equal(bounded_array, np.where(full_array == -999, -999, np.minimum(full_array, 200)))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Test compact forest
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy, scikit-learn, joblib, and pytest from the repository root.
+# Description: "Test compact forest" exports a small random forest classifier to a compact forest and compares the predictions of the memory-mapped node arrays to the class probabilities of the classifier.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import numpy as np
+import pytest
+from package_HabitatSelection.compactForest import export_forest
+from package_HabitatSelection.compactForest import get_forest_header_path
+from package_HabitatSelection.compactForest import open_forest
+from package_HabitatSelection.compactForest import predict_forest
+
+# Define a fixture that exports a small random forest classifier and returns it with its compact forest and test data
+@pytest.fixture(scope='module')
+def exported_forest(tmp_path_factory):
+    # Import packages
+    from sklearn.ensemble import RandomForestClassifier
+    import joblib
+
+    # Train a forest on presences that depend on several predictors, including values that fall on thresholds
+    random_generator = np.random.default_rng(0)
+    X_train = np.round(random_generator.normal(size=(600, 6)), 2)
+    y_train = ((X_train[:, 0] + X_train[:, 1] * X_train[:, 2] + random_generator.normal(scale=0.5, size=600)) > 0)
+    classifier = RandomForestClassifier(n_estimators=50, max_depth=12, random_state=0)
+    classifier.fit(X_train, y_train.astype('int32'))
+
+    # Export the classifier to a compact forest
+    forest_folder = tmp_path_factory.mktemp('forest')
+    classifier_file = str(forest_folder / 'classifier.joblib')
+    forest_file = str(forest_folder / 'classifier_forest.bin')
+    joblib.dump(classifier, classifier_file)
+    export_forest(input_array=[classifier_file], output_array=[forest_file, get_forest_header_path(forest_file)])
+    X_test = np.concatenate([np.round(random_generator.normal(size=(1000, 6)), 2), X_train[:200]])
+    return classifier, open_forest(forest_file), X_test
+
+# Test that the compact forest predictions match the classifier probabilities across batch sizes and thread counts
+@pytest.mark.parametrize('batch_size, thread_count', [(16384, 1), (97, 1), (97, 3), (1, 2)])
+def test_predict_forest_matches_predict_proba(exported_forest, batch_size, thread_count):
+    # Compare the predictions of the compact forest to the classifier
+    classifier, forest, X_test = exported_forest
+    X_data = X_test[:150] if batch_size == 1 else X_test
+    forest_probabilities = predict_forest(forest, X_data, batch_size=batch_size, thread_count=thread_count)
+    assert forest['header']['classes'] == classifier.classes_.tolist()
+    assert forest_probabilities.shape == (X_data.shape[0], len(classifier.classes_))
+    np.testing.assert_allclose(forest_probabilities, classifier.predict_proba(X_data), rtol=0, atol=1e-6)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Test raster statistics
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in a Python 3.6+ installation with numpy, rasterio, and pytest from the repository root.
+# Description: "Test raster statistics" compares the streaming statistics of signed and unsigned blocks to numpy counts and checks that block processing writes statistics for signed outputs that span most of their value range.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import numpy as np
+import pytest
+from package_GeospatialProcessing.rasterStatistics import create_statistics
+from package_GeospatialProcessing.rasterStatistics import update_statistics
+
+# Test that the histogram of signed and unsigned blocks matches numpy counts
+@pytest.mark.parametrize('value_type, data_type, minimum, maximum', [('8_BIT_SIGNED', 'int8', -120, 120),
+                                                                     ('16_BIT_SIGNED', 'int16', -20000, 20000),
+                                                                     ('16_BIT_UNSIGNED', 'uint16', 0, 60000),
+                                                                     ('32_BIT_SIGNED', 'int32', -50000, 10000)])
+def test_update_statistics_matches_counts(value_type, data_type, minimum, maximum):
+    # Create two masked blocks whose values span most of the range of the data type
+    random_generator = np.random.default_rng(0)
+    blocks = []
+    for block_index in range(2):
+        block_values = random_generator.integers(minimum, maximum, (64, 64), endpoint=True).astype(data_type)
+        block_values[0, 0] = minimum
+        block_values[-1, -1] = maximum
+        blocks.append(np.ma.masked_array(block_values, mask=random_generator.random((64, 64)) < 0.1))
+
+    # Add the blocks to the statistics and compare them to the counts of all unmasked values
+    statistics = create_statistics(value_type, None, 64, 128)
+    for block in blocks:
+        update_statistics(statistics, block)
+    data_values = np.concatenate([block.compressed() for block in blocks]).astype('int64')
+    count_values, value_counts = np.unique(data_values, return_counts=True)
+    assert statistics['minimum'] == minimum
+    assert statistics['maximum'] == maximum
+    assert statistics['data_count'] == data_values.size
+    assert statistics['no_data_count'] == 2 * 64 * 64 - data_values.size
+    assert statistics['histogram'] == dict(zip(count_values.tolist(), value_counts.tolist()))
+
+# Define a block function that returns the signed values of the first input
+def copy_block(input_blocks, study_block, **kwargs):
+    return input_blocks[0]
+
+# Test that block processing writes a signed output and its statistics sidecar
+def test_process_raster_blocks_signed_output(tmp_path):
+    # Import packages
+    from package_GeospatialProcessing.rasterBlocks import process_raster_blocks
+    from package_GeospatialProcessing.rasterStatistics import read_raster_statistics
+    from rasterio.transform import from_origin
+    import rasterio
+
+    # Write a study area and a signed 16-bit input that spans most of the value range
+    profile = {'driver': 'GTiff', 'width': 100, 'height': 80, 'count': 1, 'crs': 'EPSG:3338',
+               'transform': from_origin(0, 8000, 100, 100)}
+    study_area = str(tmp_path / 'study_area.tif')
+    input_raster = str(tmp_path / 'input.tif')
+    output_raster = str(tmp_path / 'output.tif')
+    with rasterio.open(study_area, 'w', dtype='uint8', nodata=0, **profile) as study_dataset:
+        study_dataset.write(np.ones((80, 100), dtype='uint8'), 1)
+    input_array = np.random.default_rng(1).integers(-20000, 20000, (80, 100)).astype('int16')
+    with rasterio.open(input_raster, 'w', dtype='int16', nodata=-32768, **profile) as input_dataset:
+        input_dataset.write(input_array, 1)
+
+    # Copy the input in small blocks and compare the output and its statistics
+    process_raster_blocks(copy_block, study_area, [input_raster], output_raster, '16_BIT_SIGNED', -32768,
+                          block_size=32)
+    with rasterio.open(output_raster) as output_dataset:
+        assert np.array_equal(output_dataset.read(1), input_array)
+    statistics = read_raster_statistics(output_raster, calculate=False)
+    assert statistics['minimum'] == int(input_array.min())
+    assert statistics['maximum'] == int(input_array.max())
+    assert sum(statistics['histogram'].values()) == input_array.size
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Test threshold optimization
+# Author: Timm Nawrocki
+# Last Updated: 2026-10-18
+# Usage: Must be executed in an Anaconda 3 installation with numpy, scikit-learn, and pytest from the repository root.
+# Description: "Test threshold optimization" compares the sorted threshold sweep on a grid of 0.001 to a copy of the threshold loop that it replaced, using probabilities that fall exactly on the grid as they do for a random forest of 1000 trees. The loop tested the threshold (i + 1) / 1000 at list index i but returned i / 1000, which is 0.001 below the threshold that it minimized, so the sweep is expected to select thresholds 0.001 higher than the loop returned.
+# ---------------------------------------------------------------------------
+
+# Import packages
+import numpy as np
+import pytest
+from package_HabitatSelection.thresholdOptimization import determine_optimal_threshold
+
+# Define a function to calculate performance metrics at a threshold from the counts of true and false positives and negatives
+def count_threshold_metrics(presence_values, threshold, y_test):
+    """
+    Description: calculates the sensitivity, specificity, and accuracy of a presence threshold from the same counts that the confusion matrix of the previous loop contained
+    Inputs: presence_values -- an array of presence probabilities
+            threshold -- the presence threshold
+            y_test -- an array of observed presences (1) and absences (0)
+    Returned Value: Returns a tuple of the sensitivity, specificity, and accuracy
+    Preconditions: the observed data must contain presences and absences
+    """
+
+    # Count true and false positives and negatives at the threshold
+    predict_thresholded = presence_values >= threshold
+    true_positive = np.sum(predict_thresholded & (y_test == 1))
+    false_positive = np.sum(predict_thresholded & (y_test == 0))
+    false_negative = np.sum(~predict_thresholded & (y_test == 1))
+    true_negative = np.sum(~predict_thresholded & (y_test == 0))
+    sensitivity = true_positive / (true_positive + false_negative)
+    specificity = true_negative / (true_negative + false_positive)
+    accuracy = (true_negative + true_positive) / (true_negative + false_positive + false_negative + true_positive)
+    return sensitivity, specificity, accuracy
+
+# Define a function to determine the optimal threshold with the previous threshold loop
+def loop_optimal_threshold(presence_values, y_test):
+    """
+    Description: copies the previous loop that tests each threshold in steps of 0.001 and selects the smallest absolute value difference between sensitivity and specificity, including its selection of the list index divided by 1000
+    Inputs: presence_values -- an array of presence probabilities
+            y_test -- an array of observed presences (1) and absences (0)
+    Returned Value: Returns a tuple of the threshold that the loop returned and the list of differences at the thresholds 0.001 to 1
+    Preconditions: the observed data must contain presences and absences
+    """
+
+    # Calculate the difference at each threshold from 0.001 to 1
+    difference_list = []
+    i = 1
+    while i < 1001:
+        sensitivity, specificity, accuracy = count_threshold_metrics(presence_values, i / 1000, y_test)
+        difference_list.append(np.absolute(sensitivity - specificity))
+        i = i + 1
+    # Select the smallest difference with the lowest index among ties and divide the index by 1000 as the loop did
+    value, threshold = min((value, threshold) for (threshold, value) in enumerate(difference_list))
+    return threshold / 1000, difference_list
+
+# Test that the threshold sweep on a 0.001 grid selects the threshold that the loop minimized
+@pytest.mark.parametrize('seed', range(40))
+def test_grid_threshold_matches_loop(seed):
+    # Import packages
+    from sklearn.metrics import roc_auc_score
+
+    # Create probabilities for a small test fold as the mean vote of 1000 trees so that every probability lies on the grid and thresholds are often tied
+    random_generator = np.random.default_rng(seed)
+    y_test = random_generator.integers(0, 2, 40)
+    tree_votes = random_generator.random((40, 1000)) < np.where(y_test == 1, 0.6, 0.4)[:, np.newaxis]
+    presence_values = tree_votes.mean(axis=1)
+
+    # Compare the threshold to the loop threshold corrected by one step and the performance to the counts at that threshold
+    sweep_result = determine_optimal_threshold(presence_values, y_test, threshold_step=0.001)
+    loop_threshold, difference_list = loop_optimal_threshold(presence_values, y_test)
+    assert sweep_result[0] == pytest.approx(loop_threshold + 0.001)
+    assert np.absolute(sweep_result[1] - sweep_result[2]) == pytest.approx(min(difference_list))
+    count_result = count_threshold_metrics(presence_values, sweep_result[0], y_test)
+    assert sweep_result[1] == pytest.approx(count_result[0])
+    assert sweep_result[2] == pytest.approx(count_result[1])
+    assert sweep_result[3] == pytest.approx(roc_auc_score(y_test, presence_values))
+    assert sweep_result[4] == pytest.approx(count_result[2])